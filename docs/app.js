@@ -10,20 +10,30 @@ let allPacks = [];
 let allMCPServers = [];
 let allCommunityMCPServers = [];
 
+// Detail shards (and the search index) fetched so far, keyed by URL
+const shardCache = new Map();
+
+// Logical file name -> content-hashed asset URL, inlined into index.html by
+// `build_website.py --optimize` (empty in development builds)
+const ASSET_MANIFEST = window.ASSET_MANIFEST || {};
+
+/**
+ * Resolve a generated file to its (possibly content-hashed) URL
+ */
+function assetUrl(name) {
+    return ASSET_MANIFEST[name] || name;
+}
+
 /**
  * Update toolbar counter badges
  */
 function updateToolbarCounters(packs, mcpServers, communityMCPServers) {
     // Count total skills and agents across all packs
-    const totalSkills = packs.reduce((sum, pack) => sum + pack.skills.length, 0);
-    const totalAgents = packs.reduce((sum, pack) => sum + pack.agents.length, 0);
+    const totalSkills = packs.reduce((sum, pack) => sum + pack.skill_count, 0);
+    const totalAgents = packs.reduce((sum, pack) => sum + pack.agent_count, 0);
 
     // Count total docs (sources) across all packs
-    const totalDocs = packs.reduce((sum, pack) => {
-        return sum + (pack.docs || []).reduce((docSum, doc) => {
-            return docSum + (doc.sources?.length || 0);
-        }, 0);
-    }, 0);
+    const totalDocs = packs.reduce((sum, pack) => sum + pack.source_count, 0);
 
     // Update counter badges
     document.querySelector('#packs-badge .counter-number').textContent = packs.length;
@@ -38,8 +48,9 @@ function updateToolbarCounters(packs, mcpServers, communityMCPServers) {
  */
 async function init() {
     try {
-        // Load data.json
-        const response = await fetch('data.json');
+        // Load the catalog summary; pack and MCP server details are
+        // fetched from their shards when first needed
+        const response = await fetch(assetUrl('index.json'));
         data = await response.json();
 
         // Store original data for search
@@ -161,17 +172,15 @@ function createPackCard(pack) {
     stats.className = 'stats';
 
     const skillSpan = document.createElement('span');
-    skillSpan.textContent = `${pack.skills.length} skill${pack.skills.length !== 1 ? 's' : ''}`;
+    skillSpan.textContent = `${pack.skill_count} skill${pack.skill_count !== 1 ? 's' : ''}`;
     stats.appendChild(skillSpan);
 
     const agentSpan = document.createElement('span');
-    agentSpan.textContent = `${pack.agents.length} agent${pack.agents.length !== 1 ? 's' : ''}`;
+    agentSpan.textContent = `${pack.agent_count} agent${pack.agent_count !== 1 ? 's' : ''}`;
     stats.appendChild(agentSpan);
 
     // Add docs count (count sources, not doc files)
-    const docsCount = (pack.docs || []).reduce((sum, doc) => {
-        return sum + (doc.sources?.length || 0);
-    }, 0);
+    const docsCount = pack.source_count;
     if (docsCount > 0) {
         const docsSpan = document.createElement('span');
         docsSpan.textContent = `${docsCount} doc${docsCount !== 1 ? 's' : ''}`;
@@ -321,10 +330,10 @@ function createMCPCard(server) {
     div.appendChild(envVars);
 
     // Tools count
-    if (server.tools && server.tools.length > 0) {
+    if (server.tool_count > 0) {
         const toolsInfo = document.createElement('div');
         toolsInfo.className = 'env-vars';
-        toolsInfo.textContent = `${server.tools.length} tool${server.tools.length !== 1 ? 's' : ''}`;
+        toolsInfo.textContent = `${server.tool_count} tool${server.tool_count !== 1 ? 's' : ''}`;
         div.appendChild(toolsInfo);
     }
 
@@ -343,13 +352,125 @@ function createMCPCard(server) {
     return div;
 }
 
+/**
+ * Fetch a detail shard or the search index (each file is fetched at most once)
+ */
+function loadShard(url) {
+    if (!shardCache.has(url)) {
+        const request = fetch(url).then(response => {
+            if (!response.ok) {
+                throw new Error(`Failed to load ${url}: HTTP ${response.status}`);
+            }
+            return response.json();
+        });
+        // Forget failed requests so they can be retried
+        request.catch(() => shardCache.delete(url));
+        shardCache.set(url, request);
+    }
+    return shardCache.get(url);
+}
+
+/**
+ * Load the full details (skills, agents, docs) of a pack
+ */
+function loadPackDetails(packName) {
+    const pack = allPacks.find(p => p.name === packName);
+    return pack ? loadShard(pack.shard) : Promise.resolve(null);
+}
+
+/**
+ * Load the full details (description, tools, security) of an MCP server.
+ * Servers shipped by several packs share one shard; the pack's overlay
+ * (env, security, ... where they differ) is applied on top of it.
+ */
+async function loadMCPDetails(serverName, packName) {
+    const server = data.mcp_servers.find(s => s.name === serverName && s.pack === packName);
+    if (!server) return null;
+    const details = await loadShard(server.shard);
+    return details && { ...details, ...(server.overlay || {}), pack: server.pack };
+}
+
+/**
+ * Split text into lowercase search terms (same rule as scripts/search_index.py)
+ */
+function tokenize(text) {
+    return text.toLowerCase().match(/[\p{L}\p{N}]+/gu) || [];
+}
+
+/**
+ * Return the position of the first term >= prefix in the sorted term list
+ */
+function lowerBound(terms, prefix) {
+    let low = 0;
+    let high = terms.length;
+    while (low < high) {
+        const mid = (low + high) >>> 1;
+        if (terms[mid] < prefix) {
+            low = mid + 1;
+        } else {
+            high = mid;
+        }
+    }
+    return low;
+}
+
+/**
+ * Find the entities matching every query term (as a prefix of an indexed term)
+ *
+ * Returns a Set of entity IDs, or null when the query has no terms.
+ */
+function searchIndexLookup(index, query) {
+    const queryTerms = [...new Set(tokenize(query))];
+    if (queryTerms.length === 0) {
+        return null;
+    }
+
+    let matches = null;
+    for (const prefix of queryTerms) {
+        const positions = new Set();
+        for (let i = lowerBound(index.terms, prefix); i < index.terms.length && index.terms[i].startsWith(prefix); i++) {
+            for (const position of index.postings[i]) {
+                if (!matches || matches.has(position)) {
+                    positions.add(position);
+                }
+            }
+        }
+        matches = positions;
+        if (matches.size === 0) {
+            break;
+        }
+    }
+
+    return new Set([...matches].map(position => index.entities[position]));
+}
+
 /**
  * Handle search input
  */
-function handleSearch(event) {
+async function handleSearch(event) {
     const query = event.target.value.toLowerCase().trim();
 
-    if (!query) {
+    // Prebuilt inverted index (fetched on first search)
+    let matches = null;
+    if (query) {
+        let index;
+        try {
+            index = await loadShard(assetUrl('search-index.json'));
+        } catch (error) {
+            console.error('Failed to load search index:', error);
+            showError('Failed to load search data. Please try refreshing the page.');
+            return;
+        }
+
+        // Ignore results for a query the user has already typed past
+        if (event.target.value.toLowerCase().trim() !== query) {
+            return;
+        }
+
+        matches = searchIndexLookup(index, query);
+    }
+
+    if (!matches) {
         // Reset to show all
         updateToolbarCounters(allPacks, allMCPServers, allCommunityMCPServers);
         renderPacks(allPacks);
@@ -358,47 +479,9 @@ function handleSearch(event) {
         return;
     }
 
-    // Filter packs
-    const filteredPacks = allPacks.filter(pack => {
-        // Search in pack name, description, skills, agents
-        const searchText = [
-            pack.name,
-            pack.plugin.name,
-            pack.plugin.description,
-            ...pack.skills.map(s => s.name + ' ' + s.description),
-            ...pack.agents.map(a => a.name + ' ' + a.description)
-        ].join(' ').toLowerCase();
-
-        return searchText.includes(query);
-    });
-
-    // Helper function to filter MCP servers
-    const filterMCPServers = (servers) => servers.filter(server => {
-        // Search in server name, title, owner, pack, command/URL, env vars
-        const searchFields = [
-            server.name,
-            server.title,
-            server.owner,
-            server.pack,
-            server.type,
-            ...server.env
-        ];
-
-        // Add type-specific fields
-        if (server.type === 'http') {
-            searchFields.push(server.url);
-            if (server.headers) {
-                searchFields.push(...Object.keys(server.headers));
-            }
-        } else {
-            searchFields.push(server.command);
-        }
-
-        const searchText = searchFields.join(' ').toLowerCase();
-        return searchText.includes(query);
-    });
-
-    // Filter MCP servers
+    // Filter packs and MCP servers by entity ID
+    const filteredPacks = allPacks.filter(pack => matches.has(`pack:${pack.name}`));
+    const filterMCPServers = (servers) => servers.filter(server => matches.has(`mcp:${server.pack}/${server.name}`));
     const filteredServers = filterMCPServers(allMCPServers);
     const filteredCommunityServers = filterMCPServers(allCommunityMCPServers);
 
@@ -420,8 +503,15 @@ function toggleSection(sectionId) {
 /**
  * Show pack details modal (XSS-safe)
  */
-function showPackDetails(packName) {
-    const pack = data.packs.find(p => p.name === packName);
+async function showPackDetails(packName) {
+    let pack;
+    try {
+        pack = await loadPackDetails(packName);
+    } catch (error) {
+        console.error('Failed to load pack details:', error);
+        showError('Failed to load pack details. Please try again.');
+        return;
+    }
     if (!pack) return;
 
     const modal = document.getElementById('pack-modal');
@@ -866,8 +956,15 @@ claude plugin install ${pluginName}`;
 /**
  * Show MCP server details modal (XSS-safe)
  */
-function showMCPDetails(serverName, packName) {
-    const server = data.mcp_servers.find(s => s.name === serverName && s.pack === packName);
+async function showMCPDetails(serverName, packName) {
+    let server;
+    try {
+        server = await loadMCPDetails(serverName, packName);
+    } catch (error) {
+        console.error('Failed to load MCP server details:', error);
+        showError('Failed to load MCP server details. Please try again.');
+        return;
+    }
     if (!server) return;
 
     const modal = document.getElementById('mcp-modal');
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Benchmark query_docs.DocIndex against a linear scan of the .ai-index files.
+
+Builds synthetic semantic indexes and task mappings, answers the same task
+plans and tag lookups with DocIndex and with a reference implementation that
+walks the raw JSON on every query (the way an agent reads the files), checks
+that both return identical results, and reports the speedups.
+
+Usage:
+    python scripts/bench_doc_query.py [--docs 10,1000,10000] [--queries 500] [--json]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from query_docs import DocIndex
+
+WORDS = ('cve patch kernel playbook inventory remediation rollout selinux package '
+         'service config reboot compliance fleet insights vm storage network '
+         'upgrade rollback batch audit').split()
+
+RHEL_VERSIONS = ('rhel7', 'rhel8', 'rhel9', 'rhel10')
+SYSTEMS = ('bare_metal', 'vm', 'openshift', 'kubernetes')
+
+
+def make_indexes(size: int, seed: int = 0) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Build a semantic index of size docs and a task mapping (one task per 5 docs).
+    """
+    rng = random.Random(seed)
+    documents = []
+    for index in range(size):
+        applies_to = rng.sample(RHEL_VERSIONS, rng.randint(0, 3))
+        documents.append({
+            'path': f'{rng.choice(WORDS)}/doc-{index}.md',
+            'title': f'Doc {index}',
+            'tags': rng.sample(WORDS, 4),
+            'use_cases': [f'{word}_{rng.randint(0, 9)}' for word in rng.sample(WORDS, 2)],
+            'applies_to': applies_to,
+            'applies_to_systems': rng.sample(SYSTEMS, rng.randint(0, 2)),
+            'token_estimate': rng.randint(200, 12000),
+        })
+
+    paths = [document['path'] for document in documents]
+    task_mappings = {}
+    for index in range(max(1, size // 5)):
+        docs = rng.sample(paths, min(len(paths), rng.randint(2, 8)))
+        split = rng.randint(1, len(docs))
+        order = docs[:]
+        rng.shuffle(order)
+        task_mappings[f'task_{index}'] = {
+            'description': f'Task {index}',
+            'required_docs': docs[:split],
+            'optional_docs': docs[split:],
+            'workflow_order': order,
+            'prerequisites': [],
+        }
+    return {'documents': documents}, {'task_mappings': task_mappings}
+
+
+def _applies(document: Dict[str, Any], rhel: Optional[str], system: Optional[str]) -> bool:
+    """
+    Linear-scan version of DocIndex.applies.
+    """
+    values = [str(value).lower() for key in ('applies_to', 'rhel_versions', 'applies_to_systems')
+              for value in document.get(key) or []]
+    versions = [value for value in values if value.startswith('rhel')]
+    systems = [value for value in values if not value.startswith('rhel')]
+    if rhel and versions and rhel not in versions:
+        return False
+    if system and systems and system not in systems:
+        return False
+    return True
+
+
+def linear_plan(semantic: Dict[str, Any], tasks: Dict[str, Any], task: str, rhel: Optional[str],
+                system: Optional[str], budget: Optional[int]) -> List[str]:
+    """
+    Plan a task by walking the raw JSON: find the mapping, look up every doc
+    in the documents list, keep every required doc, and add optional docs
+    until the budget is exceeded.
+    """
+    mapping = next(value for key, value in tasks['task_mappings'].items() if key == task)
+    required = mapping['required_docs']
+    ordered = [doc for doc in mapping['workflow_order'] if doc in required or doc in mapping['optional_docs']]
+    ordered += [doc for doc in required + mapping['optional_docs'] if doc not in ordered]
+
+    documents = []
+    for path in ordered:
+        document = next((entry for entry in semantic['documents'] if entry['path'] == path), None)
+        if document is not None and (path in required or _applies(document, rhel, system)):
+            documents.append(document)
+
+    total = sum(document['token_estimate'] for document in documents if document['path'] in required)
+    plan: List[str] = []
+    full = False
+    for document in documents:
+        if document['path'] not in required:
+            total += document['token_estimate']
+            full = full or (budget is not None and total > budget)
+            if full:
+                continue
+        plan.append(document['path'])
+    return plan
+
+
+def linear_find(semantic: Dict[str, Any], tag: str, rhel: Optional[str], system: Optional[str]) -> List[str]:
+    """
+    Find the docs with a tag by walking the documents list.
+    """
+    return sorted(entry['path'] for entry in semantic['documents']
+                  if tag in entry['tags'] and _applies(entry, rhel, system))
+
+
+def make_queries(tasks: Dict[str, Any], count: int, seed: int = 0) -> List[Tuple[Any, ...]]:
+    """
+    Build random (task, tag, rhel, system, budget) queries.
+    """
+    rng = random.Random(seed)
+    names = list(tasks['task_mappings'])
+    return [(rng.choice(names), rng.choice(WORDS), rng.choice((None,) + RHEL_VERSIONS),
+             rng.choice((None,) + SYSTEMS), rng.choice((None, 4000, 16000, 40000)))
+            for _ in range(count)]
+
+
+def _time(run: Callable[[], Any], repeat: int) -> float:
+    """
+    Return the best wall time of run().
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmark(size: int, queries: int, repeat: int, seed: int = 0) -> Dict[str, Any]:
+    """
+    Verify equivalence and time indexed and linear queries on one index size.
+
+    Returns:
+        Machine-readable results
+    """
+    semantic, tasks = make_indexes(size, seed)
+    workload = make_queries(tasks, queries, seed)
+
+    start = time.perf_counter()
+    index = DocIndex('bench', semantic, tasks, {})
+    build_seconds = time.perf_counter() - start
+
+    def indexed_plans():
+        return [[doc.path for doc in index.plan(task, rhel, system, budget).docs]
+                for task, _, rhel, system, budget in workload]
+
+    def linear_plans():
+        return [linear_plan(semantic, tasks, task, rhel, system, budget)
+                for task, _, rhel, system, budget in workload]
+
+    def indexed_finds():
+        return [index.find(tag=tag, rhel=rhel, system=system) for _, tag, rhel, system, _ in workload]
+
+    def linear_finds():
+        return [linear_find(semantic, tag, rhel, system) for _, tag, rhel, system, _ in workload]
+
+    # Both implementations must return the same docs for every query
+    mismatches = [position for position, (indexed, linear)
+                  in enumerate(zip(indexed_plans() + indexed_finds(), linear_plans() + linear_finds()))
+                  if indexed != linear]
+
+    seconds = {
+        'plan_indexed': _time(indexed_plans, repeat),
+        'plan_linear': _time(linear_plans, repeat),
+        'find_indexed': _time(indexed_finds, repeat),
+        'find_linear': _time(linear_finds, repeat),
+    }
+    return {
+        'docs': size,
+        'tasks': len(tasks['task_mappings']),
+        'queries': queries,
+        'build_seconds': build_seconds,
+        'equivalent': not mismatches,
+        'mismatches': mismatches[:20],
+        'seconds': seconds,
+        'speedup': {
+            'plan': seconds['plan_linear'] / seconds['plan_indexed'],
+            'find': seconds['find_linear'] / seconds['find_indexed'],
+        },
+    }
+
+
+def main(argv=None):
+    """
+    Run the benchmark and print the results.
+    """
+    parser = argparse.ArgumentParser(description='Benchmark .ai-index queries against a linear scan.')
+    parser.add_argument('--docs', default='10,1000,10000',
+                        help='Comma-separated semantic index sizes (default: 10,1000,10000)')
+    parser.add_argument('--queries', type=int, default=500, help='Queries per index size')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions (best is kept)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args(argv)
+
+    results = [run_benchmark(int(size), args.queries, args.repeat, args.seed)
+               for size in args.docs.split(',')]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for result in results:
+            seconds = result['seconds']
+            print(f"📏 {result['docs']} docs, {result['tasks']} tasks, {result['queries']} queries "
+                  f"(index built in {result['build_seconds'] * 1000:.1f} ms)")
+            print(f"   • plan  indexed {seconds['plan_indexed'] * 1000:9.1f} ms   "
+                  f"linear {seconds['plan_linear'] * 1000:9.1f} ms   {result['speedup']['plan']:7.1f}x")
+            print(f"   • find  indexed {seconds['find_indexed'] * 1000:9.1f} ms   "
+                  f"linear {seconds['find_linear'] * 1000:9.1f} ms   {result['speedup']['find']:7.1f}x")
+        print()
+        if all(result['equivalent'] for result in results):
+            print("✅ Indexed and linear queries returned identical docs")
+        else:
+            for result in results:
+                if not result['equivalent']:
+                    print(f"❌ {result['docs']} docs: mismatching queries {result['mismatches']}")
+
+    return 0 if all(result['equivalent'] for result in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Benchmark frontmatter YAML loading on a synthetic corpus.
+
+Compares yaml.safe_load (pure Python), yaml's CSafeLoader (when libyaml is
+available) and frontmatter_yaml.load, checks that all of them return equal
+values for every document, and reports the speedups.
+
+Usage:
+    python scripts/bench_frontmatter.py [--docs 3000] [--repeat 5] [--json]
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+import yaml
+
+import frontmatter_yaml
+
+WORDS = ('cluster node pod deploy image build route service cve patch kernel playbook '
+         'inventory remediation rollout namespace openshift rhel ansible vm storage '
+         'network policy secret config template helm chart validate monitor').split()
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    """
+    Return a random sentence made of WORDS.
+    """
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def make_skill(rng: random.Random, index: int) -> str:
+    """
+    Frontmatter shaped like skills/*/SKILL.md.
+    """
+    lines = [f'name: skill-{index}', 'description: |']
+    for _ in range(rng.randint(3, 15)):
+        lines.append('  ' + (f'- "{_sentence(rng, 4)}"' if rng.random() < 0.3 else _sentence(rng, 12)))
+        if rng.random() < 0.2:
+            lines.append('')
+    lines.append('model: inherit')
+    if rng.random() < 0.5:
+        lines.append(f'color: {rng.choice(["red", "blue", "green"])}')
+    return '\n'.join(lines) + '\n'
+
+
+def make_agent(rng: random.Random, index: int) -> str:
+    """
+    Frontmatter shaped like agents/*.md.
+    """
+    tools = rng.sample(['Read', 'Write', 'Bash', 'Grep', 'Glob', 'WebFetch'], 3)
+    lines = [f'name: agent-{index}', 'description: |']
+    lines.extend('  ' + _sentence(rng, 10) for _ in range(rng.randint(2, 8)))
+    lines.append(f'model: {rng.choice(["inherit", "haiku", "sonnet"])}')
+    if rng.random() < 0.5:
+        lines.append('tools: [' + ', '.join(f'"{t}"' for t in tools) + ']')
+    else:
+        lines.append('tools:')
+        lines.extend(f'  - {t}' for t in tools)
+    return '\n'.join(lines) + '\n'
+
+
+def make_doc(rng: random.Random, index: int) -> str:
+    """
+    Frontmatter shaped like docs/**/*.md (nested sources, dates).
+    """
+    lines = [f'title: {_sentence(rng, 5)}', f'category: {rng.choice(WORDS)}', 'sources:']
+    for _ in range(rng.randint(1, 4)):
+        lines.append(f'  - title: {_sentence(rng, 6)}')
+        lines.append(f'    url: https://docs.example.com/{rng.choice(WORDS)}/{index}')
+        lines.append('    date_accessed: 2026-01-20')
+    lines.append('tags: [' + ', '.join(rng.sample(WORDS, 4)) + ']')
+    lines.append('last_updated: 2026-01-20')
+    return '\n'.join(lines) + '\n'
+
+
+def make_corpus(size: int, seed: int = 0) -> List[str]:
+    """
+    Build a corpus of frontmatter texts (70% skills, 20% agents, 10% docs).
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for index in range(size):
+        roll = rng.random()
+        if roll < 0.7:
+            corpus.append(make_skill(rng, index))
+        elif roll < 0.9:
+            corpus.append(make_agent(rng, index))
+        else:
+            corpus.append(make_doc(rng, index))
+    return corpus
+
+
+def _time(load: Callable[[str], Any], corpus: List[str], repeat: int) -> float:
+    """
+    Return the best wall time of loading the whole corpus.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in corpus:
+            load(text)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run_benchmark(size: int, repeat: int, seed: int = 0) -> Dict[str, Any]:
+    """
+    Verify equivalence and time every loader on a synthetic corpus.
+
+    Returns:
+        Machine-readable results
+    """
+    corpus = make_corpus(size, seed)
+
+    loaders = {'safe_load': yaml.safe_load}
+    if frontmatter_yaml.SafeLoader is not yaml.SafeLoader:
+        loaders['csafe_load'] = lambda text: yaml.load(text, Loader=frontmatter_yaml.SafeLoader)
+    loaders['frontmatter_yaml'] = frontmatter_yaml.load
+
+    # Every loader must agree with yaml.safe_load on every document
+    mismatches = []
+    for index, text in enumerate(corpus):
+        expected = yaml.safe_load(text)
+        for name, load in loaders.items():
+            if load(text) != expected:
+                mismatches.append({'doc': index, 'loader': name})
+
+    fast_path_hits = sum(frontmatter_yaml.parse_flat(text) is not frontmatter_yaml.UNHANDLED
+                         for text in corpus)
+
+    timings = {name: _time(load, corpus, repeat) for name, load in loaders.items()}
+    baseline = timings['safe_load']
+
+    return {
+        'docs': size,
+        'repeat': repeat,
+        'libyaml': frontmatter_yaml.SafeLoader is not yaml.SafeLoader,
+        'fallback_loader': frontmatter_yaml.loader_name(),
+        'fast_path_hits': fast_path_hits,
+        'equivalent': not mismatches,
+        'mismatches': mismatches[:20],
+        'seconds': timings,
+        'speedup': {name: baseline / seconds for name, seconds in timings.items()},
+    }
+
+
+def main(argv=None):
+    """
+    Run the benchmark and print the results.
+    """
+    parser = argparse.ArgumentParser(description='Benchmark frontmatter YAML loading.')
+    parser.add_argument('--docs', type=int, default=3000, help='Synthetic corpus size')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing repetitions (best is kept)')
+    parser.add_argument('--seed', type=int, default=0, help='Corpus random seed')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.docs, args.repeat, args.seed)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"📏 {results['docs']} frontmatter blocks, best of {results['repeat']} runs")
+        print(f"   libyaml: {'yes' if results['libyaml'] else 'no'} (fallback: {results['fallback_loader']})")
+        print(f"   fast path: {results['fast_path_hits']}/{results['docs']} blocks")
+        print()
+        for name, seconds in results['seconds'].items():
+            print(f"   • {name:<18} {seconds * 1000:9.1f} ms   {results['speedup'][name]:5.1f}x")
+        print()
+        if results['equivalent']:
+            print("✅ All loaders returned identical data")
+        else:
+            print(f"❌ {len(results['mismatches'])} mismatching documents: {results['mismatches']}")
+
+    return 0 if results['equivalent'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
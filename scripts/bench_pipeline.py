@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Benchmark the scripts/ pipeline on synthetic marketplaces.
+
+Generates marketplaces of N packs, each with M skills, K agents, D docs and
+a .mcp.json of S servers (frontmatter shaped like the real packs, from
+bench_frontmatter), then times every stage of validation and generation:
+
+    scan             read and parse every file, end to end (pack_scanner)
+    assemble_skills  \
+    assemble_agents   | generate_pack_data, on the scans
+    assemble_docs     |
+    assemble_mcp     /  generate_mcp_data, on the scans
+    link_index       the repository link index, from the scans (link_checker)
+    rule:<id>        each registered validation rule, on the scans
+    json_write       serialize and write data.json
+    write_site       data.json, index.json, shards and search index
+
+The assemble_* stages only build the data.json entries from parsed scans.
+The parsing itself is part of scan, which is also broken down (serially,
+outside the total) into its parts:
+
+    read             read the skills, agents, docs and JSON configs
+    parse_frontmatter  YAML frontmatter of the skills, agents and docs
+    parse_json       plugin.json and .mcp.json
+    count_tokens     token estimates (token_estimator)
+    extract_links    heading anchors and relative links (markdown_utils)
+
+The build cache is disabled so every run measures a cold parse. Results are
+machine-readable JSON (--json / --output) so scaling curves can be tracked
+from 5 packs up to thousands.
+
+Usage:
+    python scripts/bench_pipeline.py [--packs 5,50,500] [--skills 10] [--json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import bench_frontmatter
+import build_cache
+import build_website
+import frontmatter_yaml
+import link_checker
+import markdown_utils
+import pack_scanner
+import parallel
+import token_estimator
+import validation_rules
+from generate_pack_data import parse_agents, parse_docs, parse_pack, parse_skills
+from generate_mcp_data import parse_mcp_file
+from site_assets import SiteWriter
+
+DEFAULT_PACK_COUNTS = [5, 50, 500]
+
+
+def _body(rng: random.Random, paragraphs: int) -> str:
+    """
+    Return a markdown body of random paragraphs.
+    """
+    sections = []
+    for index in range(paragraphs):
+        sections.append(f'## Section {index + 1}\n')
+        sections.append(' '.join(bench_frontmatter._sentence(rng, 14) for _ in range(5)) + '\n')
+    return '\n'.join(sections)
+
+
+def _markdown(frontmatter: str, body: str) -> str:
+    return f'---\n{frontmatter}---\n\n{body}'
+
+
+def make_mcp_config(rng: random.Random, pack_index: int, servers: int, env_vars: int) -> Dict[str, Any]:
+    """
+    Return .mcp.json contents with a mix of command and HTTP servers.
+    """
+    config = {}
+    for index in range(servers):
+        env = {f'VAR_{pack_index}_{index}_{n}': f'${{VAR_{pack_index}_{index}_{n}}}'
+               for n in range(env_vars)}
+        name = f'server-{pack_index}-{index}'
+        if rng.random() < 0.3:
+            config[name] = {
+                'type': 'http',
+                'url': f'https://mcp.example.com/{name}',
+                'headers': {'Authorization': f'Bearer ${{TOKEN_{pack_index}_{index}}}'},
+                'env': env,
+                'description': bench_frontmatter._sentence(rng, 8),
+            }
+        else:
+            config[name] = {
+                'command': 'podman',
+                'args': ['run', '--rm', '-i', f'quay.io/example/{name}:latest'],
+                'env': env,
+                'description': bench_frontmatter._sentence(rng, 8),
+                'security': {'isolation': 'container', 'network': 'local'},
+            }
+    return {'mcpServers': config}
+
+
+def make_marketplace(root: Path, packs: int, skills: int, agents: int, docs: int,
+                     servers: int, env_vars: int, paragraphs: int, seed: int = 0) -> List[str]:
+    """
+    Write a synthetic marketplace under root.
+
+    Returns:
+        The pack directory names, relative to root
+    """
+    rng = random.Random(seed)
+    pack_dirs = []
+
+    for pack_index in range(packs):
+        pack_dir = f'pack-{pack_index:05d}'
+        pack_path = root / pack_dir
+        pack_dirs.append(pack_dir)
+
+        (pack_path / '.claude-plugin').mkdir(parents=True)
+        (pack_path / '.claude-plugin' / 'plugin.json').write_text(json.dumps({
+            'name': pack_dir,
+            'version': f'1.{pack_index % 10}.0',
+            'description': bench_frontmatter._sentence(rng, 10),
+            'keywords': rng.sample(bench_frontmatter.WORDS, 3),
+        }, indent=2))
+        (pack_path / 'README.md').write_text(f'# {pack_dir}\n\n{_body(rng, 2)}')
+
+        if servers:
+            (pack_path / '.mcp.json').write_text(
+                json.dumps(make_mcp_config(rng, pack_index, servers, env_vars), indent=2))
+
+        for index in range(skills):
+            skill_dir = pack_path / 'skills' / f'skill-{index:04d}'
+            skill_dir.mkdir(parents=True)
+            (skill_dir / 'SKILL.md').write_text(
+                _markdown(bench_frontmatter.make_skill(rng, index), _body(rng, paragraphs)))
+
+        if agents:
+            (pack_path / 'agents').mkdir()
+        for index in range(agents):
+            (pack_path / 'agents' / f'agent-{index:04d}.md').write_text(
+                _markdown(bench_frontmatter.make_agent(rng, index), _body(rng, paragraphs)))
+
+        for index in range(docs):
+            category_dir = pack_path / 'docs' / rng.choice(bench_frontmatter.WORDS)
+            category_dir.mkdir(parents=True, exist_ok=True)
+            (category_dir / f'doc-{index:04d}.md').write_text(
+                _markdown(bench_frontmatter.make_doc(rng, index), _body(rng, paragraphs * 3)))
+
+    return pack_dirs
+
+
+def _tree_size(root: Path) -> Dict[str, int]:
+    """
+    Count the files and bytes under a directory.
+    """
+    files = size = 0
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            files += 1
+            size += os.path.getsize(os.path.join(dirpath, filename))
+    return {'files': files, 'bytes': size}
+
+
+@contextmanager
+def _working_directory(path: Path) -> Iterator[None]:
+    """
+    Run the block inside path (the pipeline resolves packs relative to the cwd).
+    """
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def _timed(func: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def time_scan_breakdown(scans: List[pack_scanner.PackScan]) -> Dict[str, float]:
+    """
+    Time the parts of a scan one after the other: reading the files, then
+    each parse of the bytes already in memory.
+
+    Returns:
+        Seconds per part
+    """
+    documents = [doc.path for scan in scans for doc in scan.skills + scan.agents + scan.docs]
+    json_files = [json_file.path for scan in scans for json_file in (scan.plugin, scan.mcp)
+                  if json_file is not None and json_file.exists]
+    raw: Dict[Path, bytes] = {}
+    seconds = {}
+
+    seconds['read'] = _timed(lambda: raw.update((path, build_cache.read_bytes(path))
+                                                for path in documents + json_files))
+    contents = [raw[path] for path in documents]
+    body_starts = [len(data) - len(pack_scanner.parse_frontmatter(data)[1]) for data in contents]
+
+    seconds['parse_frontmatter'] = _timed(lambda: [pack_scanner.parse_frontmatter(data) for data in contents])
+    seconds['parse_json'] = _timed(lambda: [json.loads(raw[path]) for path in json_files])
+    seconds['count_tokens'] = _timed(lambda: [token_estimator.count_bytes(data) for data in contents])
+    seconds['extract_links'] = _timed(lambda: [markdown_utils.extract_anchors_and_links(data, start)
+                                               for data, start in zip(contents, body_starts)])
+    return seconds
+
+
+def time_pipeline(pack_dirs: List[str], jobs: Optional[int]) -> Tuple[Dict[str, float], Dict[str, float]]:
+    """
+    Run every stage once on the marketplace in the current directory.
+
+    Returns:
+        (seconds per stage, seconds per part of the scan stage)
+    """
+    pack_scanner.invalidate()
+    seconds = {}
+
+    seconds['scan'] = _timed(lambda: pack_scanner.scan_packs(pack_dirs, jobs))
+
+    for name, stage in (('assemble_skills', parse_skills), ('assemble_agents', parse_agents),
+                        ('assemble_docs', parse_docs), ('assemble_mcp', parse_mcp_file)):
+        seconds[name] = _timed(lambda: [stage(pack_dir) for pack_dir in pack_dirs])
+
+    scans = [pack_scanner.scan_pack(pack_dir) for pack_dir in pack_dirs]
+    scan_seconds = time_scan_breakdown(scans)
+
+    link_indexes = []
+    seconds['link_index'] = _timed(lambda: link_indexes.append(link_checker.build_link_index(Path('.'), scans)))
+    validation_rules.configure({'link_index': link_indexes[0]})
+
+    for rule in validation_rules.RULES.values():
+        if rule.scope != 'pack':
+            continue
+        seconds[f'rule:{rule.id}'] = _timed(
+            lambda: [validation_rules.check_pack(scan, [rule]) for scan in scans])
+
+    # Assemble the data.json contents outside the timed write stages
+    pack_data = [parse_pack(pack_dir) for pack_dir in pack_dirs]
+    mcp_data = [server for pack_dir in pack_dirs for server in parse_mcp_file(pack_dir)]
+    build_website.apply_icons(pack_data, mcp_data, {'packs': {}, 'mcp_servers': {}})
+    output = build_website.assemble_output(pack_data, mcp_data,
+                                           build_website.source_timestamp(pack_dirs))
+
+    docs_dir = build_website.DOCS_DIR
+    docs_dir.mkdir(exist_ok=True)
+    seconds['json_write'] = _timed(lambda: SiteWriter(docs_dir).write_json('data.json', output))
+    seconds['write_site'] = _timed(
+        lambda: build_website.write_site(output, verbose=False, force=True))
+
+    return seconds, scan_seconds
+
+
+def run_benchmark(pack_counts: List[int], skills: int, agents: int, docs: int, servers: int,
+                  env_vars: int, paragraphs: int, repeat: int, jobs: Optional[int],
+                  seed: int = 0) -> Dict[str, Any]:
+    """
+    Time the pipeline on one synthetic marketplace per pack count.
+
+    Returns:
+        Machine-readable results
+    """
+    build_cache.configure(enabled=False)
+    results = []
+
+    for packs in pack_counts:
+        with tempfile.TemporaryDirectory(prefix='bench-pipeline-') as tmp:
+            root = Path(tmp)
+            start = time.perf_counter()
+            pack_dirs = make_marketplace(root, packs, skills, agents, docs, servers,
+                                         env_vars, paragraphs, seed)
+            generate_seconds = time.perf_counter() - start
+            tree = _tree_size(root)
+
+            with _working_directory(root):
+                runs = [time_pipeline(pack_dirs, jobs) for _ in range(repeat)]
+                # Best of the runs, per stage
+                seconds = {stage: min(run[stage] for run, _ in runs) for stage in runs[0][0]}
+                scan_seconds = {part: min(parts[part] for _, parts in runs) for part in runs[0][1]}
+                output_bytes = (build_website.DOCS_DIR / 'data.json').stat().st_size
+
+            pack_scanner.invalidate()
+
+        total = sum(seconds.values())
+        results.append({
+            'packs': packs,
+            'files': tree['files'],
+            'bytes': tree['bytes'],
+            'data_json_bytes': output_bytes,
+            'generate_seconds': generate_seconds,
+            'seconds': seconds,
+            'scan_seconds': scan_seconds,
+            'total_seconds': total,
+            'us_per_file': total / tree['files'] * 1e6 if tree['files'] else 0.0,
+        })
+
+    return {
+        'config': {
+            'skills_per_pack': skills,
+            'agents_per_pack': agents,
+            'docs_per_pack': docs,
+            'servers_per_pack': servers,
+            'env_vars_per_server': env_vars,
+            'paragraphs': paragraphs,
+            'repeat': repeat,
+            'jobs': jobs,
+            'seed': seed,
+        },
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': parallel.default_jobs(),
+            'yaml_loader': frontmatter_yaml.loader_name(),
+        },
+        'results': results,
+    }
+
+
+def _pack_counts(value: str) -> List[int]:
+    """
+    argparse type for --packs (comma-separated positive integers).
+    """
+    return [parallel.positive_int(part) for part in value.split(',') if part.strip()]
+
+
+def main(argv=None):
+    """
+    Run the benchmark and print the results.
+    """
+    parser = argparse.ArgumentParser(description='Benchmark the pack pipeline on synthetic marketplaces.')
+    parser.add_argument('--packs', type=_pack_counts, default=DEFAULT_PACK_COUNTS,
+                        help='Comma-separated pack counts, one marketplace each (default: 5,50,500)')
+    parser.add_argument('--skills', type=int, default=10, help='Skills per pack')
+    parser.add_argument('--agents', type=int, default=3, help='Agents per pack')
+    parser.add_argument('--docs', type=int, default=5, help='Docs per pack')
+    parser.add_argument('--servers', type=int, default=2, help='MCP servers per .mcp.json')
+    parser.add_argument('--env-vars', type=int, default=3, help='Environment variables per MCP server')
+    parser.add_argument('--paragraphs', type=int, default=4, help='Body sections per skill/agent (x3 for docs)')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions (best is kept)')
+    parser.add_argument('--jobs', '-j', type=parallel.positive_int, default=1,
+                        help='Worker processes for the scan stage (default: 1, serial)')
+    parser.add_argument('--seed', type=int, default=0, help='Marketplace random seed')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    parser.add_argument('--output', '-o', type=Path, help='Also write the JSON results to this file')
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(args.packs, args.skills, args.agents, args.docs, args.servers,
+                            args.env_vars, args.paragraphs, args.repeat, args.jobs, args.seed)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + '\n')
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    config = results['config']
+    print(f"📏 {config['skills_per_pack']} skills, {config['agents_per_pack']} agents, "
+          f"{config['docs_per_pack']} docs, {config['servers_per_pack']} MCP servers per pack; "
+          f"best of {config['repeat']} runs, {config['jobs']} job(s), "
+          f"{results['environment']['yaml_loader']}")
+    for result in results['results']:
+        print()
+        print(f"📦 {result['packs']} packs: {result['files']} files, {result['bytes'] / 1e6:.1f} MB "
+              f"-> data.json {result['data_json_bytes'] / 1e6:.2f} MB")
+        for stage, seconds in result['seconds'].items():
+            print(f"   • {stage:<22} {seconds * 1000:10.1f} ms")
+            if stage == 'scan':
+                for part, part_seconds in result['scan_seconds'].items():
+                    print(f"     - {part:<20} {part_seconds * 1000:10.1f} ms")
+        print(f"   = {'total':<22} {result['total_seconds'] * 1000:10.1f} ms "
+              f"({result['us_per_file']:.0f} µs/file)")
+    if args.output:
+        print()
+        print(f"✅ Wrote {args.output}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
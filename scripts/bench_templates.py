@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Benchmark template_renderer's compiled templates against re-parsing each
+template on every render.
+
+Renders every template of the discovered packs with the sample value sets,
+in batches, with the compiled render functions and with string.Template and
+re.sub substitution of the raw text (the way a template is filled without a
+compile step), checks that all three produce identical output, and reports
+the renders per second. It also times compiling a template against loading
+its bytecode, and loading the rendered YAML with the C and pure-Python YAML
+loaders.
+
+Usage:
+    python scripts/bench_templates.py [--renders 20000] [--repeat 3] [--json]
+"""
+
+import argparse
+import json
+import marshal
+import re
+import string
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import yaml
+
+import build_cache
+import template_renderer
+from frontmatter_yaml import SafeLoader, loader_name
+from pack_discovery import discover_packs
+
+_VARIABLE_RE = re.compile(r'\$\{([A-Za-z_][A-Za-z0-9_]*)\}')
+
+
+def _time(run: Callable[[], Any], repeat: int) -> float:
+    """
+    Return the best wall time of run().
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def make_workload(renders: int) -> List[Tuple[Path, str, Dict[str, str]]]:
+    """
+    Return renders (template file, raw text, values) items cycling over
+    every template and sample value set.
+    """
+    pairs = [(template_file, template_file.read_text(encoding='utf-8'), values)
+             for pack_dir in discover_packs()
+             for template_file in template_renderer.find_templates(pack_dir)
+             for values in template_renderer.SAMPLE_VALUES.values()]
+    if not pairs:
+        raise SystemExit("No templates found under any pack's templates/ directory")
+    return [pairs[position % len(pairs)] for position in range(renders)]
+
+
+def run_benchmark(renders: int, repeat: int) -> Dict[str, Any]:
+    """
+    Verify equivalence and time compiled and interpreted rendering.
+
+    Returns:
+        Machine-readable results
+    """
+    workload = make_workload(renders)
+    files = sorted({template_file for template_file, _, _ in workload})
+    texts = {template_file: text for template_file, text, _ in workload}
+
+    compile_seconds = _time(lambda: [compile(template_renderer.compile_template(texts[template_file]),
+                                             str(template_file), 'exec')
+                                     for template_file in files], repeat)
+    bytecode = {template_file: marshal.dumps(compile(template_renderer.compile_template(texts[template_file]),
+                                                     str(template_file), 'exec'))
+                for template_file in files}
+    load_seconds = _time(lambda: [exec(marshal.loads(bytecode[template_file]), {})
+                                  for template_file in files], repeat)
+
+    templates = {template_file: template_renderer.get_template(template_file) for template_file in files}
+
+    def compiled():
+        return [template_renderer.render_template(templates[template_file], values)
+                for template_file, _, values in workload]
+
+    def string_template():
+        return [string.Template(text).safe_substitute(values) for _, text, values in workload]
+
+    def regex():
+        return [_VARIABLE_RE.sub(lambda match: values[match.group(1)], text)
+                for _, text, values in workload]
+
+    outputs = compiled()
+    equivalent = outputs == string_template() == regex()
+
+    seconds = {
+        'compiled': _time(compiled, repeat),
+        'string_template': _time(string_template, repeat),
+        'regex': _time(regex, repeat),
+    }
+
+    yaml_outputs = [text for (template_file, _, _), text in zip(workload, outputs)
+                    if template_renderer.output_name(template_file).endswith('.yaml') and '{{' not in text]
+    yaml_outputs = yaml_outputs[:max(1, len(yaml_outputs) // 10)]
+    yaml_seconds = {
+        loader_name(loader): _time(lambda: [list(yaml.load_all(text, Loader=loader)) for text in yaml_outputs],
+                                   repeat)
+        for loader in {SafeLoader, yaml.SafeLoader}
+    }
+
+    return {
+        'templates': len(files),
+        'renders': renders,
+        'equivalent': equivalent,
+        'compile_ms_per_template': compile_seconds * 1000 / len(files),
+        'load_ms_per_template': load_seconds * 1000 / len(files),
+        'seconds': seconds,
+        'renders_per_second': {name: renders / value for name, value in seconds.items()},
+        'speedup': {
+            'string_template': seconds['string_template'] / seconds['compiled'],
+            'regex': seconds['regex'] / seconds['compiled'],
+        },
+        'yaml_documents': len(yaml_outputs),
+        'yaml_seconds': yaml_seconds,
+    }
+
+
+def main(argv=None):
+    """
+    Run the benchmark and print the results.
+    """
+    parser = argparse.ArgumentParser(description='Benchmark compiled template rendering.')
+    parser.add_argument('--renders', type=int, default=20000, help='Templates rendered per batch')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions (best is kept)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args(argv)
+
+    build_cache.configure(enabled=False)
+    result = run_benchmark(args.renders, args.repeat)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        seconds = result['seconds']
+        print(f"📏 {result['renders']:,} renders of {result['templates']} templates "
+              f"(compile {result['compile_ms_per_template']:.3f} ms/template, "
+              f"load bytecode {result['load_ms_per_template']:.3f} ms/template)")
+        for name in ('compiled', 'string_template', 'regex'):
+            speedup = '' if name == 'compiled' else f"   compiled is {result['speedup'][name]:5.1f}x faster"
+            print(f"   • {name:<16} {seconds[name] * 1000:9.1f} ms   "
+                  f"{result['renders_per_second'][name]:>12,.0f} renders/s{speedup}")
+        for name, value in sorted(result['yaml_seconds'].items()):
+            print(f"   • YAML {name:<11} {value * 1000:9.1f} ms for {result['yaml_documents']:,} rendered files")
+        print()
+        if result['equivalent']:
+            print("✅ Compiled and interpreted rendering produced identical output")
+        else:
+            print("❌ Compiled and interpreted rendering produced different output")
+
+    return 0 if result['equivalent'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Persistent build cache for parsed pack files.
+
+Entries are keyed by file path and validated against the file's size, mtime
+and content hash, so unchanged files are served without being re-parsed.
+"""
+
+import hashlib
+import os
+import pickle
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+# Default location of the on-disk cache (relative to the repository root)
+CACHE_FILE = Path('.cache') / 'build-cache.pickle'
+
+# Bump whenever the shape of cached values changes
+CACHE_VERSION = 3
+
+# Files modified this close to the moment they were cached cannot be trusted
+# on size/mtime alone (mtime granularity), so their content hash is re-checked
+RACY_WINDOW_NS = 2_000_000_000
+
+
+class BuildCache:
+    """
+    Path-keyed cache of parsed file contents.
+
+    Each entry stores (size, mtime_ns, verified_at_ns, digest, value).
+    """
+
+    def __init__(self, cache_file: Optional[Path] = CACHE_FILE, enabled: bool = True):
+        self.cache_file = Path(cache_file) if cache_file else None
+        self.enabled = enabled
+        self.entries: Dict[str, Tuple[int, int, int, str, Any]] = {}
+        self.touched: Set[str] = set()
+        self.updated: Dict[str, Tuple[int, int, int, str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def load(self) -> None:
+        """
+        Load entries from disk, ignoring missing, corrupt or outdated caches.
+        """
+        if not self.enabled or not self.cache_file or not self.cache_file.exists():
+            return
+
+        try:
+            with open(self.cache_file, 'rb') as f:
+                payload = pickle.load(f)
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable build cache {self.cache_file}: {e}")
+            return
+
+        if isinstance(payload, dict) and payload.get('version') == CACHE_VERSION:
+            self.entries = payload.get('entries', {})
+
+    def save(self, prune: bool = True) -> None:
+        """
+        Write entries to disk.
+
+        Args:
+            prune: Drop the entries of files that no longer exist (entries
+                   of files this run did not look up, e.g. those of other
+                   scripts, are kept)
+        """
+        if not self.enabled or not self.cache_file:
+            return
+
+        if prune:
+            self.entries = {k: v for k, v in self.entries.items()
+                            if k in self.touched or os.path.exists(k.split(':', 1)[1])}
+
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = self.cache_file.with_suffix('.tmp')
+        with open(tmp_file, 'wb') as f:
+            pickle.dump({'version': CACHE_VERSION, 'entries': self.entries}, f,
+                        protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, self.cache_file)
+
+    def get(self, namespace: str, file_path: Path,
+            read: Callable[[Path], bytes], parse: Callable[[bytes], Any]) -> Any:
+        """
+        Return the parsed value of a file, using the cache when possible.
+
+        Args:
+            namespace: Kind of parse (keeps different parsers of one file apart)
+            file_path: File to parse
+            read: Function returning the raw bytes the value is derived from
+                  (the content hash covers exactly these bytes)
+            parse: Function turning those bytes into the value to cache
+
+        Returns:
+            The (possibly cached) parsed value. Exceptions from read/parse
+            propagate and nothing is cached for the file.
+        """
+        if not self.enabled:
+            return parse(read(file_path))
+
+        key = f'{namespace}:{file_path}'
+        self.touched.add(key)
+        stat = os.stat(file_path)
+        entry = self.entries.get(key)
+
+        if entry is not None:
+            size, mtime_ns, verified_at, _, value = entry
+            if (size == stat.st_size and mtime_ns == stat.st_mtime_ns
+                    and mtime_ns < verified_at - RACY_WINDOW_NS):
+                self.hits += 1
+                return value
+
+        raw = read(file_path)
+        digest = hashlib.sha256(raw).hexdigest()
+
+        if entry is not None and entry[3] == digest:
+            # Touched but unchanged: refresh the stat part of the key
+            value = entry[4]
+            self.hits += 1
+        else:
+            value = parse(raw)
+            self.misses += 1
+
+        self.entries[key] = (stat.st_size, stat.st_mtime_ns, time.time_ns(), digest, value)
+        self.updated[key] = self.entries[key]
+        return value
+
+    def take_delta(self) -> Dict[str, Any]:
+        """
+        Return and reset what changed since the last call.
+
+        Worker processes send this back so the parent can merge it.
+        """
+        delta = {
+            'touched': self.touched,
+            'updated': self.updated,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+        self.touched = set()
+        self.updated = {}
+        self.hits = 0
+        self.misses = 0
+        return delta
+
+    def merge_delta(self, delta: Dict[str, Any]) -> None:
+        """
+        Merge a delta produced by take_delta() in another process.
+        """
+        self.touched |= delta['touched']
+        self.entries.update(delta['updated'])
+        self.updated.update(delta['updated'])
+        self.hits += delta['hits']
+        self.misses += delta['misses']
+
+
+# Process-wide cache used by the generators; in-memory only until configured
+_cache = BuildCache(cache_file=None)
+
+
+def configure(enabled: bool = True, rebuild: bool = False,
+              cache_file: Path = CACHE_FILE) -> BuildCache:
+    """
+    Set up the process-wide build cache.
+
+    Args:
+        enabled: Whether to read and write the on-disk cache at all
+        rebuild: Ignore existing entries (they are replaced on save)
+        cache_file: Location of the on-disk cache
+
+    Returns:
+        The configured cache
+    """
+    global _cache
+    _cache = BuildCache(cache_file=cache_file, enabled=enabled)
+    if not rebuild:
+        _cache.load()
+    return _cache
+
+
+def get_cache() -> BuildCache:
+    """
+    Return the process-wide build cache.
+    """
+    return _cache
+
+
+def worker_initargs() -> Tuple[bool, Dict[str, Any]]:
+    """
+    Return the arguments for init_worker() that mirror this process's cache.
+    """
+    return (_cache.enabled, _cache.entries)
+
+
+def init_worker(enabled: bool, entries: Dict[str, Any]) -> None:
+    """
+    Process pool initializer: seed the worker's cache from the parent's.
+
+    Workers never write the cache file; they return deltas instead.
+    """
+    global _cache
+    _cache = BuildCache(cache_file=None, enabled=enabled)
+    _cache.entries = entries
+
+
+def cached(namespace: str, file_path: Path,
+           read: Callable[[Path], bytes], parse: Callable[[bytes], Any]) -> Any:
+    """
+    Parse a file through the process-wide build cache.
+    """
+    return _cache.get(namespace, file_path, read, parse)
+
+
+def read_bytes(file_path: Path) -> bytes:
+    """
+    Read a whole file as bytes.
+    """
+    with open(file_path, 'rb') as f:
+        return f.read()
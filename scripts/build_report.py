@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Per-stage timing and I/O instrumentation for build_website.py and
+validate_structure.py (--report / --profile).
+
+Stages are timed with the stage() context manager; nested stages are named
+after their parents (pack_data/scan). pack_scanner records every file it
+reads: wall time, bytes actually read (0 for build cache hits) and the pack
+it belongs to. Worker processes collect their own records and hand them back
+as deltas, like build_cache. When no report was requested every hook is a
+no-op.
+"""
+
+import cProfile
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import build_cache
+
+# Number of slowest files listed in the report
+DEFAULT_SLOWEST = 10
+
+# Bump when the report layout changes
+REPORT_VERSION = 1
+
+
+class BuildReport:
+    """
+    Collects stage timings and per-file records for one run.
+
+    Each file record is (path, kind, pack_dir, seconds, bytes_read).
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.started_at = datetime.now(timezone.utc)
+        self.start = time.perf_counter()
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.files: List[Tuple[str, str, str, float, int]] = []
+        self._stack: List[str] = []
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Time a block; repeated stages of the same name accumulate.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        self._stack.append(name)
+        # Registered on entry, so parents are listed before their children
+        entry = self.stages.setdefault('/'.join(self._stack), {'seconds': 0.0, 'calls': 0})
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry['seconds'] += time.perf_counter() - start
+            entry['calls'] += 1
+            self._stack.pop()
+
+    def add_time(self, name: str, seconds: float) -> None:
+        """
+        Add time measured elsewhere (e.g. in a worker process) to a stage
+        below the current one.
+        """
+        if not self.enabled:
+            return
+        entry = self.stages.setdefault('/'.join(self._stack + [name]), {'seconds': 0.0, 'calls': 0})
+        entry['seconds'] += seconds
+        entry['calls'] += 1
+
+    def timed_read(self, kind: str, file_path: Path, pack_dir: str,
+                   load: Callable[[Callable[[Path], bytes]], Any],
+                   read: Callable[[Path], bytes]) -> Any:
+        """
+        Run load(read) for a file, recording its wall time and the bytes read.
+
+        Args:
+            kind: Type of file (skill, agent, doc, plugin, mcp)
+            file_path: File being loaded
+            pack_dir: Pack the file belongs to
+            load: Loads the file given a read function (e.g. a build cache lookup)
+            read: Function returning the raw bytes of the file
+        """
+        if not self.enabled:
+            return load(read)
+
+        bytes_read = 0
+
+        def counting_read(path: Path) -> bytes:
+            nonlocal bytes_read
+            raw = read(path)
+            bytes_read += len(raw)
+            return raw
+
+        start = time.perf_counter()
+        try:
+            return load(counting_read)
+        finally:
+            self.files.append((str(file_path), kind, pack_dir, time.perf_counter() - start, bytes_read))
+
+    def take_delta(self) -> List[Tuple[str, str, str, float, int]]:
+        """
+        Return and reset the file records (sent back by worker processes).
+        """
+        files, self.files = self.files, []
+        return files
+
+    def merge_delta(self, files: List[Tuple[str, str, str, float, int]]) -> None:
+        """
+        Merge file records collected in another process.
+        """
+        self.files.extend(files)
+
+    def to_dict(self, command: str, slowest: int = DEFAULT_SLOWEST,
+                profile: Optional[Path] = None) -> Dict[str, Any]:
+        """
+        Return the machine-readable report.
+        """
+        cache = build_cache.get_cache()
+
+        by_kind: Dict[str, Dict[str, Any]] = {}
+        by_pack: Dict[str, Dict[str, Any]] = {}
+        for _, kind, pack_dir, seconds, size in self.files:
+            for totals, key in ((by_kind, kind), (by_pack, pack_dir)):
+                entry = totals.setdefault(key, {'files': 0, 'bytes_read': 0, 'seconds': 0.0})
+                entry['files'] += 1
+                entry['bytes_read'] += size
+                entry['seconds'] += seconds
+
+        slowest_files = sorted(self.files, key=lambda record: record[3], reverse=True)[:slowest]
+
+        return {
+            'version': REPORT_VERSION,
+            'command': command,
+            'started_at': self.started_at.isoformat(),
+            'total_seconds': time.perf_counter() - self.start,
+            'stages': [{'name': name, **entry} for name, entry in self.stages.items()],
+            'files': {
+                'count': len(self.files),
+                'bytes_read': sum(record[4] for record in self.files),
+                'seconds': sum(record[3] for record in self.files),
+                'by_kind': by_kind,
+            },
+            'packs': by_pack,
+            'cache': {'enabled': cache.enabled, 'hits': cache.hits, 'misses': cache.misses},
+            'slowest_files': [
+                {'path': path, 'kind': kind, 'pack': pack_dir, 'seconds': seconds, 'bytes_read': size}
+                for path, kind, pack_dir, seconds, size in slowest_files
+            ],
+            'profile': str(profile) if profile else None,
+        }
+
+    def write(self, report_file: Path, command: str, slowest: int = DEFAULT_SLOWEST,
+              profile: Optional[Path] = None) -> Dict[str, Any]:
+        """
+        Write the report as JSON and return it.
+        """
+        report = self.to_dict(command, slowest, profile)
+        report_file = Path(report_file)
+        report_file.parent.mkdir(parents=True, exist_ok=True)
+        report_file.write_text(json.dumps(report, indent=2) + '\n', encoding='utf-8')
+        return report
+
+
+# Process-wide report; disabled until configured
+_report = BuildReport()
+
+
+def configure(enabled: bool = True) -> BuildReport:
+    """
+    Set up the process-wide report.
+    """
+    global _report
+    _report = BuildReport(enabled=enabled)
+    return _report
+
+
+def get_report() -> BuildReport:
+    """
+    Return the process-wide report.
+    """
+    return _report
+
+
+def stage(name: str):
+    """
+    Time a block as a stage of the process-wide report.
+    """
+    return _report.stage(name)
+
+
+def init_worker(enabled: bool) -> None:
+    """
+    Process pool initializer: record files in the worker when the parent does.
+    """
+    configure(enabled)
+
+
+def add_arguments(parser) -> None:
+    """
+    Add the --report, --slowest and --profile options to an argparse parser.
+    """
+    parser.add_argument('--report', type=Path, metavar='FILE',
+                        help='Write per-stage timings, per-file parse times, bytes read and '
+                             'cache hits as JSON (e.g. build-report.json)')
+    parser.add_argument('--slowest', type=int, default=DEFAULT_SLOWEST, metavar='N',
+                        help=f'Number of slowest files listed in the report (default: {DEFAULT_SLOWEST})')
+    parser.add_argument('--profile', type=Path, metavar='FILE',
+                        help='Run under cProfile and dump pstats to FILE')
+
+
+def print_summary(report: Dict[str, Any], report_file: Path) -> None:
+    """
+    Print the stage timings and slowest files of a report.
+    """
+    print(f"📈 Build report: {report['total_seconds'] * 1000:.1f} ms total, "
+          f"{report['files']['count']} files, {report['files']['bytes_read'] / 1024:.1f} KiB read, "
+          f"{report['cache']['hits']} cache hits")
+    for entry in report['stages']:
+        depth = entry['name'].count('/')
+        name = entry['name'].rsplit('/', 1)[-1]
+        print(f"   {'  ' * depth}• {name:<{24 - 2 * depth}} {entry['seconds'] * 1000:9.1f} ms")
+    if report['slowest_files']:
+        print("   Slowest files:")
+        for entry in report['slowest_files'][:5]:
+            print(f"     {entry['seconds'] * 1000:7.2f} ms  {entry['path']}")
+    print(f"✅ Wrote {report_file}")
+
+
+@contextmanager
+def profiled(profile_file: Optional[Path]) -> Iterator[None]:
+    """
+    Run the block under cProfile and dump pstats to profile_file (if given).
+    """
+    if profile_file is None:
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        Path(profile_file).parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(profile_file))
+        print(f"✅ Wrote {profile_file} (inspect with: python -m pstats {profile_file})")
@@ -3,15 +3,46 @@
 Build the documentation website by combining pack data and MCP data into data.json.
 """
 
+import argparse
 import json
 import sys
-from datetime import datetime, timezone
+import time
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Set
+
+import build_cache
+import build_report
+import file_watch
+import pack_scanner
+import parallel
+import search_index
+import site_shards
+import source_stamp
+from pack_discovery import MARKETPLACE_FILE, PLUGIN_FILE, discover_packs, scan_packs
+import site_assets
+from site_assets import SiteWriter
+from validate_structure import validate_packs
 
 # Import our data generators
-from generate_pack_data import generate_pack_data
-from generate_mcp_data import generate_mcp_data
+from generate_pack_data import generate_pack_data, parse_pack
+from generate_mcp_data import (dedupe_mcp_servers, expand_mcp_servers, generate_mcp_data,
+                               generate_pack_mcp_data, load_custom_mcp_data)
+
+REPOSITORY = {
+    'name': 'agentic-collections',
+    'owner': 'Red Hat Ecosystem Engineering',
+    'description': 'Agentic collections for Red Hat platforms and products',
+    'url': 'https://github.com/RHEcosystemAppEng/agentic-collections'
+}
+
+DOCS_DIR = Path('docs')
+
+# Site assembled by optimized builds for deployment (index.html pointing at hashed assets)
+DEPLOY_DIR = Path('_site')
+
+# Site config files that feed data.json
+ICONS_FILE = DOCS_DIR / 'icons.json'
+MCP_CONFIG_FILE = DOCS_DIR / 'mcp.json'
 
 
 def load_icons() -> Dict[str, Dict[str, str]]:
@@ -21,7 +52,7 @@ def load_icons() -> Dict[str, Dict[str, str]]:
     Returns:
         Dictionary with 'packs' and 'mcp_servers' icon mappings
     """
-    icons_file = Path('docs/icons.json')
+    icons_file = ICONS_FILE
     
     if not icons_file.exists():
         print("⚠️  Warning: docs/icons.json not found, icons will not be loaded")
@@ -35,63 +66,193 @@ def load_icons() -> Dict[str, Dict[str, str]]:
         return {'packs': {}, 'mcp_servers': {}}
 
 
-def build_website():
+def apply_icons(pack_data: List[Dict[str, Any]], mcp_data: List[Dict[str, Any]],
+                icons: Dict[str, Dict[str, str]]) -> None:
+    """
+    Set the icon of every pack and MCP server from the icon mappings.
+    """
+    for pack in pack_data:
+        pack['icon'] = icons['packs'].get(pack['name'], '')
+
+    for server in mcp_data:
+        server['icon'] = icons['mcp_servers'].get(server['name'], '')
+
+
+def assemble_output(pack_data: List[Dict[str, Any]], mcp_data: List[Dict[str, Any]],
+                    generated_at: str) -> Dict[str, Any]:
+    """
+    Combine pack and MCP server data into the data.json contents.
+
+    MCP servers are stored once (see dedupe_mcp_servers()); each pack lists
+    the servers it ships in its own 'mcp_servers' references. The content
+    hash covers everything but generated_at and content_hash itself, so it
+    only changes when the site data does.
+
+    Args:
+        pack_data: Pack records (their 'mcp_servers' references are set here)
+        mcp_data: MCP server records, one per (pack, server)
+        generated_at: Time of the latest source change (see source_stamp)
+    """
+    servers, refs = dedupe_mcp_servers(mcp_data)
+    for pack in pack_data:
+        pack['mcp_servers'] = refs.get(pack['name'], [])
+
+    output = {
+        'repository': REPOSITORY,
+        'packs': pack_data,
+        'mcp_servers': servers,
+    }
+    output['generated_at'] = generated_at
+    output['content_hash'] = source_stamp.content_hash(
+        {key: output[key] for key in ('repository', 'packs', 'mcp_servers')})
+    return output
+
+
+def source_timestamp(pack_dirs: List[str]) -> str:
+    """
+    Return the time of the latest change to the packs or the site config files.
+    """
+    return source_stamp.source_timestamp(pack_dirs, [ICONS_FILE, MCP_CONFIG_FILE])
+
+
+def site_unchanged(output: Dict[str, Any], optimize: bool = False) -> bool:
+    """
+    Return True when docs/ already holds a development build of this content.
+
+    Optimized builds are always written: they also hash styles.css and
+    app.js, which the content hash does not cover. So is a development build
+    after an optimized one, which removes the hashed assets and the manifest.
+    """
+    if optimize or (DOCS_DIR / 'manifest.json').exists():
+        return False
+    if not all((DOCS_DIR / name).exists() for name in ('index.json', 'search-index.json')):
+        return False
+    return source_stamp.stored_content_hash(DOCS_DIR / 'data.json') == output['content_hash']
+
+
+def write_site(output: Dict[str, Any], optimize: bool = False, verbose: bool = True,
+               force: bool = False) -> Optional[SiteWriter]:
+    """
+    Write data.json, index.json, the detail shards and the search index.
+
+    Every file is replaced atomically (temp file + rename). Nothing is
+    written when docs/ already holds the same content (see site_unchanged()).
+
+    Args:
+        output: Full data.json contents
+        optimize: Emit minified, content-hashed and precompressed assets
+        verbose: Print a line per generated file
+        force: Write the files even if the content is unchanged
+
+    Returns:
+        The SiteWriter used (lists the files written), or None if skipped
+    """
+    if not force and site_unchanged(output, optimize):
+        if verbose:
+            print(f"⏭️  {DOCS_DIR / 'data.json'} unchanged (content hash {output['content_hash']}), "
+                  f"nothing written")
+        return None
+
+    # Ensure docs directory exists
+    DOCS_DIR.mkdir(exist_ok=True)
+
+    writer = SiteWriter(DOCS_DIR, optimize=optimize, deploy_dir=DEPLOY_DIR)
+
+    # Write data.json
+    with build_report.stage('data_json'):
+        writer.write_json('data.json', output, in_manifest=True)
+
+    # Write index.json + per-pack / per-server shards for the site
+    with build_report.stage('shards'):
+        shard_count = site_shards.write_sharded(output, writer)
+
+    # Write the inverted index the site search runs on
+    with build_report.stage('search_index'):
+        index = search_index.build_search_index(output)
+        writer.write_json('search-index.json', index, in_manifest=True)
+
+    # Hash static assets and write the manifest (optimize mode only)
+    with build_report.stage('assets'):
+        manifest_file = writer.finish()
+
+    if verbose:
+        print(f"✅ Generated {DOCS_DIR / 'data.json'}")
+        print(f"✅ Generated {DOCS_DIR / 'index.json'} and {shard_count} detail shards")
+        print(f"✅ Generated {DOCS_DIR / 'search-index.json'} "
+              f"({len(index['terms'])} terms, {len(index['entities'])} entries)")
+        if manifest_file:
+            print(f"✅ Generated {manifest_file} ({len(writer.written)} files incl. .gz/.br)")
+            print(f"✅ Assembled {DEPLOY_DIR}/ for deployment")
+            if site_assets.brotli is None:
+                print("⚠️  brotli is not installed, no .br files were written "
+                      "(pip install -r scripts/requirements.txt)")
+
+    return writer
+
+
+def build_website(use_cache: bool = True, rebuild: bool = False, jobs: Optional[int] = None,
+                  validate: bool = False, optimize: bool = False, watch: bool = False,
+                  interval: float = file_watch.DEFAULT_INTERVAL, report_file: Optional[Path] = None,
+                  slowest: int = build_report.DEFAULT_SLOWEST, profile_file: Optional[Path] = None,
+                  force: bool = False):
     """
     Generate the complete website data file.
+
+    Args:
+        use_cache: Read and update the persistent build cache
+        rebuild: Ignore cached entries and re-parse every file
+        jobs: Number of worker processes for pack parsing (None for the CPU count)
+        validate: Validate the packs first, reusing the same scans for generation
+        optimize: Emit minified, content-hashed and precompressed assets
+        watch: Keep running and rebuild incrementally when sources change
+        interval: Seconds between checks for changes in watch mode
+        report_file: Write a build report (timings, I/O, cache hits) to this file
+        slowest: Number of slowest files listed in the report
+        profile_file: cProfile output recorded alongside the report (listed in it)
+        force: Rewrite the site files even if their content is unchanged
     """
+    cache = build_cache.configure(enabled=use_cache, rebuild=rebuild)
+    report = build_report.configure(enabled=report_file is not None)
+
+    with build_report.stage('discover'):
+        pack_dirs = discover_packs()
+
+    if validate:
+        with build_report.stage('validate'):
+            valid = validate_packs(pack_dirs, jobs) == 0
+        if not valid:
+            cache.save()
+            return 1
+
     print("🔨 Building documentation website...")
     print()
 
     # Load icons
     print("🎨 Loading icons...")
-    icons = load_icons()
+    with build_report.stage('icons'):
+        icons = load_icons()
     print()
 
     # Generate pack data
     print("📦 Parsing agentic collections...")
-    pack_data = generate_pack_data()
-    
-    # Merge pack icons
-    for pack in pack_data:
-        pack_name = pack['name']
-        pack['icon'] = icons['packs'].get(pack_name, '')
-    
+    with build_report.stage('pack_data'):
+        pack_data = generate_pack_data(pack_dirs, jobs=jobs)
     print()
 
     # Generate MCP server data
     print("🔌 Parsing MCP servers...")
-    mcp_data = generate_mcp_data()
-    
-    # Merge MCP server icons
-    for server in mcp_data:
-        server_name = server['name']
-        server['icon'] = icons['mcp_servers'].get(server_name, '')
-    
+    with build_report.stage('mcp_data'):
+        mcp_data = generate_mcp_data(pack_dirs)
     print()
 
-    # Combine into final output
-    output = {
-        'repository': {
-            'name': 'agentic-collections',
-            'owner': 'Red Hat Ecosystem Engineering',
-            'description': 'Agentic collections for Red Hat platforms and products',
-            'url': 'https://github.com/RHEcosystemAppEng/agentic-collections'
-        },
-        'packs': pack_data,
-        'mcp_servers': mcp_data,
-        'generated_at': datetime.now(timezone.utc).isoformat()
-    }
-
-    # Ensure docs directory exists
-    docs_dir = Path('docs')
-    docs_dir.mkdir(exist_ok=True)
+    # Merge pack and MCP server icons
+    apply_icons(pack_data, mcp_data, icons)
 
-    # Write data.json
-    output_file = docs_dir / 'data.json'
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
+    # Combine into final output and write the site files
+    output = assemble_output(pack_data, mcp_data, source_timestamp(pack_dirs))
+    with build_report.stage('write_site'):
+        write_site(output, optimize=optimize, force=force)
 
-    print(f"✅ Generated {output_file}")
     print()
     print("📊 Summary:")
     print(f"   • {len(pack_data)} agentic collections")
@@ -99,11 +260,167 @@ def build_website():
     total_agents = sum(len(p['agents']) for p in pack_data)
     print(f"   • {total_skills} skills")
     print(f"   • {total_agents} agents")
-    print(f"   • {len(mcp_data)} MCP servers")
+    print(f"   • {len(output['mcp_servers'])} MCP servers ({len(mcp_data)} pack references)")
+    if use_cache:
+        print(f"   • {cache.hits} cached / {cache.misses} parsed files")
     print()
 
+    cache.save()
+
+    if report_file is not None:
+        summary = report.write(report_file, 'build_website', slowest, profile_file)
+        build_report.print_summary(summary, report_file)
+        print()
+
+    if watch:
+        return watch_website(output, icons, pack_dirs, interval)
+
+    return 0
+
+
+def watch_website(output: Dict[str, Any], icons: Dict[str, Dict[str, str]], pack_dirs: List[str],
+                  interval: float = file_watch.DEFAULT_INTERVAL) -> int:
+    """
+    Rebuild the site whenever a pack, docs/mcp.json or docs/icons.json changes.
+
+    Only the packs whose files changed are re-scanned and re-parsed (the
+    build cache skips their unchanged files); every other pack and MCP
+    server entry is reused from the previous build. When the marketplace
+    manifest or a plugin.json changes, packs are discovered again, so
+    added packs start being watched and removed ones drop out of the site.
+
+    Args:
+        output: Contents of the initial build's data.json
+        icons: Icon mappings of the initial build
+        pack_dirs: Pack directories of the initial build
+        interval: Seconds between checks for changes
+
+    Returns:
+        Exit code (0 when stopped with Ctrl+C)
+    """
+    cache = build_cache.get_cache()
+    custom_data = load_custom_mcp_data()
+
+    # Per-pack entries, rebuilt independently
+    packs = {pack['name']: pack for pack in output['packs']}
+    pack_servers = expand_mcp_servers(output)
+    servers = {pack_dir: [{k: v for k, v in s.items() if k != 'id'}
+                          for s in pack_servers if s['pack'] == pack_dir]
+               for pack_dir in pack_dirs}
+
+    # Packs may live below the repository root (group/pack)
+    pack_parts = {pack_dir: Path(pack_dir).parts for pack_dir in pack_dirs}
+
+    def take_snapshot():
+        # The plugin.json of every pack on disk, so new packs are noticed
+        manifests = [Path(pack_dir) / PLUGIN_FILE for pack_dir in scan_packs(Path('.'))]
+        return file_watch.snapshot(pack_dirs, [ICONS_FILE, MCP_CONFIG_FILE, MARKETPLACE_FILE] + manifests)
+
+    def on_change(changed: Set[str]):
+        nonlocal icons, custom_data, pack_dirs
+        start = time.perf_counter()
+        changed_paths = [Path(path) for path in changed]
+
+        added_packs: List[str] = []
+        removed_packs: List[str] = []
+        if any(path == MARKETPLACE_FILE or path.parts[-2:] == PLUGIN_FILE.parts for path in changed_paths):
+            previous_dirs = pack_dirs
+            pack_dirs = discover_packs(refresh=True)
+            added_packs = [pack_dir for pack_dir in pack_dirs if pack_dir not in pack_parts]
+            removed_packs = [pack_dir for pack_dir in previous_dirs if pack_dir not in pack_dirs]
+            for pack_dir in added_packs:
+                pack_parts[pack_dir] = Path(pack_dir).parts
+            for pack_dir in removed_packs:
+                pack_scanner.invalidate(pack_dir)
+                del pack_parts[pack_dir]
+                packs.pop(pack_dir, None)
+                servers.pop(pack_dir, None)
+
+        changed_packs = [pack_dir for pack_dir in pack_dirs
+                         if pack_dir in added_packs
+                         or any(path.parts[:len(pack_parts[pack_dir])] == pack_parts[pack_dir]
+                                for path in changed_paths)]
+        mcp_config_changed = MCP_CONFIG_FILE in changed_paths
+
+        if ICONS_FILE in changed_paths:
+            icons = load_icons()
+        if mcp_config_changed:
+            custom_data = load_custom_mcp_data()
+
+        for pack_dir in changed_packs:
+            pack_scanner.invalidate(pack_dir)
+            pack = parse_pack(pack_dir)
+            if pack is None:
+                packs.pop(pack_dir, None)
+            else:
+                packs[pack_dir] = pack
+
+        for pack_dir in pack_dirs:
+            if mcp_config_changed or pack_dir in changed_packs:
+                servers[pack_dir] = generate_pack_mcp_data(pack_dir, custom_data)
+
+        pack_data = [packs[pack_dir] for pack_dir in pack_dirs if pack_dir in packs]
+        mcp_data = [server for pack_dir in pack_dirs for server in servers[pack_dir]]
+        apply_icons(pack_data, mcp_data, icons)
+        output = assemble_output(pack_data, mcp_data, source_timestamp(pack_dirs))
+        written = write_site(output, verbose=False) is not None
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        sources = (changed_packs + [f'{pack_dir} (removed)' for pack_dir in removed_packs]
+                   + [path.name for path in (ICONS_FILE, MCP_CONFIG_FILE, MARKETPLACE_FILE)
+                      if path in changed_paths])
+        print(f"🔄 Rebuilt {', '.join(sources) or 'site'} in {elapsed_ms:.1f} ms "
+              f"({len(changed)} changed file{'s' if len(changed) != 1 else ''})"
+              f"{'' if written else ', output unchanged'}")
+
+    print(f"👀 Watching {', '.join(pack_dirs)}, {ICONS_FILE}, {MCP_CONFIG_FILE} "
+          f"and {MARKETPLACE_FILE} (Ctrl+C to stop)")
+
+    try:
+        file_watch.poll(take_snapshot, on_change, interval)
+    except KeyboardInterrupt:
+        print()
+        print("👋 Stopped watching")
+    finally:
+        cache.save()
+
     return 0
 
 
+def parse_args(argv=None):
+    """
+    Parse command line arguments.
+    """
+    parser = argparse.ArgumentParser(description='Build docs/data.json from the agentic collections.')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Do not read or write the build cache')
+    parser.add_argument('--rebuild', action='store_true',
+                        help='Ignore the build cache and re-parse every file')
+    parser.add_argument('--jobs', '-j', type=parallel.positive_int, default=None,
+                        help='Number of worker processes for pack parsing (default: CPU count)')
+    parser.add_argument('--validate', action='store_true',
+                        help='Validate pack structure before generating (each file is read once)')
+    parser.add_argument('--optimize', action='store_true',
+                        help='Emit minified, content-hashed, precompressed assets and a manifest, and assemble _site/ for deploys')
+    parser.add_argument('--watch', action='store_true',
+                        help='After building, rebuild changed packs whenever their files change')
+    parser.add_argument('--interval', type=float, default=file_watch.DEFAULT_INTERVAL,
+                        help=f'Seconds between checks for changes with --watch (default: {file_watch.DEFAULT_INTERVAL})')
+    parser.add_argument('--force', action='store_true',
+                        help='Rewrite the site files even if their content hash is unchanged')
+    build_report.add_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.watch and args.optimize:
+        parser.error('--watch cannot be combined with --optimize')
+    return args
+
+
 if __name__ == '__main__':
-    sys.exit(build_website())
+    args = parse_args()
+    with build_report.profiled(args.profile):
+        exit_code = build_website(use_cache=not args.no_cache, rebuild=args.rebuild, jobs=args.jobs,
+                                  validate=args.validate, optimize=args.optimize, watch=args.watch,
+                                  interval=args.interval, report_file=args.report,
+                                  slowest=args.slowest, profile_file=args.profile,
+                                  force=args.force)
+    sys.exit(exit_code)
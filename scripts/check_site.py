@@ -48,7 +48,9 @@ def print_summary(data):
     print(f"\n🔌 MCP Servers ({len(data['mcp_servers'])} total)")
     print("   " + "-"*56)
     for server in data['mcp_servers']:
-        print(f"   • {server['name']} (from {server['pack']})")
+        packs = [pack['name'] for pack in data['packs']
+                 if any(ref['id'] == server['id'] for ref in pack.get('mcp_servers', []))]
+        print(f"   • {server['name']} (from {', '.join(packs)})")
         print(f"     Command: {server['command']}")
         if server['env']:
             print(f"     Env vars: {', '.join(server['env'])}")
@@ -0,0 +1,537 @@
+#!/usr/bin/env python3
+"""
+Local development server for the documentation site (`make serve`).
+
+A threaded replacement for `python -m http.server` that behaves like the
+static hosting the site is deployed to:
+
+- ETag / If-None-Match: unchanged files are answered with 304 Not Modified
+- Range requests (single byte ranges, 206 Partial Content)
+- Content negotiation of precompressed .br / .gz siblings written by
+  `build_website.py --optimize`; other text files are gzipped on the fly and
+  kept in an in-memory cache until they change
+- Cache-Control: content-hashed files under assets/ are immutable, everything
+  else must be revalidated (no-cache)
+
+With --live-reload, index.html gets a small script that listens on the
+/__livereload event stream and reloads the page whenever data.json (rewritten
+on every `make watch` rebuild), index.html, app.js or styles.css change.
+"""
+
+import argparse
+import gzip
+import hashlib
+import io
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+from functools import partial
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import file_watch
+from site_assets import ASSETS_DIR, HASH_LENGTH
+
+DEFAULT_PORT = 8000
+DEFAULT_DIRECTORY = 'docs'
+
+# Endpoint of the live-reload event stream
+LIVE_RELOAD_PATH = '/__livereload'
+
+# Files whose change triggers a live reload, relative to the served directory
+LIVE_RELOAD_FILES = ['data.json', 'index.html', 'app.js', 'styles.css']
+
+# Seconds between keep-alive comments on an idle event stream
+LIVE_RELOAD_KEEPALIVE = 15.0
+
+LIVE_RELOAD_SCRIPT = (
+    '<script>new EventSource("' + LIVE_RELOAD_PATH + '")'
+    '.addEventListener("reload", function () { location.reload(); });</script>'
+)
+
+# Precompressed siblings, in order of preference
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+# Types worth gzipping on the fly when no precompressed sibling exists
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript', 'image/svg+xml')
+
+# Smaller files are not worth compressing (as in site_assets)
+MIN_COMPRESS_BYTES = 256
+
+# Number of gzipped bodies kept in memory
+COMPRESS_CACHE_SIZE = 256
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+REVALIDATE_CACHE_CONTROL = 'no-cache'
+
+_HASHED_ASSET_RE = re.compile(rf'^{ASSETS_DIR}/.+\.[0-9a-f]{{{HASH_LENGTH}}}\.[^/]+$')
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class CompressCache:
+    """
+    Thread-safe LRU cache of gzipped file bodies, keyed by path and stat.
+    """
+
+    def __init__(self, size: int = COMPRESS_CACHE_SIZE):
+        self.size = size
+        self._entries: 'OrderedDict[Tuple[str, int, int], bytes]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: str, stat: os.stat_result) -> bytes:
+        """
+        Return the gzipped contents of a file, compressing it on a miss.
+        """
+        key = (path, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+                return body
+
+        with open(path, 'rb') as f:
+            body = gzip.compress(f.read(), compresslevel=6, mtime=0)
+
+        with self._lock:
+            # Entries of older versions of the file are never hit again
+            for stale in [k for k in self._entries if k[0] == path]:
+                del self._entries[stale]
+            self._entries[key] = body
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+        return body
+
+
+class LiveReload:
+    """
+    Watches the site files and wakes up event-stream clients when they change.
+    """
+
+    def __init__(self, directory: Path, interval: float = file_watch.DEFAULT_INTERVAL):
+        self.files = [directory / name for name in LIVE_RELOAD_FILES]
+        self.interval = interval
+        self.version = 0
+        self._condition = threading.Condition()
+
+    def start(self) -> None:
+        """
+        Start polling in a daemon thread.
+        """
+        thread = threading.Thread(target=self._run, name='live-reload', daemon=True)
+        thread.start()
+
+    def _run(self) -> None:
+        file_watch.poll(lambda: file_watch.snapshot([], self.files), self._on_change, self.interval)
+
+    def _on_change(self, changed) -> None:
+        with self._condition:
+            self.version += 1
+            self._condition.notify_all()
+
+    def wait(self, version: int, timeout: float) -> int:
+        """
+        Block until the version moves past the given one or the timeout expires.
+
+        Returns:
+            The current version
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+
+class DevRequestHandler(SimpleHTTPRequestHandler):
+    """
+    Static file handler with validators, ranges, compression and cache headers.
+    """
+
+    # Keep-alive, like production hosting; every response sets Content-Length
+    protocol_version = 'HTTP/1.1'
+
+    def __init__(self, *args, compress_cache: CompressCache, live_reload: Optional[LiveReload] = None,
+                 quiet: bool = False, **kwargs):
+        self.compress_cache = compress_cache
+        self.live_reload = live_reload
+        self.quiet = quiet
+        self._remaining: Optional[int] = None
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        if self.live_reload is not None and urlsplit(self.path).path == LIVE_RELOAD_PATH:
+            self.serve_live_reload()
+            return
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+    def send_head(self):
+        """
+        Send the headers for a GET/HEAD request and return the body to copy.
+        """
+        self._remaining = None
+        path = self.translate_path(self.path)
+
+        if os.path.isdir(path):
+            index = os.path.join(path, 'index.html')
+            if not urlsplit(self.path).path.endswith('/') or not os.path.isfile(index):
+                # Redirects and directory listings stay with http.server
+                return super().send_head()
+            path = index
+
+        if not os.path.isfile(path) or path.endswith('/'):
+            self.send_error(HTTPStatus.NOT_FOUND, 'File not found')
+            return None
+
+        relative = os.path.relpath(path, self.directory).replace(os.sep, '/')
+        content_type = self.guess_type(path)
+        range_header = self.headers.get('Range')
+
+        if self.live_reload is not None and relative == 'index.html':
+            return self._send_body(self._index_with_live_reload(path), content_type, relative,
+                                   tag_suffix='-lr', range_header=range_header)
+
+        stat = os.stat(path)
+        encoding, body_path = None, path
+        if range_header is None:
+            # Ranges address the identity representation, so never compress them
+            encoding, body_path = self._negotiate(path)
+
+        if encoding == 'gzip' and body_path == path:
+            # No precompressed sibling: serve from the compression cache
+            if content_type.startswith(COMPRESSIBLE_TYPES) and stat.st_size >= MIN_COMPRESS_BYTES:
+                return self._send_body(self.compress_cache.get(path, stat), content_type, relative,
+                                       tag_suffix='-gz', encoding='gzip', vary=True,
+                                       stat=stat)
+            encoding = None
+
+        body_stat = os.stat(body_path) if body_path != path else stat
+        etag = _etag(body_stat, f'-{encoding}' if encoding else '')
+        if self._not_modified(etag, relative):
+            return None
+
+        try:
+            f = open(body_path, 'rb')
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, 'File not found')
+            return None
+
+        size = body_stat.st_size
+        start, end = 0, size - 1
+        status = HTTPStatus.OK
+        if range_header is not None and self._range_applies(etag):
+            byte_range = parse_range(range_header, size)
+            if byte_range is None:
+                f.close()
+                self._send_unsatisfiable(size)
+                return None
+            if byte_range != (0, size - 1) or size == 0:
+                status = HTTPStatus.PARTIAL_CONTENT
+            start, end = byte_range
+
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self._send_common_headers(etag, relative, body_stat.st_mtime)
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        if encoding or self._has_compressed_variant(path, content_type, stat.st_size):
+            self.send_header('Vary', 'Accept-Encoding')
+        if status == HTTPStatus.PARTIAL_CONTENT:
+            self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+        length = max(end - start + 1, 0)
+        self.send_header('Content-Length', str(length))
+        self.end_headers()
+
+        f.seek(start)
+        self._remaining = length
+        return f
+
+    def copyfile(self, source, outputfile):
+        """
+        Copy the response body, stopping at the end of the requested range.
+        """
+        remaining = self._remaining
+        if remaining is None:
+            super().copyfile(source, outputfile)
+            return
+        while remaining > 0:
+            chunk = source.read(min(64 * 1024, remaining))
+            if not chunk:
+                break
+            outputfile.write(chunk)
+            remaining -= len(chunk)
+
+    def _send_body(self, body: bytes, content_type: str, relative: str, tag_suffix: str,
+                   encoding: Optional[str] = None, vary: bool = False,
+                   stat: Optional[os.stat_result] = None, range_header: Optional[str] = None):
+        """
+        Send an in-memory body (gzipped on the fly or rewritten index.html).
+        """
+        etag = _etag(stat, tag_suffix) if stat is not None else _body_etag(body, tag_suffix)
+        if self._not_modified(etag, relative):
+            return None
+
+        size = len(body)
+        status = HTTPStatus.OK
+        if range_header is not None and encoding is None and self._range_applies(etag):
+            byte_range = parse_range(range_header, size)
+            if byte_range is None:
+                self._send_unsatisfiable(size)
+                return None
+            start, end = byte_range
+            if (start, end) != (0, size - 1):
+                status = HTTPStatus.PARTIAL_CONTENT
+                body = body[start:end + 1]
+
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self._send_common_headers(etag, relative)
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        if vary:
+            self.send_header('Vary', 'Accept-Encoding')
+        if status == HTTPStatus.PARTIAL_CONTENT:
+            self.send_header('Content-Range', f'bytes {start}-{end}/{size}')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        return io.BytesIO(body)
+
+    def _send_common_headers(self, etag: str, relative: str, mtime: Optional[float] = None) -> None:
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', cache_control(relative))
+        self.send_header('Accept-Ranges', 'bytes')
+        if mtime is not None:
+            self.send_header('Last-Modified', self.date_time_string(int(mtime)))
+
+    def _send_unsatisfiable(self, size: int) -> None:
+        self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+        self.send_header('Content-Range', f'bytes */{size}')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def _not_modified(self, etag: str, relative: str) -> bool:
+        """
+        Answer 304 when If-None-Match lists the current ETag.
+        """
+        if not etag_matches(self.headers.get('If-None-Match'), etag):
+            return False
+        self.send_response(HTTPStatus.NOT_MODIFIED)
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', cache_control(relative))
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+        return True
+
+    def _range_applies(self, etag: str) -> bool:
+        """
+        A Range is honoured unless If-Range names a different version.
+        """
+        if_range = self.headers.get('If-Range')
+        return if_range is None or if_range.strip() == etag
+
+    def _negotiate(self, path: str) -> Tuple[Optional[str], str]:
+        """
+        Pick the best encoding the client accepts.
+
+        Returns:
+            (content coding, path of the file to send); a 'gzip' coding with
+            the original path means "compress on the fly"
+        """
+        accepted = accepted_encodings(self.headers.get('Accept-Encoding', ''))
+        if not accepted:
+            return None, path
+
+        source_mtime = os.stat(path).st_mtime_ns
+        for encoding, suffix in ENCODINGS:
+            if encoding not in accepted:
+                continue
+            candidate = path + suffix
+            try:
+                # A sibling older than its source is stale, not a variant
+                if os.stat(candidate).st_mtime_ns >= source_mtime:
+                    return encoding, candidate
+            except FileNotFoundError:
+                continue
+
+        if 'gzip' in accepted:
+            return 'gzip', path
+        return None, path
+
+    def _has_compressed_variant(self, path: str, content_type: str, size: int) -> bool:
+        if content_type.startswith(COMPRESSIBLE_TYPES) and size >= MIN_COMPRESS_BYTES:
+            return True
+        return any(os.path.exists(path + suffix) for _, suffix in ENCODINGS)
+
+    def _index_with_live_reload(self, path: str) -> bytes:
+        html = Path(path).read_text(encoding='utf-8')
+        return html.replace('</body>', f'{LIVE_RELOAD_SCRIPT}\n</body>', 1).encode('utf-8')
+
+    def serve_live_reload(self) -> None:
+        """
+        Hold a text/event-stream open and send a "reload" event after each rebuild.
+        """
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-store')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+
+        version = self.live_reload.version
+        try:
+            self.wfile.write(b'retry: 500\n\n')
+            self.wfile.flush()
+            while True:
+                current = self.live_reload.wait(version, LIVE_RELOAD_KEEPALIVE)
+                if current != version:
+                    version = current
+                    self.wfile.write(f'event: reload\ndata: {version}\n\n'.encode('ascii'))
+                else:
+                    self.wfile.write(b': keep-alive\n\n')
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def _etag(stat: os.stat_result, suffix: str = '') -> str:
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}{suffix}"'
+
+
+def _body_etag(body: bytes, suffix: str = '') -> str:
+    return f'"{hashlib.sha256(body).hexdigest()[:16]}{suffix}"'
+
+
+def cache_control(relative: str) -> str:
+    """
+    Return the Cache-Control value for a path relative to the served directory.
+    """
+    if _HASHED_ASSET_RE.match(relative):
+        return IMMUTABLE_CACHE_CONTROL
+    return REVALIDATE_CACHE_CONTROL
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """
+    Return True when an If-None-Match header lists the ETag (weak comparison).
+    """
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    candidates = [tag.strip() for tag in header.split(',')]
+    return any(tag.removeprefix('W/') == etag for tag in candidates)
+
+
+def accepted_encodings(header: str) -> List[str]:
+    """
+    Return the content codings an Accept-Encoding header allows (q > 0).
+    """
+    accepted = []
+    for part in header.split(','):
+        fields = [field.strip() for field in part.split(';')]
+        coding = fields[0].lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in fields[1:]:
+            if param.startswith('q='):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.append(coding)
+    if '*' in accepted:
+        accepted.extend(encoding for encoding, _ in ENCODINGS)
+    return accepted
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range "bytes=" header against a file size.
+
+    Returns:
+        Inclusive (start, end) offsets, or None when the range cannot be
+        satisfied (multi-range requests are served as the first range)
+    """
+    match = _RANGE_RE.match(header.split(',')[0].strip())
+    if match is None:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        # Suffix range: the last N bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            return None
+        return max(size - length, 0), size - 1
+    start = int(first)
+    if start >= size:
+        return None
+    end = min(int(last), size - 1) if last else size - 1
+    if end < start:
+        return None
+    return start, end
+
+
+def serve(directory: Path, port: int = DEFAULT_PORT, bind: str = '', live_reload: bool = False,
+          quiet: bool = False) -> int:
+    """
+    Serve a directory until interrupted.
+
+    Returns:
+        Exit code (0 when stopped with Ctrl+C)
+    """
+    if not directory.is_dir():
+        print(f"❌ Error: {directory} not found; run 'make generate' first")
+        return 1
+
+    reload_notifier = None
+    if live_reload:
+        reload_notifier = LiveReload(directory)
+        reload_notifier.start()
+
+    handler = partial(DevRequestHandler, directory=str(directory), compress_cache=CompressCache(),
+                      live_reload=reload_notifier, quiet=quiet)
+    with ThreadingHTTPServer((bind, port), handler) as httpd:
+        httpd.daemon_threads = True
+        host = bind or 'localhost'
+        print(f"🌐 Serving {directory} on http://{host}:{port}"
+              f"{' with live reload' if live_reload else ''} (Ctrl+C to stop)")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            print()
+            print("👋 Stopped server")
+    return 0
+
+
+def parse_args(argv=None):
+    """
+    Parse command line arguments.
+    """
+    parser = argparse.ArgumentParser(description='Serve the documentation site like production static hosting.')
+    parser.add_argument('--port', '-p', type=int, default=DEFAULT_PORT,
+                        help=f'Port to listen on (default: {DEFAULT_PORT})')
+    parser.add_argument('--bind', '-b', default='',
+                        help='Address to bind to (default: all interfaces)')
+    parser.add_argument('--directory', '-d', type=Path, default=Path(DEFAULT_DIRECTORY),
+                        help=f'Directory to serve (default: {DEFAULT_DIRECTORY})')
+    parser.add_argument('--live-reload', action='store_true',
+                        help='Reload open pages when the site is rebuilt (pair with make watch)')
+    parser.add_argument('--quiet', '-q', action='store_true',
+                        help='Do not log requests')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    sys.exit(serve(args.directory, port=args.port, bind=args.bind, live_reload=args.live_reload,
+                   quiet=args.quiet))
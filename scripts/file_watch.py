@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Poll pack directories and site config files for changes.
+
+A snapshot maps every watched file to its (mtime_ns, size); comparing two
+snapshots yields the files that were added, removed or modified. Polling
+only stats files (a few hundred per pass for this repository), so a short
+interval keeps edit-to-rebuild latency low without platform-specific
+file system notification APIs.
+"""
+
+import os
+import time
+from typing import Callable, Dict, Iterable, Set, Tuple
+
+# Default polling interval, in seconds
+DEFAULT_INTERVAL = 0.05
+
+# Only these files feed the website data
+WATCHED_SUFFIXES = ('.md', '.json')
+
+# Hidden directories that hold watched files (others, like .git, are skipped)
+WATCHED_HIDDEN_DIRS = {'.claude-plugin'}
+
+# Directories that never hold watched files
+SKIPPED_DIRS = {'.ai-index', 'node_modules', '__pycache__'}
+
+Snapshot = Dict[str, Tuple[int, int]]
+
+
+def _walk(directory: str, snapshot: Snapshot) -> None:
+    """
+    Add the watched files under a directory to a snapshot.
+    """
+    try:
+        entries = list(os.scandir(directory))
+    except (FileNotFoundError, NotADirectoryError):
+        return
+
+    for entry in entries:
+        try:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name in SKIPPED_DIRS:
+                    continue
+                if entry.name.startswith('.') and entry.name not in WATCHED_HIDDEN_DIRS:
+                    continue
+                _walk(entry.path, snapshot)
+            elif entry.name.endswith(WATCHED_SUFFIXES):
+                stat = entry.stat()
+                snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            # Deleted while scanning; the next poll picks it up
+            continue
+
+
+def snapshot(directories: Iterable[str], files: Iterable[str] = ()) -> Snapshot:
+    """
+    Stat every watched file.
+
+    Args:
+        directories: Directories to scan recursively (.mcp.json files included)
+        files: Individual files to watch
+
+    Returns:
+        Mapping of file path to (mtime_ns, size)
+    """
+    result: Snapshot = {}
+
+    for directory in directories:
+        _walk(directory, result)
+
+    for file_path in files:
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            continue
+        result[str(file_path)] = (stat.st_mtime_ns, stat.st_size)
+
+    return result
+
+
+def changed_files(old: Snapshot, new: Snapshot) -> Set[str]:
+    """
+    Return the files added, removed or modified between two snapshots.
+    """
+    changed = {path for path, state in new.items() if old.get(path) != state}
+    changed.update(path for path in old if path not in new)
+    return changed
+
+
+def poll(take_snapshot: Callable[[], Snapshot], on_change: Callable[[Set[str]], None],
+         interval: float = DEFAULT_INTERVAL) -> None:
+    """
+    Call on_change with the changed files whenever a snapshot differs from
+    the previous one. Runs until interrupted (KeyboardInterrupt propagates).
+
+    Args:
+        take_snapshot: Returns the current snapshot
+        on_change: Called with the set of changed file paths
+        interval: Seconds between snapshots
+    """
+    previous = take_snapshot()
+
+    while True:
+        time.sleep(interval)
+        current = take_snapshot()
+        changed = changed_files(previous, current)
+        previous = current
+        if changed:
+            on_change(changed)
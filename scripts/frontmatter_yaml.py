@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Fast YAML loading for skill, agent and doc frontmatter.
+
+load() first tries a small parser for the flat frontmatter that skills and
+agents use (top-level keys with plain or quoted scalars, | literal blocks and
+simple lists). Anything it does not fully understand goes to PyYAML, using
+libyaml's CSafeLoader when it is available and behaves like SafeLoader.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, List, Optional, Tuple
+
+import yaml
+from yaml.reader import Reader
+from yaml.resolver import Resolver
+
+STR_TAG = 'tag:yaml.org,2002:str'
+
+# Exercises the scalar types frontmatter uses; CSafeLoader must agree with
+# SafeLoader on it before it is trusted
+_PROBE = '''
+name: probe
+description: |
+  Multi-line
+  literal block
+version: 1.0
+count: 3
+enabled: true
+empty:
+date: 2026-01-20
+tools: ["Read", 'Write', Bash]
+sources:
+  - title: Doc
+    url: https://example.com/a?b=c
+'''
+
+
+def _select_loader() -> type:
+    """
+    Return CSafeLoader if libyaml is present and loads the probe like SafeLoader.
+    """
+    try:
+        from yaml import CSafeLoader
+    except ImportError:
+        return yaml.SafeLoader
+
+    try:
+        expected = yaml.load(_PROBE, Loader=yaml.SafeLoader)
+        if yaml.load(_PROBE, Loader=CSafeLoader) == expected:
+            return CSafeLoader
+    except Exception:
+        pass
+
+    return yaml.SafeLoader
+
+
+# Loader used for everything the fast path hands over
+SafeLoader = _select_loader()
+
+# Returned by parse_flat() for input it leaves to PyYAML
+UNHANDLED = object()
+
+_KEY_LINE_RE = re.compile(r'([A-Za-z_][A-Za-z0-9_-]*):(?:[ ]+(.*?))?[ ]*')
+_SEQ_ITEM_RE = re.compile(r'( *)- +(.*?)[ ]*')
+_DOUBLE_QUOTED_RE = re.compile(r'"([^"\\]*)"')
+_SINGLE_QUOTED_RE = re.compile(r"'([^']*)'")
+_FLOW_ITEM = r'''(?:"[^"\\,\[\]{}]*"|'[^',\[\]{}]*'|[A-Za-z0-9_][A-Za-z0-9_./ -]*)'''
+_FLOW_SEQ_RE = re.compile(rf'\[ *(?:{_FLOW_ITEM}(?: *, *{_FLOW_ITEM})*)? *\]')
+_FLOW_ITEM_RE = re.compile(_FLOW_ITEM)
+
+# First characters that make a plain scalar something other than a string
+# (YAML indicators) or that the fast path does not handle
+_INDICATORS = set('-?:,[]{}#&*!|>\'"%@`')
+
+_resolver = Resolver()
+
+
+@lru_cache(maxsize=4096)
+def _is_str(value: str) -> bool:
+    """
+    Check that an unquoted scalar resolves to a string (not bool/int/date/...).
+    """
+    return _resolver.resolve(yaml.ScalarNode, value, (True, False)) == STR_TAG
+
+
+def _plain(value: str, flow: bool = False) -> Any:
+    """
+    Convert a single-line scalar, or return UNHANDLED.
+    """
+    match = _DOUBLE_QUOTED_RE.fullmatch(value) or _SINGLE_QUOTED_RE.fullmatch(value)
+    if match:
+        return match.group(1)
+
+    if (not value or value[0] in _INDICATORS or ': ' in value or ' #' in value
+            or value.endswith(':') or '\t' in value):
+        return UNHANDLED
+    if flow and any(c in value for c in ',[]{}'):
+        return UNHANDLED
+    if not _is_str(value):
+        return UNHANDLED
+
+    return value
+
+
+def _flow_sequence(value: str) -> Any:
+    """
+    Convert a one-line [a, "b", 'c'] sequence of strings, or return UNHANDLED.
+    """
+    if not _FLOW_SEQ_RE.fullmatch(value):
+        return UNHANDLED
+
+    items = []
+    for item in _FLOW_ITEM_RE.findall(value):
+        converted = _plain(item.strip(), flow=True)
+        if converted is UNHANDLED:
+            return UNHANDLED
+        items.append(converted)
+    return items
+
+
+def _literal_block(lines: List[str], start: int, strip: bool) -> Tuple[Any, int]:
+    """
+    Convert the indented lines of a | or |- block starting at lines[start].
+
+    Returns:
+        Tuple of (value or UNHANDLED, index of the first line after the block)
+    """
+    end = start
+    indent = None
+    while end < len(lines):
+        line = lines[end]
+        stripped = line.lstrip(' ')
+        if stripped:
+            if len(stripped) == len(line):
+                break
+            if indent is None:
+                if any(len(blank) > len(line) - len(stripped) for blank in lines[start:end]):
+                    # Over-indented blank lines before the content are a YAML error
+                    return UNHANDLED, end
+                indent = len(line) - len(stripped)
+            elif len(line) - len(stripped) < indent:
+                return UNHANDLED, end
+        end += 1
+
+    if indent is None:
+        return UNHANDLED, end
+
+    block = lines[start:end]
+    text_lines = [line[indent:] for line in block]
+    while text_lines and not text_lines[-1]:
+        text_lines.pop()
+    if not text_lines[-1].strip():
+        # Whitespace-only trailing lines: leave chomping details to PyYAML
+        return UNHANDLED, end
+
+    # Trailing blank lines belong to the next key, not to the block. Clip
+    # chomping keeps one line break, if the last content line had one.
+    text = '\n'.join(text_lines)
+    has_line_break = start + len(text_lines) < len(lines)
+    return (text if strip or not has_line_break else text + '\n'), end
+
+
+def _block_sequence(lines: List[str], start: int) -> Tuple[Any, int]:
+    """
+    Convert a block sequence of scalars ("- item" lines) starting at lines[start].
+
+    Returns:
+        Tuple of (value or UNHANDLED, index of the first line after the sequence)
+    """
+    items = []
+    indent = None
+    end = start
+
+    while end < len(lines):
+        line = lines[end]
+        if not line.strip():
+            end += 1
+            continue
+        match = _SEQ_ITEM_RE.fullmatch(line)
+        if not match:
+            break
+        if indent is None:
+            indent = len(match.group(1))
+        elif len(match.group(1)) != indent:
+            return UNHANDLED, end
+
+        item = _plain(match.group(2))
+        if item is UNHANDLED:
+            return UNHANDLED, end
+        items.append(item)
+        end += 1
+
+    return items, end
+
+
+def parse_flat(text: str) -> Any:
+    """
+    Parse flat frontmatter without PyYAML.
+
+    Args:
+        text: YAML text between the --- delimiters
+
+    Returns:
+        The same value yaml.safe_load() would return, or UNHANDLED when the
+        text uses anything beyond the supported subset
+    """
+    if '\r' in text or '\t' in text or '\ufeff' in text or Reader.NON_PRINTABLE.search(text):
+        return UNHANDLED
+
+    lines = text.split('\n')
+    data = {}
+    i = 0
+
+    while i < len(lines):
+        line = lines[i]
+        if not line.strip() or line.startswith('#'):
+            i += 1
+            continue
+
+        match = _KEY_LINE_RE.fullmatch(line)
+        if not match or not _is_str(match.group(1)):
+            return UNHANDLED
+
+        key, value = match.group(1), match.group(2) or ''
+        i += 1
+
+        if value in ('|', '|-'):
+            data[key], i = _literal_block(lines, i, strip=value == '|-')
+        elif value.startswith('['):
+            data[key] = _flow_sequence(value)
+        elif value:
+            data[key] = _plain(value)
+        else:
+            # Either a block sequence or an empty (null) value
+            data[key], i = _block_sequence(lines, i)
+            if data[key] == []:
+                data[key] = None
+
+        if data[key] is UNHANDLED:
+            return UNHANDLED
+
+        # Continuation lines of a multi-line scalar are not supported
+        if i < len(lines) and lines[i].startswith((' ', '\t')) and lines[i].strip():
+            return UNHANDLED
+
+    return data or None
+
+
+def load(text: str) -> Any:
+    """
+    Load frontmatter YAML, using the fast path when possible.
+
+    Args:
+        text: YAML text between the --- delimiters
+
+    Returns:
+        Parsed value, equal to what yaml.safe_load(text) returns
+
+    Raises:
+        yaml.YAMLError: If the text is not valid YAML
+    """
+    data = parse_flat(text)
+    if data is UNHANDLED:
+        return yaml.load(text, Loader=SafeLoader)
+    return data
+
+
+def loader_name(loader: Optional[type] = None) -> str:
+    """
+    Return a short name of the PyYAML loader in use (for reports).
+    """
+    return (loader or SafeLoader).__name__
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Generate the docs/.ai-index/bm25-index.json of every pack: a lexical index
+over its docs and skills for free-text lookups.
+
+Each doc and SKILL.md is reduced to weighted term frequencies: the words of
+the body count once, the skill description twice, and the title, tags,
+semantic_keywords and use_cases FIELD_WEIGHTS['keywords'] times. Words are
+lowercased, stopwords dropped and common suffixes stripped, so 'rebooting'
+finds 'reboot'. The index stores one posting list per term, one line each,
+and BM25Index ranks documents with Okapi BM25 in well under a millisecond
+once loaded. query_docs.py falls back to it when a task has no curated
+mapping.
+
+Docs are listed by their path relative to docs/, skills by their path
+relative to the pack ('skills/cve-impact/SKILL.md'). Term extraction goes
+through the build cache, so only changed files are re-read.
+"""
+
+import argparse
+import json
+import math
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import build_cache
+import pack_scanner
+import source_stamp
+import token_estimator
+from generate_chunk_index import STOPWORDS
+from generate_semantic_index import INDEX_DIR, index_is_current, load_index
+from pack_discovery import discover_packs
+from site_assets import atomic_write_bytes
+
+BM25_FILE = 'bm25-index.json'
+
+# Version written to new indexes (existing indexes keep theirs)
+BM25_INDEX_VERSION = '1.0'
+
+# Okapi BM25 parameters: term frequency saturation and length normalization
+K1 = 1.2
+B = 0.75
+
+# How many times a word of each field counts
+FIELD_WEIGHTS = {'body': 1, 'description': 2, 'keywords': 3}
+
+# Frontmatter fields indexed with the 'keywords' weight
+KEYWORD_FIELDS = ('title', 'tags', 'semantic_keywords', 'use_cases')
+
+# Bump when the extracted terms change (tokenizer, stemmer, weights)
+EXTRACT_VERSION = 1
+
+_WORD_RE = re.compile(r'[a-z][a-z0-9]*|[0-9]+[a-z][a-z0-9]*')
+_HEADING_RE = re.compile(r'^#\s+(.+?)\s*#*\s*$', re.MULTILINE)
+
+# Suffixes stripped by stem(), longest first: (suffix, replacement)
+_SUFFIXES = (('ations', 'ate'), ('ation', 'ate'), ('ities', 'ity'), ('ments', 'ment'),
+             ('ings', ''), ('ing', ''), ('ies', 'y'), ('ed', ''), ('es', ''), ('s', ''))
+
+
+def stem(word: str) -> str:
+    """
+    Strip a common English suffix from a word, keeping at least 3 letters
+    ('updates' -> 'updat', 'updating' -> 'updat').
+    """
+    if word.endswith('ss'):
+        return word
+    for suffix, replacement in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)] + replacement
+            break
+    # 'update' and 'updated' should meet: drop a trailing silent e
+    return word[:-1] if word.endswith('e') and len(word) > 4 else word
+
+
+def terms(text: str) -> List[str]:
+    """
+    Split text into index terms (lowercase, stemmed, without stopwords).
+    """
+    return [stem(word) for word in _WORD_RE.findall(text.lower())
+            if len(word) > 1 and word not in STOPWORDS]
+
+
+def extract_terms(raw: bytes) -> Dict[str, Any]:
+    """
+    Extract the weighted term frequencies of a doc or SKILL.md.
+
+    Args:
+        raw: Contents of the file
+
+    Returns:
+        Dictionary with 'terms' (term -> weighted frequency), 'length'
+        (sum of the frequencies) and 'tokens' (token estimate of the file)
+    """
+    (_, frontmatter, _), body_bytes = pack_scanner.parse_frontmatter(raw)
+    metadata = frontmatter if isinstance(frontmatter, dict) else {}
+    body = body_bytes.decode('utf-8', errors='replace')
+
+    keywords = []
+    for field in KEYWORD_FIELDS:
+        value = metadata.get(field)
+        if isinstance(value, list):
+            keywords.extend(str(item) for item in value)
+        elif value:
+            keywords.append(str(value))
+    if not metadata.get('title'):
+        heading = _HEADING_RE.search(body)
+        keywords.append(heading.group(1) if heading else '')
+    keywords.append(str(metadata.get('name') or ''))
+
+    counts: Counter = Counter()
+    for field, text in (('body', body), ('description', str(metadata.get('description') or '')),
+                        ('keywords', ' '.join(keywords).replace('_', ' '))):
+        for term in terms(text):
+            counts[term] += FIELD_WEIGHTS[field]
+
+    return {
+        'terms': dict(counts),
+        'length': sum(counts.values()),
+        'tokens': token_estimator.estimate_tokens(raw.decode('utf-8', errors='replace')),
+    }
+
+
+def build_index(files: List[Tuple[str, str, Dict[str, Any]]]) -> Tuple[List[Dict[str, Any]], Dict[str, List[int]]]:
+    """
+    Build the document table and posting lists.
+
+    Args:
+        files: (path, kind, extract_terms() result) per indexed file
+
+    Returns:
+        (documents, postings): documents lists {'path', 'kind', 'length',
+        'tokens'}; postings maps each term to a flat [doc, frequency, ...]
+        list, terms sorted
+    """
+    documents = []
+    postings: Dict[str, List[int]] = {}
+    for number, (path, kind, extracted) in enumerate(files):
+        documents.append({'path': path, 'kind': kind, 'length': extracted['length'],
+                          'tokens': extracted['tokens']})
+        for term, frequency in extracted['terms'].items():
+            postings.setdefault(term, []).extend((number, frequency))
+    return documents, dict(sorted(postings.items()))
+
+
+def serialize_bm25_index(index: Dict[str, Any]) -> bytes:
+    """
+    Serialize a BM25 index with one line per document and per term.
+    """
+    def dump(value: Any) -> str:
+        return json.dumps(value, ensure_ascii=False, separators=(', ', ': '))
+
+    fields = [f'  {dump(key)}: {dump(value)}' for key, value in index.items()
+              if key not in ('documents', 'postings')]
+    documents = ',\n'.join(f'    {dump(document)}' for document in index['documents'])
+    postings = ',\n'.join(f'    {dump(term)}: {dump(entries)}' for term, entries in index['postings'].items())
+    fields.append(f'  "documents": [\n{documents}\n  ]')
+    fields.append(f'  "postings": {{\n{postings}\n  }}')
+    return ('{\n' + ',\n'.join(fields) + '\n}\n').encode('utf-8')
+
+
+def generate_bm25_index(pack_dir: str) -> Optional[Dict[str, Any]]:
+    """
+    Build the BM25 index of a pack.
+
+    Args:
+        pack_dir: Pack directory
+
+    Returns:
+        Index contents, or None if the pack has no docs
+    """
+    scan = pack_scanner.scan_pack(pack_dir)
+    if not scan.docs:
+        return None
+
+    docs_dir = Path(pack_dir) / 'docs'
+    files = [(doc.path.relative_to(docs_dir).as_posix(), 'doc', doc.path) for doc in scan.docs]
+    files += [(skill.path.relative_to(pack_dir).as_posix(), 'skill', skill.path) for skill in scan.skills]
+    extracted = [(path, kind, build_cache.cached(f'bm25terms{EXTRACT_VERSION}', file_path,
+                                                 build_cache.read_bytes, extract_terms))
+                 for path, kind, file_path in files]
+    documents, postings = build_index(extracted)
+
+    existing = load_index(Path(pack_dir) / INDEX_DIR / BM25_FILE)
+    generated = existing.get('generated')
+    if generated is None or documents != existing.get('documents') or postings != existing.get('postings'):
+        generated = source_stamp.source_timestamp([], [file_path for _, _, file_path in files])
+
+    return {
+        'version': existing.get('version', BM25_INDEX_VERSION),
+        'generated': generated,
+        'description': existing.get('description', "Okapi BM25 posting lists over the pack's docs and "
+                                                   "skills, for free-text lookups (query_docs.py --search)."),
+        'parameters': {'k1': K1, 'b': B, 'extract_version': EXTRACT_VERSION},
+        'documents': documents,
+        'postings': postings,
+    }
+
+
+def write_bm25_indexes(pack_dirs: List[str], check: bool = False) -> int:
+    """
+    Regenerate the BM25 index of every pack.
+
+    Args:
+        pack_dirs: Pack directories
+        check: Only report indexes that are out of date, without writing them
+
+    Returns:
+        0 on success, 1 if check found an outdated index
+    """
+    outdated = []
+
+    for pack_dir in pack_dirs:
+        output = generate_bm25_index(pack_dir)
+        if output is None:
+            continue
+
+        index_file = Path(pack_dir) / INDEX_DIR / BM25_FILE
+        summary = f"{len(output['documents'])} documents, {len(output['postings'])} terms"
+
+        content = serialize_bm25_index(output)
+        if index_is_current(index_file, content):
+            print(f"✓ {index_file}: {summary}, up to date")
+        elif check:
+            outdated.append(index_file)
+            print(f"❌ {index_file}: out of date")
+        else:
+            index_file.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(index_file, content)
+            print(f"✅ Wrote {index_file}: {summary}")
+
+    if outdated:
+        print()
+        print("Run 'make ai-index' to regenerate the BM25 indexes.")
+        return 1
+    return 0
+
+
+class BM25Index:
+    """
+    A loaded BM25 index, ready to rank documents for a query.
+    """
+
+    def __init__(self, index: Dict[str, Any]):
+        parameters = index.get('parameters', {})
+        k1 = parameters.get('k1', K1)
+        b = parameters.get('b', B)
+        self.documents: List[Dict[str, Any]] = index.get('documents', [])
+        self.postings: Dict[str, List[int]] = index.get('postings', {})
+
+        count = len(self.documents)
+        average = sum(document['length'] for document in self.documents) / count if count else 0
+        # Per-document part of the BM25 denominator, computed once
+        self._norms = [k1 * (1 - b + b * document['length'] / average) if average else k1
+                       for document in self.documents]
+        self._k1 = k1
+        self._idf: Dict[str, float] = {}
+        self._count = count
+
+    def idf(self, term: str) -> float:
+        """
+        Return the inverse document frequency of a term (0 if unknown).
+        """
+        if term not in self._idf:
+            frequency = len(self.postings.get(term, ())) // 2
+            self._idf[term] = (math.log(1 + (self._count - frequency + 0.5) / (frequency + 0.5))
+                               if frequency else 0.0)
+        return self._idf[term]
+
+    def search(self, query: str, limit: Optional[int] = 10,
+               kind: Optional[str] = None) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Rank the documents matching a free-text query.
+
+        Args:
+            query: Free-text task description
+            limit: Maximum number of results (None for all)
+            kind: Only return documents of this kind ('doc' or 'skill')
+
+        Returns:
+            (document, score) pairs, best first (ties by path)
+        """
+        scores: Dict[int, float] = {}
+        for term in set(terms(query)):
+            entries = self.postings.get(term)
+            if not entries:
+                continue
+            idf = self.idf(term)
+            for position in range(0, len(entries), 2):
+                number, frequency = entries[position], entries[position + 1]
+                scores[number] = (scores.get(number, 0.0)
+                                  + idf * frequency * (self._k1 + 1) / (frequency + self._norms[number]))
+
+        ranked = sorted(((self.documents[number], score) for number, score in scores.items()
+                         if kind is None or self.documents[number]['kind'] == kind),
+                        key=lambda item: (-item[1], item[0]['path']))
+        return ranked[:limit] if limit is not None else ranked
+
+
+def load_bm25_index(pack_dir: str) -> Optional[BM25Index]:
+    """
+    Load the BM25 index of a pack (None if it has none).
+    """
+    index_file = Path(pack_dir) / INDEX_DIR / BM25_FILE
+    if not index_file.exists():
+        return None
+    return BM25Index(load_index(index_file))
+
+
+def parse_args(argv=None):
+    """
+    Parse command line arguments.
+    """
+    parser = argparse.ArgumentParser(description='Generate docs/.ai-index/bm25-index.json for every pack.')
+    parser.add_argument('packs', nargs='*',
+                        help='Pack directories (default: every discovered pack)')
+    parser.add_argument('--check', action='store_true',
+                        help='Exit with an error if an index is out of date instead of writing it')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Do not read or write the build cache')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Main entry point.
+    """
+    args = parse_args(argv)
+    cache = build_cache.configure(enabled=not args.no_cache)
+    exit_code = write_bm25_indexes(args.packs or discover_packs(), check=args.check)
+    cache.save(prune=False)
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
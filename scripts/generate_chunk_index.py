@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Generate the docs/.ai-index/chunk-index.json of every pack, and read chunks
+back by their byte offsets.
+
+Each doc is split at its headings (down to CHUNK_LEVEL) into chunks that run
+from one heading to the next. A chunk has a stable ID, '<doc path>#<anchor>'
+with the GitHub anchor of its heading (the text before the first heading has
+no anchor), the byte range it covers in the file, its token estimate, its
+parent chunk and the keywords that occur most in it. Chunks are contiguous,
+so a section with its subsections is the byte range from its chunk to its
+last descendant. Headings inside code blocks are ignored.
+
+Agents that only need one section load it with read_chunks(), which seeks to
+the stored offsets instead of reading the whole doc. Each doc's chunks go
+through the build cache, so only changed docs are re-chunked.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import build_cache
+import pack_scanner
+import source_stamp
+import token_estimator
+from generate_semantic_index import INDEX_DIR, SOURCE_HASH_LENGTH, index_is_current, load_index
+from markdown_utils import heading_anchor, iter_headings
+from pack_discovery import discover_packs
+from site_assets import atomic_write_bytes
+
+CHUNK_FILE = 'chunk-index.json'
+
+# Version written to new chunk indexes (existing indexes keep theirs)
+CHUNK_INDEX_VERSION = '1.0'
+
+# Deepest heading level that starts a chunk (#### and below stay in their parent)
+CHUNK_LEVEL = 3
+
+# Keywords stored per chunk
+KEYWORDS_PER_CHUNK = 8
+
+# Words in a heading count this many times when ranking keywords
+HEADING_WEIGHT = 3
+
+# Bump when the cached per-doc chunks change shape
+EXTRACT_VERSION = 1
+
+_WORD_RE = re.compile(r'[a-z][a-z0-9]*(?:[-_.][a-z0-9]+)*')
+
+STOPWORDS = frozenset('''
+    a about above after all also an and any are as at be because been before being below
+    between both but by can could did do does doing down during each few for from further
+    had has have having here how if in into is it its itself just more most must no nor not
+    now of off on once only or other our out over own same should so some such than that
+    the their them then there these they this those through to too under until up use used
+    using very via was we were what when where which while who why will with would you your
+'''.split())
+
+
+def keywords(text: str, heading: str = '', limit: int = KEYWORDS_PER_CHUNK) -> List[str]:
+    """
+    Return the most frequent non-stopword terms of a text, heading words
+    weighted HEADING_WEIGHT times, ties broken alphabetically.
+    """
+    counts = Counter(word for word in _WORD_RE.findall(text.lower())
+                     if len(word) > 2 and word not in STOPWORDS)
+    for word in _WORD_RE.findall(heading.lower()):
+        if len(word) > 2 and word not in STOPWORDS:
+            counts[word] += HEADING_WEIGHT
+    return [word for word, _ in sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:limit]]
+
+
+def chunk_document(relative_path: str, raw: bytes) -> Dict[str, Any]:
+    """
+    Split a markdown doc into heading-delimited chunks.
+
+    Args:
+        relative_path: Path of the doc relative to the pack's docs/ directory
+        raw: Contents of the doc
+
+    Returns:
+        Doc entry with path, source_hash, size, tokens and chunks (each with
+        id, heading, level, parent, start, end, tokens and keywords)
+    """
+    _, body = pack_scanner.parse_frontmatter(raw)
+    body_start = len(raw) - len(body)
+
+    boundaries = [(position, level, heading)
+                  for _, position, level, heading in iter_headings(raw, body_start, CHUNK_LEVEL)]
+    if not boundaries or raw[body_start:boundaries[0][0]].strip():
+        boundaries.insert(0, (body_start, 0, ''))
+
+    chunks: List[Dict[str, Any]] = []
+    seen: Counter = Counter()
+    parents: List[Tuple[int, str]] = []
+    for position, (start, level, heading) in enumerate(boundaries):
+        end = boundaries[position + 1][0] if position + 1 < len(boundaries) else len(raw)
+        if level:
+            # Repeated anchors get -1, -2, ... suffixes, like GitHub
+            anchor = heading_anchor(heading)
+            suffix = f'-{seen[anchor]}' if seen[anchor] else ''
+            seen[anchor] += 1
+            chunk_id = f'{relative_path}#{anchor}{suffix}'
+        else:
+            chunk_id = relative_path
+
+        while parents and parents[-1][0] >= level:
+            parents.pop()
+        text = raw[start:end].decode('utf-8', errors='replace')
+        chunks.append({
+            'id': chunk_id,
+            'heading': heading,
+            'level': level,
+            'parent': parents[-1][1] if parents else None,
+            'start': start,
+            'end': end,
+            'tokens': token_estimator.estimate_tokens(text),
+            'keywords': keywords(text, heading),
+        })
+        if level:
+            parents.append((level, chunk_id))
+
+    return {
+        'path': relative_path,
+        'source_hash': hashlib.sha256(raw).hexdigest()[:SOURCE_HASH_LENGTH],
+        'size': len(raw),
+        'tokens': sum(chunk['tokens'] for chunk in chunks),
+        'chunks': chunks,
+    }
+
+
+def serialize_chunk_index(index: Dict[str, Any]) -> bytes:
+    """
+    Serialize a chunk index with one line per chunk, which keeps the file
+    small and its diffs readable.
+    """
+    def dump(value: Any) -> str:
+        return json.dumps(value, ensure_ascii=False)
+
+    documents = []
+    for entry in index['documents']:
+        fields = [f'      {dump(key)}: {dump(value)}' for key, value in entry.items() if key != 'chunks']
+        chunks = ',\n'.join(f'        {dump(chunk)}' for chunk in entry['chunks'])
+        fields.append(f'      "chunks": [\n{chunks}\n      ]')
+        documents.append('    {\n' + ',\n'.join(fields) + '\n    }')
+
+    fields = [f'  {dump(key)}: {dump(value)}' for key, value in index.items() if key != 'documents']
+    fields.append('  "documents": [\n' + ',\n'.join(documents) + '\n  ]')
+    return ('{\n' + ',\n'.join(fields) + '\n}\n').encode('utf-8')
+
+
+def generate_chunk_index(pack_dir: str) -> Optional[Dict[str, Any]]:
+    """
+    Build the chunk index of a pack.
+
+    Args:
+        pack_dir: Pack directory
+
+    Returns:
+        Chunk index contents, or None if the pack has no docs
+    """
+    docs = pack_scanner.scan_pack(pack_dir).docs
+    if not docs:
+        return None
+
+    docs_dir = Path(pack_dir) / 'docs'
+    entries = []
+    for doc in docs:
+        relative_path = doc.path.relative_to(docs_dir).as_posix()
+        entries.append(build_cache.cached(f'chunks{EXTRACT_VERSION}', doc.path, build_cache.read_bytes,
+                                          lambda raw, path=relative_path: chunk_document(path, raw)))
+
+    existing = load_index(Path(pack_dir) / INDEX_DIR / CHUNK_FILE)
+    generated = existing.get('generated')
+    if generated is None or entries != existing.get('documents'):
+        generated = source_stamp.source_timestamp([], [doc.path for doc in docs])
+
+    return {
+        'version': existing.get('version', CHUNK_INDEX_VERSION),
+        'generated': generated,
+        'description': existing.get('description', "Heading-delimited chunks of each doc with byte "
+                                                   "offsets: load one section instead of the whole doc."),
+        'documents': entries,
+    }
+
+
+def write_chunk_indexes(pack_dirs: List[str], check: bool = False) -> int:
+    """
+    Regenerate the chunk index of every pack.
+
+    Args:
+        pack_dirs: Pack directories
+        check: Only report indexes that are out of date, without writing them
+
+    Returns:
+        0 on success, 1 if check found an outdated index
+    """
+    outdated = []
+
+    for pack_dir in pack_dirs:
+        output = generate_chunk_index(pack_dir)
+        if output is None:
+            continue
+
+        chunk_file = Path(pack_dir) / INDEX_DIR / CHUNK_FILE
+        chunks = sum(len(entry['chunks']) for entry in output['documents'])
+        summary = f"{len(output['documents'])} documents, {chunks} chunks"
+
+        content = serialize_chunk_index(output)
+        if index_is_current(chunk_file, content):
+            print(f"✓ {chunk_file}: {summary}, up to date")
+        elif check:
+            outdated.append(chunk_file)
+            print(f"❌ {chunk_file}: out of date")
+        else:
+            chunk_file.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(chunk_file, content)
+            print(f"✅ Wrote {chunk_file}: {summary}")
+
+    if outdated:
+        print()
+        print("Run 'make ai-index' to regenerate the chunk indexes.")
+        return 1
+    return 0
+
+
+class ChunkIndex:
+    """
+    The chunk index of one pack, keyed by chunk ID.
+    """
+
+    def __init__(self, pack_dir: str, index: Dict[str, Any]):
+        self.pack_dir = pack_dir
+        self.documents: Dict[str, Dict[str, Any]] = {}
+        self.chunks: Dict[str, Dict[str, Any]] = {}
+        self.children: Dict[str, List[str]] = {}
+        for entry in index.get('documents', []):
+            self.documents[entry['path']] = entry
+            for chunk in entry['chunks']:
+                self.chunks[chunk['id']] = dict(chunk, doc=entry['path'])
+                if chunk['parent'] is not None:
+                    self.children.setdefault(chunk['parent'], []).append(chunk['id'])
+
+    def section(self, chunk_id: str) -> List[str]:
+        """
+        Return a chunk and all of its subsections, in document order.
+        """
+        ids = [chunk_id]
+        for child in self.children.get(chunk_id, []):
+            ids.extend(self.section(child))
+        return ids
+
+    def find(self, doc: str, heading: str) -> Optional[str]:
+        """
+        Return the ID of the first chunk of a doc with this heading
+        (compared case-insensitively), or None.
+        """
+        wanted = heading.strip().lower()
+        for chunk in self.documents.get(doc, {}).get('chunks', []):
+            if chunk['heading'].lower() == wanted:
+                return chunk['id']
+        return None
+
+    def read(self, chunk_ids: Iterable[str]) -> List[Tuple[Dict[str, Any], str]]:
+        """
+        Read chunks from their docs by seeking to their byte offsets.
+
+        Args:
+            chunk_ids: Chunk IDs, in the order to return them
+
+        Returns:
+            (chunk, text) pairs
+
+        Raises:
+            KeyError: for an unknown chunk ID
+            ValueError: if a doc changed size since the index was generated
+        """
+        results = []
+        handles: Dict[str, Any] = {}
+        try:
+            for chunk_id in chunk_ids:
+                chunk = self.chunks[chunk_id]
+                doc = chunk['doc']
+                if doc not in handles:
+                    doc_file = Path(self.pack_dir) / 'docs' / doc
+                    handles[doc] = open(doc_file, 'rb')
+                    if doc_file.stat().st_size != self.documents[doc]['size']:
+                        raise ValueError(f"{doc_file} changed since {CHUNK_FILE} was generated "
+                                         f"(run 'make ai-index')")
+                handle = handles[doc]
+                handle.seek(chunk['start'])
+                text = handle.read(chunk['end'] - chunk['start']).decode('utf-8', errors='replace')
+                results.append((chunk, text))
+        finally:
+            for handle in handles.values():
+                handle.close()
+        return results
+
+
+def load_chunk_index(pack_dir: str) -> Optional[ChunkIndex]:
+    """
+    Load the chunk index of a pack (None if it has none).
+    """
+    chunk_file = Path(pack_dir) / INDEX_DIR / CHUNK_FILE
+    if not chunk_file.exists():
+        return None
+    return ChunkIndex(pack_dir, load_index(chunk_file))
+
+
+def read_chunks(pack_dir: str, chunk_ids: Iterable[str],
+                subsections: bool = False) -> List[Tuple[Dict[str, Any], str]]:
+    """
+    Read chunks of a pack's docs without loading the rest of the docs.
+
+    Args:
+        pack_dir: Pack directory
+        chunk_ids: Chunk IDs ('rhel/package-management.md#reboot-detection-patterns')
+        subsections: Also return the subsections of each chunk
+
+    Returns:
+        (chunk, text) pairs, in the order requested
+    """
+    index = load_chunk_index(pack_dir)
+    if index is None:
+        raise ValueError(f"{pack_dir} has no {INDEX_DIR / CHUNK_FILE} (run 'make ai-index')")
+    if subsections:
+        chunk_ids = [section_id for chunk_id in chunk_ids for section_id in index.section(chunk_id)]
+    return index.read(chunk_ids)
+
+
+def parse_args(argv=None):
+    """
+    Parse command line arguments.
+    """
+    parser = argparse.ArgumentParser(description='Generate docs/.ai-index/chunk-index.json for every pack.')
+    parser.add_argument('packs', nargs='*',
+                        help='Pack directories (default: every discovered pack)')
+    parser.add_argument('--check', action='store_true',
+                        help='Exit with an error if an index is out of date instead of writing it')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Do not read or write the build cache')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Main entry point.
+    """
+    args = parse_args(argv)
+    cache = build_cache.configure(enabled=not args.no_cache)
+    exit_code = write_chunk_indexes(args.packs or discover_packs(), check=args.check)
+    cache.save(prune=False)
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
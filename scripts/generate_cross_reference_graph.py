@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Generate the docs/.ai-index/cross-reference-graph.json of every pack.
+
+The graph is computed from three signals per pair of docs: markdown links
+between them, the related_docs of their frontmatter, and the overlap of their
+tags, semantic_keywords and use_cases. Each doc's links and terms are
+extracted through the build cache, so a rebuild only re-reads the docs that
+changed; the edges are then recomputed from the extracted signals, which is
+cheap. Links and related_docs pointing at docs that do not exist are not
+edges; they are listed under "dangling" and reported.
+
+Edge kinds:
+    leads_to       overview (README.md, INDEX.md) -> doc it links to
+    prerequisites  doc -> overview linking to it
+    complements    doc -> doc it links to, lists in related_docs, or shares
+                   enough terms with
+"""
+
+import argparse
+import posixpath
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import build_cache
+import pack_scanner
+import source_stamp
+from generate_semantic_index import INDEX_DIR, index_is_current, load_index, serialize_index
+from pack_discovery import discover_packs
+from site_assets import atomic_write_bytes
+
+GRAPH_FILE = 'cross-reference-graph.json'
+
+# Version written to new graphs (existing graphs keep theirs)
+GRAPH_VERSION = '1.0'
+
+# Docs that introduce a directory rather than cover a topic
+OVERVIEW_FILES = {'README.md', 'INDEX.md'}
+
+# Docs left out of the graph (links to them are ignored)
+IGNORED_FILES = {'SOURCES.md'}
+
+# Frontmatter fields whose values are compared between docs
+TERM_FIELDS = ('tags', 'semantic_keywords', 'use_cases')
+
+# Confidence contributed by each signal (capped at MAX_CONFIDENCE)
+LINK_WEIGHT = 0.5
+RELATED_WEIGHT = 0.25
+BACKLINK_WEIGHT = 0.1
+SIMILARITY_WEIGHT = 0.3
+PREREQUISITE_CONFIDENCE = 0.5
+MAX_CONFIDENCE = 0.99
+
+# Unlinked docs become complements when their term overlap reaches this
+MIN_SIMILARITY = 0.25
+
+# Bump when the extracted per-doc signals change shape
+EXTRACT_VERSION = 1
+
+_LINK_RE = re.compile(r'(?<!!)\[[^\]\n]*\]\(\s*<?([^)\s>]+)>?(?:\s+"[^"]*")?\s*\)')
+_CODE_BLOCK_RE = re.compile(r'^```.*?^```[^\n]*$', re.MULTILINE | re.DOTALL)
+_INLINE_CODE_RE = re.compile(r'`[^`\n]*`')
+
+RELATIONSHIP_TYPES = {
+    'complements': 'Documents that enhance each other when read together: linked, listed in '
+                   'related_docs, or sharing tags and keywords. Higher confidence means stronger signals.',
+    'prerequisites': 'Overview documents that link to the current document; optional background.',
+    'leads_to': 'Natural navigation path from an overview to the detailed documents it links.',
+}
+
+
+def _terms(metadata: Dict[str, Any]) -> List[str]:
+    """
+    Return the normalized tags, keywords and use cases of a doc.
+    """
+    terms = set()
+    for field in TERM_FIELDS:
+        values = metadata.get(field)
+        if isinstance(values, list):
+            terms.update(' '.join(re.split(r'[\s_-]+', str(value).lower())).strip() for value in values)
+    terms.discard('')
+    return sorted(terms)
+
+
+def extract_references(raw: bytes) -> Dict[str, Any]:
+    """
+    Extract the cross-reference signals of a markdown doc.
+
+    Args:
+        raw: Contents of the doc
+
+    Returns:
+        Dictionary with 'links' (markdown link targets, in order, outside code),
+        'related' (frontmatter related_docs) and 'terms' (normalized tags,
+        keywords and use cases)
+    """
+    (_, frontmatter, _), body_bytes = pack_scanner.parse_frontmatter(raw)
+    metadata = frontmatter if isinstance(frontmatter, dict) else {}
+    body = body_bytes.decode('utf-8', errors='replace')
+    body = _INLINE_CODE_RE.sub('', _CODE_BLOCK_RE.sub('', body))
+
+    related = metadata.get('related_docs')
+    return {
+        'links': [match.group(1) for match in _LINK_RE.finditer(body)],
+        'related': [str(doc) for doc in related] if isinstance(related, list) else [],
+        'terms': _terms(metadata),
+    }
+
+
+def resolve_link(source: str, target: str) -> Optional[str]:
+    """
+    Resolve a link of a doc to a docs-relative markdown path.
+
+    Args:
+        source: docs-relative path of the linking doc
+        target: Link target as written
+
+    Returns:
+        docs-relative path, or None for external links, anchors, non-markdown
+        files and paths outside docs/
+    """
+    if re.match(r'[a-z][a-z0-9+.-]*:', target, re.IGNORECASE) or target.startswith(('#', '/')):
+        return None
+    path = target.split('#', 1)[0].split('?', 1)[0]
+    if not path.endswith('.md'):
+        return None
+    resolved = posixpath.normpath(posixpath.join(posixpath.dirname(source), path))
+    return None if resolved.startswith('../') else resolved
+
+
+def similarity(a: List[str], b: List[str]) -> float:
+    """
+    Return the Jaccard similarity of two term lists.
+    """
+    if not a or not b:
+        return 0.0
+    a_set, b_set = set(a), set(b)
+    return len(a_set & b_set) / len(a_set | b_set)
+
+
+def _is_overview(path: str) -> bool:
+    return posixpath.basename(path) in OVERVIEW_FILES
+
+
+def compute_graph(refs: Dict[str, Dict[str, Any]]) -> Tuple[Dict[str, Dict[str, List[Dict[str, Any]]]],
+                                                          List[Dict[str, str]]]:
+    """
+    Compute the edges between docs from their extracted signals.
+
+    Args:
+        refs: extract_references() result per docs-relative path
+
+    Returns:
+        (graph, dangling): graph maps each doc to its edges by kind, each edge
+        being {'doc', 'confidence', 'reason'} sorted by confidence; dangling
+        lists {'from', 'to', 'via'} references to missing docs
+    """
+    links: Dict[str, Set[str]] = {}
+    related: Dict[str, Set[str]] = {}
+    dangling: List[Dict[str, str]] = []
+
+    def add_dangling(source: str, target: str, via: str) -> None:
+        entry = {'from': source, 'to': target, 'via': via}
+        if entry not in dangling:
+            dangling.append(entry)
+
+    for source, signals in refs.items():
+        links[source] = set()
+        for target in signals['links']:
+            resolved = resolve_link(source, target)
+            if resolved is None or resolved == source or posixpath.basename(resolved) in IGNORED_FILES:
+                continue
+            if resolved in refs:
+                links[source].add(resolved)
+            else:
+                add_dangling(source, resolved, 'link')
+
+        related[source] = set()
+        for target in signals['related']:
+            resolved = posixpath.normpath(target)
+            if resolved in refs:
+                related[source].add(resolved)
+            else:
+                add_dangling(source, resolved, 'related_docs')
+
+    graph: Dict[str, Dict[str, List[Dict[str, Any]]]] = {}
+    for source in refs:
+        edges: Dict[str, List[Dict[str, Any]]] = {}
+
+        for target in refs:
+            if target == source:
+                continue
+            linked = target in links[source]
+            listed = target in related[source]
+            overlap = similarity(refs[source]['terms'], refs[target]['terms'])
+
+            if _is_overview(source):
+                kind = 'leads_to' if linked else None
+            elif _is_overview(target):
+                kind = 'prerequisites' if source in links[target] else None
+            elif linked or listed or overlap >= MIN_SIMILARITY:
+                kind = 'complements'
+            else:
+                kind = None
+            if kind is None:
+                continue
+
+            reasons = []
+            if kind == 'prerequisites':
+                confidence = PREREQUISITE_CONFIDENCE
+                reasons.append('overview linking to this document')
+            else:
+                confidence = SIMILARITY_WEIGHT * overlap
+                if linked:
+                    confidence += LINK_WEIGHT
+                    reasons.append('linked from this document')
+                if listed:
+                    confidence += RELATED_WEIGHT
+                    reasons.append('listed in related_docs')
+                if source in links[target]:
+                    confidence += BACKLINK_WEIGHT
+                    reasons.append('links back')
+                shared = sorted(set(refs[source]['terms']) & set(refs[target]['terms']))
+                if shared:
+                    reasons.append(f"shares {len(shared)} term{'s' if len(shared) != 1 else ''}: "
+                                   f"{', '.join(shared[:5])}{', …' if len(shared) > 5 else ''}")
+
+            edges.setdefault(kind, []).append({
+                'doc': target,
+                'confidence': round(min(confidence, MAX_CONFIDENCE), 2),
+                'reason': '; '.join(reasons),
+            })
+
+        for kind_edges in edges.values():
+            kind_edges.sort(key=lambda edge: (-edge['confidence'], edge['doc']))
+        graph[source] = edges
+
+    return graph, dangling
+
+
+def _find_docs(docs_dir: Path) -> List[Path]:
+    """
+    Find every markdown doc of a pack, overviews included.
+    """
+    return sorted(path for path in docs_dir.rglob('*.md')
+                  if '.ai-index' not in path.parts and path.name not in IGNORED_FILES)
+
+
+def generate_cross_reference_graph(pack_dir: str) -> Optional[Dict[str, Any]]:
+    """
+    Build the cross-reference graph of a pack.
+
+    Args:
+        pack_dir: Pack directory
+
+    Returns:
+        Graph file contents, or None if the pack has no docs
+    """
+    docs_dir = Path(pack_dir) / 'docs'
+    doc_files = _find_docs(docs_dir)
+    if not doc_files:
+        return None
+
+    refs = {
+        doc_file.relative_to(docs_dir).as_posix():
+            build_cache.cached(f'references{EXTRACT_VERSION}', doc_file, build_cache.read_bytes, extract_references)
+        for doc_file in doc_files
+    }
+    graph, dangling = compute_graph(refs)
+
+    existing = load_index(Path(pack_dir) / INDEX_DIR / GRAPH_FILE)
+    generated = existing.get('generated')
+    if generated is None or graph != existing.get('graph') or dangling != existing.get('dangling'):
+        generated = source_stamp.source_timestamp([], doc_files)
+
+    output = {
+        'version': existing.get('version', GRAPH_VERSION),
+        'generated': generated,
+        'description': existing.get('description', "Document relationship graph for follow-up doc "
+                                                   "discovery: if you read X, you probably also need Y."),
+        'graph': graph,
+        'dangling': dangling,
+        'relationship_types': RELATIONSHIP_TYPES,
+    }
+    for key, value in existing.items():
+        output.setdefault(key, value)
+    return output
+
+
+def write_cross_reference_graphs(pack_dirs: List[str], check: bool = False) -> int:
+    """
+    Regenerate the cross-reference graph of every pack.
+
+    Args:
+        pack_dirs: Pack directories
+        check: Only report graphs that are out of date, without writing them
+
+    Returns:
+        0 on success, 1 if check found an outdated graph
+    """
+    outdated = []
+
+    for pack_dir in pack_dirs:
+        output = generate_cross_reference_graph(pack_dir)
+        if output is None:
+            continue
+
+        graph_file = Path(pack_dir) / INDEX_DIR / GRAPH_FILE
+        edges = sum(len(kind_edges) for node in output['graph'].values() for kind_edges in node.values())
+        summary = f"{len(output['graph'])} documents, {edges} edges"
+
+        for entry in output['dangling']:
+            print(f"Warning: {Path(pack_dir) / 'docs' / entry['from']}: {entry['via']} points to "
+                  f"missing {entry['to']}")
+
+        content = serialize_index(output)
+        if index_is_current(graph_file, content):
+            print(f"✓ {graph_file}: {summary}, up to date")
+        elif check:
+            outdated.append(graph_file)
+            print(f"❌ {graph_file}: out of date")
+        else:
+            graph_file.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(graph_file, content)
+            print(f"✅ Wrote {graph_file}: {summary}, {len(output['dangling'])} dangling")
+
+    if outdated:
+        print()
+        print("Run 'make ai-index' to regenerate the cross-reference graphs.")
+        return 1
+    return 0
+
+
+def parse_args(argv=None):
+    """
+    Parse command line arguments.
+    """
+    parser = argparse.ArgumentParser(description='Generate docs/.ai-index/cross-reference-graph.json for every pack.')
+    parser.add_argument('packs', nargs='*',
+                        help='Pack directories (default: every discovered pack)')
+    parser.add_argument('--check', action='store_true',
+                        help='Exit with an error if a graph is out of date instead of writing it')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Do not read or write the build cache')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Main entry point.
+    """
+    args = parse_args(argv)
+    cache = build_cache.configure(enabled=not args.no_cache)
+    exit_code = write_cross_reference_graphs(args.packs or discover_packs(), check=args.check)
+    cache.save(prune=False)
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,15 +1,21 @@
 #!/usr/bin/env python3
 """
 Parse .mcp.json files and extract MCP server configurations.
+
+Parsing yields one record per (pack, server). For data.json the records are
+deduplicated (dedupe_mcp_servers()): a server shipped by several packs is
+stored once, and each pack references it by ID with an overlay of the fields
+that differ for that pack (typically env or security).
 """
 
+import hashlib
 import json
 import re
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 
-# List of agentic packs to parse
-PACK_DIRS = ['rh-sre', 'rh-developer', 'ocp-admin', 'rh-support-engineer', 'rh-virt']
+import pack_scanner
+from pack_discovery import discover_packs
 
 
 def extract_env_vars(env_dict: Dict[str, str]) -> List[str]:
@@ -71,15 +77,17 @@ def parse_mcp_file(pack_dir: str) -> List[Dict[str, Any]]:
     Returns:
         List of MCP server configurations
     """
-    mcp_file = Path(pack_dir) / '.mcp.json'
+    mcp_file = pack_scanner.scan_pack(pack_dir).mcp
 
-    if not mcp_file.exists():
+    if mcp_file is None or not mcp_file.exists:
         return []
 
-    try:
-        with open(mcp_file, 'r', encoding='utf-8') as f:
-            config = json.load(f)
+    if mcp_file.error:
+        print(f"Warning: Failed to parse {mcp_file.path}: {mcp_file.error}")
+        return []
 
+    try:
+        config = mcp_file.data
         servers = []
 
         # Extract each MCP server
@@ -125,7 +133,7 @@ def parse_mcp_file(pack_dir: str) -> List[Dict[str, Any]]:
         return servers
 
     except Exception as e:
-        print(f"Warning: Failed to parse {mcp_file}: {e}")
+        print(f"Warning: Failed to parse {mcp_file.path}: {e}")
         return []
 
 
@@ -150,49 +158,158 @@ def load_custom_mcp_data() -> Dict[str, Any]:
         return {}
 
 
-def generate_mcp_data() -> List[Dict[str, Any]]:
+def generate_pack_mcp_data(pack_dir: str, custom_data: Dict[str, Any]) -> List[Dict[str, Any]]:
     """
-    Generate MCP server data for all agentic packs.
-    Merges data from .mcp.json files with custom data from docs/mcp.json.
+    Generate MCP server data for a single agentic pack.
+
+    Args:
+        pack_dir: Name of the pack directory
+        custom_data: Contents of docs/mcp.json (see load_custom_mcp_data())
 
     Returns:
         List of MCP server dictionaries
     """
-    mcp_servers = []
+    if not pack_scanner.scan_pack(pack_dir).exists:
+        return []
 
-    # Load custom data (repository URLs and tool descriptions)
-    custom_data = load_custom_mcp_data()
+    servers = parse_mcp_file(pack_dir)
 
-    for pack_dir in PACK_DIRS:
-        pack_path = Path(pack_dir)
+    # Merge custom data for each server
+    for server in servers:
+        server_name = server['name']
+        if server_name in custom_data:
+            # Add custom metadata from docs/mcp.json
+            server['repository'] = custom_data[server_name].get('repository', '')
+            server['tools'] = custom_data[server_name].get('tools', [])
+            server['title'] = custom_data[server_name].get('title', server_name)
+            server['tier'] = custom_data[server_name].get('tier', 'Official')
+            server['owner'] = custom_data[server_name].get('owner', 'Red Hat')
+        else:
+            # No custom data available - use defaults
+            server['repository'] = ''
+            server['tools'] = []
+            server['title'] = server_name
+            server['tier'] = 'Official'
+            server['owner'] = 'Red Hat'
 
-        if not pack_path.exists():
-            continue
+    if servers:
+        print(f"✓ Parsed {pack_dir}: {len(servers)} MCP server(s)")
 
-        servers = parse_mcp_file(pack_dir)
+    return servers
 
-        # Merge custom data for each server
-        for server in servers:
-            server_name = server['name']
-            if server_name in custom_data:
-                # Add custom metadata from docs/mcp.json
-                server['repository'] = custom_data[server_name].get('repository', '')
-                server['tools'] = custom_data[server_name].get('tools', [])
-                server['title'] = custom_data[server_name].get('title', server_name)
-                server['tier'] = custom_data[server_name].get('tier', 'Official')
-                server['owner'] = custom_data[server_name].get('owner', 'Red Hat')
-            else:
-                # No custom data available - use defaults
-                server['repository'] = ''
-                server['tools'] = []
-                server['title'] = server_name
-                server['tier'] = 'Official'
-                server['owner'] = 'Red Hat'
 
-        mcp_servers.extend(servers)
+# Fields of a server record that tell servers with the same name apart
+IDENTITY_FIELDS = {
+    'http': ('name', 'type', 'url'),
+    'command': ('name', 'type', 'command', 'args'),
+}
+
+# Hex digits of the identity hash appended to IDs of servers sharing a name
+SERVER_ID_HASH_LENGTH = 8
+
+
+def server_identity(server: Dict[str, Any]) -> str:
+    """
+    Return the canonical identity of a server: its name plus its URL (HTTP
+    servers) or its command and args.
+    """
+    fields = IDENTITY_FIELDS['http' if server['type'] == 'http' else 'command']
+    return json.dumps([server.get(field) for field in fields], separators=(',', ':'))
+
+
+def dedupe_mcp_servers(servers: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]]:
+    """
+    Store servers shipped by several packs once.
+
+    The first record of each identity becomes the shared server (without its
+    pack). The ID is the server name, or name--<hash> when different servers
+    share a name.
+
+    Args:
+        servers: One record per (pack, server), as from generate_mcp_data()
+
+    Returns:
+        Tuple of (unique server records with an 'id', in first-seen order,
+        references per pack). A reference is {'id': ...} plus the fields of
+        that pack's record that differ from the shared one.
+    """
+    identities: Dict[str, List[str]] = {}
+    for server in servers:
+        names = identities.setdefault(server['name'], [])
+        identity = server_identity(server)
+        if identity not in names:
+            names.append(identity)
+
+    unique: Dict[str, Dict[str, Any]] = {}
+    refs: Dict[str, List[Dict[str, Any]]] = {}
+
+    for server in servers:
+        identity = server_identity(server)
+        server_id = server['name']
+        if len(identities[server['name']]) > 1:
+            digest = hashlib.sha256(identity.encode('utf-8')).hexdigest()[:SERVER_ID_HASH_LENGTH]
+            server_id = f"{server['name']}--{digest}"
+
+        shared = unique.get(server_id)
+        if shared is None:
+            shared = {'id': server_id, **{k: v for k, v in server.items() if k != 'pack'}}
+            unique[server_id] = shared
+
+        ref = {'id': server_id}
+        ref.update((k, v) for k, v in server.items() if k != 'pack' and shared.get(k) != v)
+        refs.setdefault(server['pack'], []).append(ref)
+
+    return list(unique.values()), refs
+
+
+def pack_server_refs(output: Dict[str, Any]) -> List[Tuple[str, Dict[str, Any], Dict[str, Any]]]:
+    """
+    List the server references of deduplicated data.json contents.
+
+    Returns:
+        (pack name, reference, shared server record) tuples, in pack order
+    """
+    servers = {server['id']: server for server in output['mcp_servers']}
+    return [(pack['name'], ref, servers[ref['id']])
+            for pack in output['packs'] for ref in pack.get('mcp_servers', [])]
+
+
+def expand_mcp_servers(output: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Rebuild one record per (pack, server) from deduplicated data.json contents.
+
+    Args:
+        output: data.json contents (packs reference servers in 'mcp_servers')
+
+    Returns:
+        Records shaped like those of generate_mcp_data() plus the server 'id',
+        in pack order
+    """
+    return [{**server, **ref, 'pack': pack_name}
+            for pack_name, ref, server in pack_server_refs(output)]
+
+
+def generate_mcp_data(pack_dirs: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    Generate MCP server data for all agentic packs.
+    Merges data from .mcp.json files with custom data from docs/mcp.json.
+
+    Args:
+        pack_dirs: Pack directories to parse (defaults to the discovered packs)
+
+    Returns:
+        List of MCP server dictionaries
+    """
+    if pack_dirs is None:
+        pack_dirs = discover_packs()
+
+    mcp_servers = []
+
+    # Load custom data (repository URLs and tool descriptions)
+    custom_data = load_custom_mcp_data()
 
-        if servers:
-            print(f"✓ Parsed {pack_dir}: {len(servers)} MCP server(s)")
+    for pack_dir in pack_dirs:
+        mcp_servers.extend(generate_pack_mcp_data(pack_dir, custom_data))
 
     return mcp_servers
 
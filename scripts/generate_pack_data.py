@@ -3,42 +3,27 @@
 Parse agentic packs and extract plugin metadata, skills, and agents.
 """
 
-import json
-import os
-import re
-from pathlib import Path
-from typing import Dict, List, Any
-import yaml
+from typing import Dict, List, Any, Optional
 
-# List of agentic packs to parse
-PACK_DIRS = ['rh-sre', 'rh-developer', 'ocp-admin', 'rh-support-engineer', 'rh-virt']
+import build_report
+import pack_scanner
+from pack_discovery import discover_packs
+from pack_scanner import Document
 
 
-def parse_yaml_frontmatter(file_path: Path) -> Dict[str, Any]:
+def frontmatter_of(doc: Document) -> Dict[str, Any]:
     """
-    Extract YAML frontmatter from a markdown file.
+    Return the frontmatter of a scanned document, warning if it failed to parse.
 
     Args:
-        file_path: Path to the markdown file
+        doc: Document from pack_scanner
 
     Returns:
         Dictionary containing the frontmatter data
     """
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-
-        # Match YAML frontmatter (---\n...\n---)
-        match = re.match(r'^---\s*\n(.*?)\n---\s*\n', content, re.DOTALL)
-        if not match:
-            return {}
-
-        frontmatter_text = match.group(1)
-        return yaml.safe_load(frontmatter_text) or {}
-
-    except Exception as e:
-        print(f"Warning: Failed to parse frontmatter from {file_path}: {e}")
-        return {}
+    if doc.error:
+        print(f"Warning: Failed to parse frontmatter from {doc.path}: {doc.error}")
+    return doc.metadata
 
 
 def parse_plugin_json(pack_dir: str) -> Dict[str, Any]:
@@ -51,7 +36,7 @@ def parse_plugin_json(pack_dir: str) -> Dict[str, Any]:
     Returns:
         Dictionary with plugin metadata, or defaults if file doesn't exist
     """
-    plugin_path = Path(pack_dir) / '.claude-plugin' / 'plugin.json'
+    plugin_file = pack_scanner.scan_pack(pack_dir).plugin
 
     # Default values if plugin.json doesn't exist
     defaults = {
@@ -63,20 +48,16 @@ def parse_plugin_json(pack_dir: str) -> Dict[str, Any]:
         'keywords': []
     }
 
-    if not plugin_path.exists():
+    if plugin_file is None or not plugin_file.exists:
         return defaults
 
-    try:
-        with open(plugin_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        # Merge with defaults (in case some fields are missing)
-        return {**defaults, **data}
-
-    except Exception as e:
-        print(f"Warning: Failed to parse {plugin_path}: {e}")
+    if plugin_file.error:
+        print(f"Warning: Failed to parse {plugin_file.path}: {plugin_file.error}")
         return defaults
 
+    # Merge with defaults (in case some fields are missing)
+    return {**defaults, **plugin_file.data}
+
 
 def parse_skills(pack_dir: str) -> List[Dict[str, Any]]:
     """
@@ -86,17 +67,13 @@ def parse_skills(pack_dir: str) -> List[Dict[str, Any]]:
         pack_dir: Name of the pack directory
 
     Returns:
-        List of skill dictionaries with name, description, file_path
+        List of skill dictionaries with name, description, file_path, tokens
     """
     skills = []
-    skills_dir = Path(pack_dir) / 'skills'
 
-    if not skills_dir.exists():
-        return skills
-
-    # Find all SKILL.md files
-    for skill_file in skills_dir.glob('*/SKILL.md'):
-        frontmatter = parse_yaml_frontmatter(skill_file)
+    for skill_doc in pack_scanner.scan_pack(pack_dir).skills:
+        skill_file = skill_doc.path
+        frontmatter = frontmatter_of(skill_doc)
 
         # Extract name and description
         name = frontmatter.get('name', skill_file.parent.name)
@@ -109,7 +86,8 @@ def parse_skills(pack_dir: str) -> List[Dict[str, Any]]:
         skills.append({
             'name': name,
             'description': description,
-            'file_path': str(skill_file.relative_to(pack_dir))
+            'file_path': str(skill_file.relative_to(pack_dir)),
+            'tokens': skill_doc.tokens
         })
 
     return sorted(skills, key=lambda s: s['name'])
@@ -123,17 +101,13 @@ def parse_agents(pack_dir: str) -> List[Dict[str, Any]]:
         pack_dir: Name of the pack directory
 
     Returns:
-        List of agent dictionaries with name, description, model, tools, file_path
+        List of agent dictionaries with name, description, model, tools, file_path, tokens
     """
     agents = []
-    agents_dir = Path(pack_dir) / 'agents'
-
-    if not agents_dir.exists():
-        return agents
 
-    # Find all .md files in agents directory
-    for agent_file in agents_dir.glob('*.md'):
-        frontmatter = parse_yaml_frontmatter(agent_file)
+    for agent_doc in pack_scanner.scan_pack(pack_dir).agents:
+        agent_file = agent_doc.path
+        frontmatter = frontmatter_of(agent_doc)
 
         # Extract metadata
         name = frontmatter.get('name', agent_file.stem)
@@ -150,7 +124,8 @@ def parse_agents(pack_dir: str) -> List[Dict[str, Any]]:
             'description': description,
             'model': model,
             'tools': tools,
-            'file_path': str(agent_file.relative_to(pack_dir))
+            'file_path': str(agent_file.relative_to(pack_dir)),
+            'tokens': agent_doc.tokens
         })
 
     return sorted(agents, key=lambda a: a['name'])
@@ -187,24 +162,14 @@ def parse_docs(pack_dir: str) -> List[Dict[str, Any]]:
         pack_dir: Name of the pack directory
 
     Returns:
-        List of doc dictionaries with title, sources, category, file_path
+        List of doc dictionaries with title, sources, category, file_path, tokens
     """
     docs = []
-    docs_dir = Path(pack_dir) / 'docs'
-
-    if not docs_dir.exists():
-        return docs
 
-    # Files to exclude from documentation parsing
-    EXCLUDE_FILES = {'README.md', 'INDEX.md', 'SOURCES.md'}
-
-    # Find all .md files recursively (excluding .ai-index directory)
-    for doc_file in docs_dir.rglob('*.md'):
-        # Skip excluded files and files in .ai-index directory
-        if doc_file.name in EXCLUDE_FILES or '.ai-index' in doc_file.parts:
-            continue
-
-        frontmatter = parse_yaml_frontmatter(doc_file)
+    # README/INDEX/SOURCES and .ai-index files are already excluded by the scanner
+    for doc in pack_scanner.scan_pack(pack_dir).docs:
+        doc_file = doc.path
+        frontmatter = frontmatter_of(doc)
 
         # Extract metadata
         title = frontmatter.get('title', doc_file.stem.replace('-', ' ').title())
@@ -220,44 +185,101 @@ def parse_docs(pack_dir: str) -> List[Dict[str, Any]]:
             'title': title,
             'category': category,
             'sources': sources,
-            'file_path': str(doc_file.relative_to(pack_dir))
+            'file_path': str(doc_file.relative_to(pack_dir)),
+            'tokens': doc.tokens
         })
 
     # Sort by category first, then by title
     return sorted(docs, key=lambda d: (d['category'], d['title']))
 
 
-def generate_pack_data() -> List[Dict[str, Any]]:
+def pack_tokens(skills: List[Dict[str, Any]], agents: List[Dict[str, Any]],
+                docs: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Sum the estimated tokens of a pack's skills, agents and docs.
+
+    Args:
+        skills: Parsed skills
+        agents: Parsed agents
+        docs: Parsed docs
+
+    Returns:
+        Dictionary with the skills, agents, docs and total token counts
+    """
+    totals = {
+        'skills': sum(skill['tokens'] for skill in skills),
+        'agents': sum(agent['tokens'] for agent in agents),
+        'docs': sum(doc['tokens'] for doc in docs),
+    }
+    totals['total'] = sum(totals.values())
+    return totals
+
+
+def parse_pack(pack_dir: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse a single agentic pack.
+
+    Args:
+        pack_dir: Name of the pack directory
+
+    Returns:
+        Pack dictionary, or None if the directory does not exist
+    """
+    scan = pack_scanner.scan_pack(pack_dir)
+
+    if not scan.exists:
+        return None
+
+    skills = parse_skills(pack_dir)
+    agents = parse_agents(pack_dir)
+    docs = parse_docs(pack_dir)
+
+    return {
+        'name': pack_dir,
+        'path': f'./{pack_dir}',
+        'plugin': parse_plugin_json(pack_dir),
+        'skills': skills,
+        'agents': agents,
+        'docs': docs,
+        'has_readme': scan.has_readme,
+        'tokens': pack_tokens(skills, agents, docs)
+    }
+
+
+def generate_pack_data(pack_dirs: Optional[List[str]] = None,
+                       jobs: Optional[int] = None) -> List[Dict[str, Any]]:
     """
     Generate pack data for all agentic packs.
 
+    Args:
+        pack_dirs: Pack directories to parse (defaults to the discovered packs)
+        jobs: Number of worker processes for scanning (None for the CPU count, 1 for serial)
+
     Returns:
-        List of pack dictionaries
+        List of pack dictionaries, in pack_dirs order
     """
+    if pack_dirs is None:
+        pack_dirs = discover_packs()
+
+    # Read and parse every pack up front (in parallel); packs scanned
+    # earlier in this process, e.g. by validation, are reused as-is
+    with build_report.stage('scan'):
+        pack_scanner.scan_packs(pack_dirs, jobs)
+
     packs = []
 
-    for pack_dir in PACK_DIRS:
-        pack_path = Path(pack_dir)
+    for pack_dir in pack_dirs:
+        with build_report.stage('parse'):
+            pack = parse_pack(pack_dir)
 
-        if not pack_path.exists():
+        if pack is None:
             print(f"Warning: Pack directory {pack_dir} does not exist, skipping")
             continue
 
-        docs = parse_docs(pack_dir)
-
-        pack = {
-            'name': pack_dir,
-            'path': f'./{pack_dir}',
-            'plugin': parse_plugin_json(pack_dir),
-            'skills': parse_skills(pack_dir),
-            'agents': parse_agents(pack_dir),
-            'docs': docs,
-            'has_readme': (pack_path / 'README.md').exists()
-        }
-
         packs.append(pack)
 
-        print(f"✓ Parsed {pack_dir}: {len(pack['skills'])} skills, {len(pack['agents'])} agents, {len(docs)} docs")
+        print(f"✓ Parsed {pack_dir}: {len(pack['skills'])} skills, {len(pack['agents'])} agents, "
+              f"{len(pack['docs'])} docs, ~{pack['tokens']['total']:,} tokens")
 
     return packs
 
@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Generate the docs/.ai-index/semantic-index.json of every pack from the
+frontmatter of its docs.
+
+Each document entry carries the title, category, tags, semantic_keywords,
+use_cases, applies_to and related_docs of the doc's frontmatter, a
+token_estimate of the whole file (token_estimator.py) and a source_hash of
+its contents, all taken from the pack scan (pack_scanner.py), so no doc is
+read again here. On the next run only the entries of docs whose hash changed
+are rebuilt; the other entries are copied from the existing index. A rebuilt entry takes every frontmatter field
+from the doc again and keeps only the hand-written fields the frontmatter
+cannot provide (HAND_WRITTEN_FIELDS, and a content_summary that was not
+derived from the doc's first paragraph); the index keeps its hand-written
+task_mappings, inference_hints and usage_instructions.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import build_cache
+import pack_scanner
+import source_stamp
+from pack_discovery import discover_packs
+from site_assets import atomic_write_bytes
+
+# Index location, relative to the pack directory
+INDEX_DIR = Path('docs') / '.ai-index'
+INDEX_FILE = 'semantic-index.json'
+
+# Version written to new indexes (existing indexes keep theirs)
+INDEX_VERSION = '1.0'
+
+# Frontmatter fields copied into each document entry
+FRONTMATTER_FIELDS = ('title', 'category', 'tags', 'semantic_keywords', 'use_cases',
+                      'applies_to', 'related_docs')
+
+# Hand-written document fields carried over when an entry is rebuilt
+HAND_WRITTEN_FIELDS = ('rhel_versions', 'applies_to_systems')
+
+# Hand-written index fields kept from the existing index
+HAND_WRITTEN_INDEX_FIELDS = ('task_mappings', 'inference_hints', 'usage_instructions')
+
+# Set on entries whose content_summary was derived from the doc's first paragraph
+DERIVED_SUMMARY_FLAG = 'summary_derived'
+
+# Hex digits of the source hash stored per document
+SOURCE_HASH_LENGTH = 16
+
+
+def document_entry(relative_path: str, doc: pack_scanner.Document,
+                   previous: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the index entry of one doc from its scan.
+
+    Args:
+        relative_path: Path of the doc relative to the pack's docs/ directory
+        doc: Scanned doc (frontmatter, token count, hash, first heading and paragraph)
+        previous: Existing entry of the doc ({} if none); only its
+                  hand-written fields are kept
+
+    Returns:
+        Index entry
+    """
+    if doc.error:
+        print(f"Warning: Failed to parse frontmatter from {relative_path}: {doc.error}")
+    metadata = doc.metadata
+
+    entry: Dict[str, Any] = {'path': relative_path}
+    for field in FRONTMATTER_FIELDS:
+        if field in metadata:
+            entry[field] = metadata[field]
+    if 'title' not in entry:
+        entry['title'] = doc.heading or Path(relative_path).stem
+
+    summary = metadata.get('summary') or metadata.get('description')
+    if summary:
+        entry['content_summary'] = summary
+    elif previous.get('content_summary') and not previous.get(DERIVED_SUMMARY_FLAG):
+        entry['content_summary'] = previous['content_summary']
+    else:
+        entry['content_summary'] = doc.summary
+        entry[DERIVED_SUMMARY_FLAG] = True
+
+    entry['token_estimate'] = doc.tokens
+    entry['source_hash'] = doc.source_hash[:SOURCE_HASH_LENGTH]
+
+    for field in HAND_WRITTEN_FIELDS:
+        if field in previous:
+            entry[field] = previous[field]
+    return entry
+
+
+def load_index(index_file: Path) -> Dict[str, Any]:
+    """
+    Load an existing semantic index ({} if missing or unreadable).
+    """
+    if not index_file.exists():
+        return {}
+    try:
+        with open(index_file, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except Exception as e:
+        print(f"Warning: Ignoring unreadable {index_file}: {e}")
+        return {}
+    return index if isinstance(index, dict) else {}
+
+
+def serialize_index(index: Dict[str, Any]) -> bytes:
+    """
+    Serialize an .ai-index file (indented, so diffs stay reviewable).
+    """
+    return (json.dumps(index, indent=2, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+def index_is_current(index_file: Path, content: bytes) -> bool:
+    """
+    Return True if index_file already holds exactly content.
+    """
+    return index_file.exists() and build_cache.read_bytes(index_file) == content
+
+
+def generate_semantic_index(pack_dir: str) -> Optional[Tuple[Dict[str, Any], int]]:
+    """
+    Build the semantic index of a pack, reusing entries of unchanged docs.
+
+    Args:
+        pack_dir: Pack directory
+
+    Returns:
+        (index, number of entries rebuilt), or None if the pack has no docs
+    """
+    docs = pack_scanner.scan_pack(pack_dir).docs
+    if not docs:
+        return None
+
+    docs_dir = Path(pack_dir) / 'docs'
+    existing = load_index(Path(pack_dir) / INDEX_DIR / INDEX_FILE)
+    previous = {entry['path']: entry for entry in existing.get('documents', [])
+                if isinstance(entry, dict) and 'path' in entry}
+
+    entries: List[Dict[str, Any]] = []
+    rebuilt = 0
+    for doc in docs:
+        relative_path = doc.path.relative_to(docs_dir).as_posix()
+        entry = previous.get(relative_path, {})
+        if entry.get('source_hash') != doc.source_hash[:SOURCE_HASH_LENGTH]:
+            entry = document_entry(relative_path, doc, entry)
+            rebuilt += 1
+        elif entry.get('token_estimate') != doc.tokens:
+            # Unchanged doc, but counted by a different estimator version
+            entry = {**entry, 'token_estimate': doc.tokens}
+            rebuilt += 1
+        entries.append(entry)
+
+    generated = existing.get('generated')
+    if generated is None or entries != existing.get('documents'):
+        generated = source_stamp.source_timestamp([], [doc.path for doc in docs])
+
+    index = {
+        'version': existing.get('version', INDEX_VERSION),
+        'generated': generated,
+        'documents': entries,
+    }
+    for field in HAND_WRITTEN_INDEX_FIELDS:
+        if field in existing:
+            index[field] = existing[field]
+
+    return index, rebuilt
+
+
+def write_semantic_indexes(pack_dirs: List[str], check: bool = False) -> int:
+    """
+    Regenerate the semantic index of every pack.
+
+    Args:
+        pack_dirs: Pack directories
+        check: Only report indexes that are out of date, without writing them
+
+    Returns:
+        0 on success, 1 if check found an outdated index
+    """
+    outdated = []
+
+    for pack_dir in pack_dirs:
+        result = generate_semantic_index(pack_dir)
+        if result is None:
+            continue
+        index, rebuilt = result
+
+        index_file = Path(pack_dir) / INDEX_DIR / INDEX_FILE
+        content = serialize_index(index)
+        if index_is_current(index_file, content):
+            print(f"✓ {index_file}: {len(index['documents'])} documents, up to date")
+            continue
+
+        if check:
+            outdated.append(index_file)
+            print(f"❌ {index_file}: out of date ({rebuilt} of {len(index['documents'])} documents changed)")
+            continue
+
+        index_file.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(index_file, content)
+        print(f"✅ Wrote {index_file}: {len(index['documents'])} documents "
+              f"({rebuilt} rebuilt, {len(index['documents']) - rebuilt} unchanged)")
+
+    if outdated:
+        print()
+        print("Run 'make ai-index' to regenerate the semantic indexes.")
+        return 1
+    return 0
+
+
+def parse_args(argv=None):
+    """
+    Parse command line arguments.
+    """
+    parser = argparse.ArgumentParser(description='Generate docs/.ai-index/semantic-index.json for every pack.')
+    parser.add_argument('packs', nargs='*',
+                        help='Pack directories (default: every discovered pack)')
+    parser.add_argument('--check', action='store_true',
+                        help='Exit with an error if an index is out of date instead of writing it')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Main entry point.
+    """
+    args = parse_args(argv)
+    return write_semantic_indexes(args.packs or discover_packs(), check=args.check)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Index of every file and heading anchor of the repository, for checking the
+relative links between READMEs, docs, skills and the .ai-index files.
+
+build_link_index() records the name of every file and directory of the
+repository, the GitHub anchors of every markdown heading (and of <a name>/<a
+id> tags), the relative links of every markdown file (inline links, images
+and reference definitions, outside code blocks and inline code), and the
+.md paths referenced by the JSON files under docs/.ai-index. The anchors and
+links of skills, agents and docs come from the pack scans, which extract
+them while reading each file (see markdown_utils.py); only the other
+markdown files (READMEs, docs indexes, skill references) and the .ai-index
+files are read here, through the build cache. Each link is then resolved
+against the index with a few set lookups, whatever the size of the
+repository.
+
+.ai-index paths are relative to the pack's docs/ directory ('rhel/x.md',
+chunk IDs such as 'rhel/x.md#reboot'), or to the pack for skills
+('skills/cve-impact/SKILL.md').
+
+The 'links' and 'repo-links' validation rules (validation_rules.py) report
+the broken targets with their file and line; validate_structure.py builds the
+index once from its scans and hands it to each worker process when the
+worker starts.
+"""
+
+import json
+import os
+import posixpath
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import unquote
+
+import build_cache
+import markdown_utils
+import pack_scanner
+from markdown_utils import Link
+
+# Directories that are not part of the repository's content
+SKIP_DIRS = frozenset({'.git', '.cache', '.venv', 'node_modules', '__pycache__'})
+
+INDEX_DIR_NAME = '.ai-index'
+
+# Bump when extract_index_paths() returns different links
+INDEX_EXTRACT_VERSION = 2
+
+# .ai-index fields that hold free text rather than paths ('package-management.md' as a
+# keyword), or paths already reported elsewhere (the cross-reference graph's dangling links)
+INDEX_TEXT_FIELDS = frozenset({'keywords', 'semantic_keywords', 'tags', 'use_cases', 'dangling'})
+
+_INDEX_PATH_RE = re.compile(r'[^"\s\\]+\.md(?:#[^"\s\\]*)?')
+
+
+def extract_markdown(raw: bytes) -> Dict[str, List[Any]]:
+    """
+    Extract the anchors and relative links of a markdown file.
+
+    Args:
+        raw: Contents of the file
+
+    Returns:
+        Dictionary with 'anchors' and 'links' (see
+        markdown_utils.extract_anchors_and_links())
+    """
+    _, body = pack_scanner.parse_frontmatter(raw)
+    anchors, links = markdown_utils.extract_anchors_and_links(raw, len(raw) - len(body))
+    return {'anchors': anchors, 'links': links}
+
+
+def extract_index_paths(raw: bytes) -> Dict[str, List[Any]]:
+    """
+    Extract the .md paths referenced by an .ai-index JSON file.
+
+    Args:
+        raw: Contents of the file
+
+    Returns:
+        Dictionary with 'links': [line, path] of every JSON string (value or
+        key) that is a .md path, optionally with an anchor, outside the
+        INDEX_TEXT_FIELDS; no links if the file is not valid JSON
+    """
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        return {'links': []}
+
+    links = []
+    position = 0
+    line = 1
+
+    def visit(value: Any, text_field: bool) -> None:
+        nonlocal position, line
+        if isinstance(value, dict):
+            for key, item in value.items():
+                visit(key, text_field)
+                visit(item, text_field or key in INDEX_TEXT_FIELDS)
+        elif isinstance(value, list):
+            for item in value:
+                visit(item, text_field)
+        elif isinstance(value, str) and _INDEX_PATH_RE.fullmatch(value):
+            # The walk follows the file order, so each string is found after the previous one
+            quoted = b'"' + value.encode('utf-8') + b'"'
+            found = raw.find(quoted, position)
+            if found < 0:
+                return
+            line += raw.count(b'\n', position, found)
+            position = found + len(quoted)
+            if not text_field:
+                links.append([line, value])
+
+    visit(data, False)
+    return {'links': links}
+
+
+def _is_index_file(relative_path: str) -> bool:
+    """
+    Return True for the JSON files of an .ai-index directory.
+    """
+    directory, name = posixpath.split(relative_path)
+    return name.endswith('.json') and posixpath.basename(directory) == INDEX_DIR_NAME
+
+
+@dataclass
+class LinkIndex:
+    """
+    Every file, directory and heading anchor of the repository, and the links
+    to check. Paths are POSIX paths relative to the repository root.
+    """
+    files: FrozenSet[str]
+    directories: FrozenSet[str]
+    anchors: Dict[str, FrozenSet[str]]
+    links: Dict[str, List[Link]]
+
+    def _target_problem(self, resolved: str, anchor: str, target: str) -> Optional[str]:
+        """
+        Return why resolved (with anchor) is not a valid target, or None.
+        """
+        if resolved in self.directories:
+            return None
+        if resolved not in self.files:
+            return f"Broken link to {target}: {resolved} does not exist"
+        anchors = self.anchors.get(resolved)
+        if anchor and anchors is not None and anchor.lower() not in anchors:
+            return f"Broken link to {target}: {resolved} has no heading #{anchor}"
+        return None
+
+    def check_link(self, source: str, target: str) -> Optional[str]:
+        """
+        Resolve a markdown link of source against the index.
+
+        Args:
+            source: Path of the linking file
+            target: Link target as written ('../docs/x.md#setup', '#usage')
+
+        Returns:
+            Problem description, or None if the target exists
+        """
+        path, _, anchor = target.partition('#')
+        path = unquote(path.split('?', 1)[0])
+        if not path:
+            resolved = source
+        elif path.startswith('/'):
+            resolved = posixpath.normpath(path.lstrip('/'))
+        else:
+            resolved = posixpath.normpath(posixpath.join(posixpath.dirname(source), path))
+
+        if resolved == '..' or resolved.startswith('../'):
+            return f"Link to {target} points outside the repository"
+        if resolved == '.':
+            return None
+        return self._target_problem(resolved, unquote(anchor), target)
+
+    def check_index_path(self, source: str, target: str) -> Optional[str]:
+        """
+        Resolve a path referenced by an .ai-index file, relative to the docs
+        directory or, failing that, to the pack.
+
+        Args:
+            source: Path of the .ai-index JSON file
+            target: Referenced path ('rhel/x.md', 'rhel/x.md#reboot')
+
+        Returns:
+            Problem description, or None if the target exists
+        """
+        path, _, anchor = target.partition('#')
+        docs_dir = posixpath.dirname(posixpath.dirname(source))
+        pack_dir = posixpath.dirname(docs_dir)
+        for base in (docs_dir, pack_dir):
+            resolved = posixpath.normpath(posixpath.join(base, path))
+            if resolved in self.files:
+                return self._target_problem(resolved, anchor, target)
+        return f"Broken reference to {target}: not found under {docs_dir}/ or {pack_dir or '.'}/"
+
+    def check_sources(self, sources: Iterable[str]) -> Iterator[Tuple[str, int, str]]:
+        """
+        Check the links of some files.
+
+        Args:
+            sources: Paths of the linking files
+
+        Yields:
+            (path, line, problem) for every broken link
+        """
+        for source in sources:
+            check = self.check_index_path if _is_index_file(source) else self.check_link
+            for line, target in self.links.get(source, ()):
+                problem = check(source, target)
+                if problem is not None:
+                    yield source, line, problem
+
+    def sources_under(self, directory: str) -> List[str]:
+        """
+        Return the files with links inside a directory, sorted.
+        """
+        prefix = posixpath.normpath(directory) + '/'
+        return sorted(source for source in self.links if source.startswith(prefix))
+
+
+def build_link_index(root: Path = Path('.'),
+                     scans: Iterable[pack_scanner.PackScan] = ()) -> LinkIndex:
+    """
+    Index the files, anchors and links of a repository.
+
+    Args:
+        root: Repository root
+        scans: Pack scans whose skills, agents and docs provide their own
+               anchors and links (those files are not read again)
+
+    Returns:
+        LinkIndex with paths relative to root
+    """
+    scanned: Dict[str, pack_scanner.Document] = {}
+    for scan in scans:
+        for document in scan.skills + scan.agents + scan.docs:
+            scanned[Path(os.path.relpath(document.path, root)).as_posix()] = document
+
+    files = set()
+    directories = set()
+    anchors: Dict[str, FrozenSet[str]] = {}
+    links: Dict[str, List[Link]] = {}
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(name for name in dirnames if name not in SKIP_DIRS)
+        relative_dir = Path(dirpath).relative_to(root).as_posix()
+        if relative_dir != '.':
+            directories.add(relative_dir)
+
+        for filename in filenames:
+            relative = posixpath.normpath(posixpath.join(relative_dir, filename))
+            files.add(relative)
+            if relative in scanned:
+                found_anchors, found_links = scanned[relative].anchors, scanned[relative].links
+            elif filename.endswith('.md'):
+                extracted = build_cache.cached(f'mdlinks{markdown_utils.EXTRACT_VERSION}',
+                                               Path(dirpath) / filename,
+                                               build_cache.read_bytes, extract_markdown)
+                found_anchors, found_links = extracted['anchors'], extracted['links']
+            elif _is_index_file(relative):
+                extracted = build_cache.cached(f'indexpaths{INDEX_EXTRACT_VERSION}', Path(dirpath) / filename,
+                                               build_cache.read_bytes, extract_index_paths)
+                found_anchors, found_links = None, extracted['links']
+            else:
+                continue
+            if found_anchors is not None:
+                anchors[relative] = frozenset(anchor.lower() for anchor in found_anchors)
+            if found_links:
+                links[relative] = list(found_links)
+
+    return LinkIndex(frozenset(files), frozenset(directories), anchors, links)
+
+
+# Index of this process, per repository root (see get_link_index())
+_indexes: Dict[str, LinkIndex] = {}
+
+
+def get_link_index(root: Path = Path('.'),
+                   scans: Iterable[pack_scanner.PackScan] = ()) -> LinkIndex:
+    """
+    Return the link index of a repository, building it on first use in this
+    process (from scans, see build_link_index()).
+    """
+    key = str(Path(root).resolve())
+    if key not in _indexes:
+        _indexes[key] = build_link_index(Path(root), scans)
+    return _indexes[key]
+
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Markdown helpers shared by the pack scanner, the chunk index, the semantic
+index and the link checker.
+
+They work on the raw bytes of a file with byte offsets, so callers can skip
+the frontmatter without decoding or copying the body, and they ignore
+everything inside fenced code blocks.
+"""
+
+import re
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Bump when extract_anchors_and_links() returns different anchors or links
+EXTRACT_VERSION = 1
+
+_HEADING_RE = re.compile(rb'(#{1,6})[ \t]+(.*?)[ \t]*#*[ \t]*\r?\n?')
+_FENCE_RE = re.compile(rb'[ \t]{0,3}(`{3,}|~{3,})')
+_MARKUP_RE = re.compile(r'\]\([^)]*\)|[`*~\[\]]')
+_LINK_RE = re.compile(r'!?\[[^\]\n]*\]\(\s*<?([^)\s>]+)>?(?:\s+"[^"]*")?\s*\)')
+_REFERENCE_RE = re.compile(r' {0,3}\[[^\]\n]+\]:\s*<?([^\s>]+)>?')
+_INLINE_CODE_RE = re.compile(r'`[^`\n]*`')
+_HTML_ANCHOR_RE = re.compile(r'<a\s[^>]*?\b(?:name|id)\s*=\s*"([^"]+)"', re.IGNORECASE)
+_EXTERNAL_RE = re.compile(r'[a-z][a-z0-9+.-]*:|//', re.IGNORECASE)
+_CODE_BLOCK_RE = re.compile(r'^```.*?^```[^\n]*$', re.MULTILINE | re.DOTALL)
+
+# Longest summary returned by first_paragraph()
+SUMMARY_LENGTH = 280
+
+Link = Tuple[int, str]
+
+
+def heading_anchor(heading: str) -> str:
+    """
+    Return the GitHub anchor of a heading ('Pattern 3: Kernel Updates' ->
+    'pattern-3-kernel-updates').
+    """
+    text = _MARKUP_RE.sub('', heading).strip().lower()
+    text = re.sub(r'[^\w\- ]', '', text)
+    return text.replace(' ', '-')
+
+
+def prose_lines(raw: bytes, offset: int = 0) -> Iterator[Tuple[int, int, bytes]]:
+    """
+    Yield (line number, byte offset, line) of the lines of raw from offset
+    on, skipping fenced code blocks and their fences. Line numbers count from
+    1 at the start of raw.
+    """
+    fence: Optional[bytes] = None
+    position = offset
+    number = raw.count(b'\n', 0, offset) + 1
+    for line in raw[offset:].splitlines(keepends=True):
+        fence_match = _FENCE_RE.match(line)
+        if fence_match:
+            marker = fence_match.group(1)
+            if fence is None:
+                fence = marker
+            elif marker[0] == fence[0] and len(marker) >= len(fence) and not line.strip(b' \t\r\n`~'):
+                fence = None
+        elif fence is None:
+            yield number, position, line
+        position += len(line)
+        number += 1
+
+
+def iter_headings(raw: bytes, offset: int = 0,
+                  max_level: int = 6) -> Iterator[Tuple[int, int, int, str]]:
+    """
+    Yield (line number, byte offset, level, text) of the ATX headings of raw
+    from offset on, down to max_level, outside code blocks.
+    """
+    for number, position, line in prose_lines(raw, offset):
+        match = _HEADING_RE.fullmatch(line)
+        if match and len(match.group(1)) <= max_level:
+            yield number, position, len(match.group(1)), match.group(2).decode('utf-8', errors='replace')
+
+
+def first_paragraph(raw: bytes, offset: int = 0) -> str:
+    """
+    Return the first prose paragraph of raw from offset on, shortened to
+    SUMMARY_LENGTH characters ('' if there is none).
+    """
+    body = _CODE_BLOCK_RE.sub('', raw[offset:].decode('utf-8', errors='replace'))
+    for paragraph in re.split(r'\n\s*\n', body):
+        stripped = paragraph.strip()
+        # Skip headings, lists, tables, quotes, images and HTML
+        if not stripped or stripped[0] in '#-*|>!<[' or stripped[0].isdigit():
+            continue
+        text = ' '.join(stripped.split())
+        if len(text) <= SUMMARY_LENGTH:
+            return text
+        return text[:SUMMARY_LENGTH].rsplit(' ', 1)[0].rstrip(',;:') + '…'
+    return ''
+
+
+def extract_anchors_and_links(raw: bytes, offset: int = 0) -> Tuple[List[str], List[Link]]:
+    """
+    Extract the anchors and relative links of a markdown file.
+
+    Args:
+        raw: Contents of the file
+        offset: Byte offset of the body (after the frontmatter)
+
+    Returns:
+        (anchors, links): the GitHub anchors of the headings (duplicates
+        suffixed '-1', '-2', ... as GitHub does) and of <a name>/<a id> tags,
+        and (line, target) of every relative link (inline links, images and
+        reference definitions, outside code blocks and inline code), in file
+        order
+    """
+    anchors = []
+    seen: Dict[str, int] = {}
+    for _, _, _, heading in iter_headings(raw, offset):
+        anchor = heading_anchor(heading)
+        count = seen.get(anchor, 0)
+        seen[anchor] = count + 1
+        anchors.append(f'{anchor}-{count}' if count else anchor)
+
+    links = []
+    for number, _, line in prose_lines(raw, offset):
+        text = line.decode('utf-8', errors='replace')
+        anchors.extend(match.group(1) for match in _HTML_ANCHOR_RE.finditer(text))
+        text = _INLINE_CODE_RE.sub('', text)
+        targets = [match.group(1) for match in _LINK_RE.finditer(text)]
+        reference = _REFERENCE_RE.match(text)
+        if reference:
+            targets.append(reference.group(1))
+        links.extend((number, target) for target in targets if not _EXTERNAL_RE.match(target))
+
+    return anchors, links
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Discover the agentic packs of the repository.
+
+A pack is a directory with a .claude-plugin/plugin.json, or one listed as a
+plugin source in .claude-plugin/marketplace.json. Packs listed in the
+marketplace come first, in marketplace order; the others follow sorted by
+path. The scan uses os.scandir, never descends into a pack or into hidden,
+dependency and index directories, and is done once per process, so the
+validator and the generators share one result.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Marketplace manifest, relative to the repository root
+MARKETPLACE_FILE = Path('.claude-plugin') / 'marketplace.json'
+
+# Plugin manifest that marks a pack, relative to the pack directory
+PLUGIN_FILE = Path('.claude-plugin') / 'plugin.json'
+
+# Directories that never contain packs (hidden directories are skipped too)
+SKIPPED_DIRS = {'node_modules', '__pycache__', '.ai-index', 'docs', 'scripts', 'venv'}
+
+# How deep below the root packs are looked for (1 = top-level directories)
+MAX_DEPTH = 2
+
+# Discovery results of the current process, keyed by resolved root
+_discovered: Dict[Tuple[str, int], List[str]] = {}
+
+
+def marketplace_packs(root: Path) -> List[str]:
+    """
+    Return the pack directories listed in the marketplace manifest.
+
+    Sources that are not local paths (e.g. GitHub repositories) are ignored.
+
+    Args:
+        root: Repository root
+
+    Returns:
+        Pack directories relative to root, in marketplace order
+    """
+    marketplace_file = root / MARKETPLACE_FILE
+    if not marketplace_file.exists():
+        return []
+
+    try:
+        with open(marketplace_file, 'r', encoding='utf-8') as f:
+            marketplace = json.load(f)
+    except Exception as e:
+        print(f"Warning: Failed to load {MARKETPLACE_FILE}: {e}")
+        return []
+
+    pack_dirs = []
+    for plugin in marketplace.get('plugins', []):
+        source = plugin.get('source') if isinstance(plugin, dict) else None
+        if not isinstance(source, str):
+            continue
+        pack_dir = os.path.normpath(source).replace(os.sep, '/')
+        if pack_dir in ('.', '') or pack_dir.startswith('../'):
+            continue
+        if pack_dir not in pack_dirs:
+            pack_dirs.append(pack_dir)
+
+    return pack_dirs
+
+
+def _scan(root: str, relative: str, depth: int, found: List[str]) -> None:
+    """
+    Collect directories holding a plugin.json, up to max_depth levels deep.
+    """
+    try:
+        entries = list(os.scandir(os.path.join(root, relative) if relative else root))
+    except (FileNotFoundError, NotADirectoryError, PermissionError):
+        return
+
+    for entry in entries:
+        if entry.name.startswith('.') or entry.name in SKIPPED_DIRS:
+            continue
+        try:
+            if not entry.is_dir():
+                continue
+        except OSError:
+            continue
+
+        pack_dir = f'{relative}/{entry.name}' if relative else entry.name
+        if os.path.isfile(os.path.join(entry.path, PLUGIN_FILE)):
+            # Packs do not nest
+            found.append(pack_dir)
+        elif depth > 1:
+            _scan(root, pack_dir, depth - 1, found)
+
+
+def scan_packs(root: Path, max_depth: int = MAX_DEPTH) -> List[str]:
+    """
+    Return the directories below root that contain a plugin.json.
+
+    Args:
+        root: Repository root
+        max_depth: How many directory levels to look into
+
+    Returns:
+        Pack directories relative to root, sorted
+    """
+    found: List[str] = []
+    _scan(str(root), '', max_depth, found)
+    return sorted(found)
+
+
+def discover_packs(root: Path = Path('.'), max_depth: int = MAX_DEPTH,
+                   refresh: bool = False) -> List[str]:
+    """
+    Return the pack directories of a repository.
+
+    Args:
+        root: Repository root (the working directory by default; the scripts
+              run from the repository root)
+        max_depth: How many directory levels to look into
+        refresh: Discover again instead of returning the cached result
+
+    Returns:
+        Pack directories relative to root: marketplace packs in marketplace
+        order, then the other packs sorted by path
+    """
+    key = (str(Path(root).resolve()), max_depth)
+    if refresh or key not in _discovered:
+        root = Path(root)
+        pack_dirs = marketplace_packs(root)
+        listed = set(pack_dirs)
+        pack_dirs.extend(pack_dir for pack_dir in scan_packs(root, max_depth) if pack_dir not in listed)
+        _discovered[key] = pack_dirs
+    return list(_discovered[key])
+
+
+if __name__ == '__main__':
+    import time
+
+    start = time.perf_counter()
+    packs = discover_packs()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    print(f"Discovered {len(packs)} packs in {elapsed_ms:.2f} ms:")
+    for pack_dir in packs:
+        print(f"  • {pack_dir}")
@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+"""
+Scan agentic packs once into an in-memory document model.
+
+Both validate_structure.py and the data generators consume the scans, so a
+validate + generate pipeline reads and parses each file exactly once.
+"""
+
+import hashlib
+import io
+import json
+import re
+from dataclasses import dataclass, field
+from functools import partial
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple
+
+import yaml
+
+import build_cache
+import build_report
+import frontmatter_yaml
+import markdown_utils
+import parallel
+import token_estimator
+
+# Files under docs/ that are indexes rather than documentation
+DOC_EXCLUDE_FILES = {'README.md', 'INDEX.md', 'SOURCES.md'}
+
+# Opening and closing lines of YAML frontmatter (---)
+FRONTMATTER_DELIMITER_RE = re.compile(rb'---\s*')
+
+# Stop looking for the closing --- after this many bytes
+MAX_FRONTMATTER_BYTES = 64 * 1024
+
+# Bump when the output of _parse_document() changes
+PARSE_VERSION = 3
+
+# Build cache namespace of parsed documents (frontmatter, token count, anchors,
+# links, content hash, first heading and first paragraph)
+DOCUMENT_CACHE_NAMESPACE = (f'document{PARSE_VERSION}.{token_estimator.ESTIMATOR_VERSION}'
+                            f'.{markdown_utils.EXTRACT_VERSION}')
+
+
+@dataclass
+class Document:
+    """
+    A markdown file, its parsed YAML frontmatter, its estimated token count,
+    the anchors and relative links of its body (see markdown_utils.py), the
+    sha256 of its contents, and the first heading and first prose paragraph
+    of its body.
+    """
+    path: Path
+    has_frontmatter: bool = False
+    frontmatter: Any = None
+    error: Optional[str] = None
+    tokens: int = 0
+    anchors: List[str] = field(default_factory=list)
+    links: List[markdown_utils.Link] = field(default_factory=list)
+    source_hash: str = ''
+    heading: Optional[str] = None
+    summary: str = ''
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """
+        Frontmatter as a dictionary ({} when missing or invalid).
+        """
+        return self.frontmatter if isinstance(self.frontmatter, dict) else {}
+
+
+@dataclass
+class JsonFile:
+    """
+    An optional JSON config file (plugin.json, .mcp.json).
+    """
+    path: Path
+    exists: bool = False
+    data: Any = None
+    error: Optional[str] = None
+    syntax_error: bool = False
+
+
+@dataclass
+class PackScan:
+    """
+    Everything the validator and the generators need to know about a pack.
+    """
+    pack_dir: str
+    exists: bool = False
+    has_readme: bool = False
+    plugin: Optional[JsonFile] = None
+    mcp: Optional[JsonFile] = None
+    skills: List[Document] = field(default_factory=list)
+    agents: List[Document] = field(default_factory=list)
+    docs: List[Document] = field(default_factory=list)
+
+
+# Scans of the current process, keyed by pack directory
+_scans: Dict[str, PackScan] = {}
+
+
+def _load_frontmatter(raw: bytes) -> Tuple[bool, Any, Optional[str]]:
+    """
+    Parse the frontmatter lines of a file (the opening --- through the
+    closing ---, cut off after MAX_FRONTMATTER_BYTES + 1 bytes) into
+    (has_frontmatter, frontmatter, error). Blocks over the limit are errors.
+    """
+    lines = io.BytesIO(raw).readlines()
+
+    if not lines or not FRONTMATTER_DELIMITER_RE.fullmatch(lines[0]):
+        return False, None, None
+
+    if len(raw) > MAX_FRONTMATTER_BYTES:
+        return True, None, f"Frontmatter exceeds {MAX_FRONTMATTER_BYTES} bytes (missing closing ---?)"
+
+    if len(lines) < 2 or not FRONTMATTER_DELIMITER_RE.fullmatch(lines[-1]):
+        return False, None, None
+
+    try:
+        frontmatter_text = b''.join(lines[1:-1]).decode('utf-8')
+    except UnicodeDecodeError as e:
+        return True, None, f"Error reading file: {e}"
+
+    try:
+        return True, frontmatter_yaml.load(frontmatter_text), None
+    except yaml.YAMLError as e:
+        return True, None, f"Invalid YAML: {e}"
+
+
+def _read_frontmatter_lines(stream: BinaryIO, max_bytes: int = MAX_FRONTMATTER_BYTES) -> bytes:
+    """
+    Read a markdown stream line by line up to the end of its frontmatter.
+
+    Reading stops after the first line if it is not an opening ---, at the
+    closing ---, or once max_bytes have been read, so the cost does not
+    depend on the size of the document body.
+
+    Args:
+        stream: Binary stream positioned at the start of the file
+        max_bytes: Frontmatter size limit
+
+    Returns:
+        The bytes read (at most max_bytes + 1)
+    """
+    line = stream.readline(max_bytes + 1)
+    chunks = [line]
+    size = len(line)
+
+    if not FRONTMATTER_DELIMITER_RE.fullmatch(line):
+        return line
+
+    while size <= max_bytes:
+        line = stream.readline(max_bytes + 1 - size)
+        if not line:
+            break
+        chunks.append(line)
+        size += len(line)
+        if FRONTMATTER_DELIMITER_RE.fullmatch(line):
+            break
+
+    return b''.join(chunks)
+
+
+def _split_frontmatter(head: bytes) -> Tuple[Tuple[bool, Any, Optional[str]], int]:
+    """
+    Parse the bytes read by _read_frontmatter_lines() into
+    ((has_frontmatter, frontmatter, error), offset of the body).
+    """
+    frontmatter = _load_frontmatter(head)
+    if frontmatter[0] and len(head) <= MAX_FRONTMATTER_BYTES:
+        return frontmatter, len(head)
+    return frontmatter, 0
+
+
+def parse_frontmatter(raw: bytes) -> Tuple[Tuple[bool, Any, Optional[str]], bytes]:
+    """
+    Parse the frontmatter of a whole markdown file.
+
+    Only the first MAX_FRONTMATTER_BYTES + 1 bytes are searched for the
+    closing ---, so a larger frontmatter block is reported as an error
+    whether or not it is closed.
+
+    Args:
+        raw: File contents
+
+    Returns:
+        ((has_frontmatter, frontmatter, error), body) where body is the
+        content after the closing delimiter (all of raw without frontmatter)
+    """
+    frontmatter, body_start = _split_frontmatter(_read_frontmatter_lines(io.BytesIO(raw)))
+    return frontmatter, raw[body_start:]
+
+
+def read_document_bytes(file_path: Path) -> bytes:
+    """
+    Read a markdown file for read_document().
+
+    The frontmatter is read line by line through _read_frontmatter_lines(),
+    so parsing it stays bounded by MAX_FRONTMATTER_BYTES; the body is read
+    after it from the same handle only because the token count and the
+    anchors and links need it.
+
+    Args:
+        file_path: Path to the markdown file
+
+    Returns:
+        The file contents
+    """
+    with open(file_path, 'rb') as f:
+        head = _read_frontmatter_lines(f)
+        return head + f.read()
+
+
+def _parse_document(raw: bytes) -> Tuple[Any, ...]:
+    """
+    Build cache parse function: ((has_frontmatter, frontmatter, error),
+    tokens, anchors, links, sha256, first heading, first paragraph) of a
+    markdown file's contents.
+
+    The frontmatter is parsed from at most MAX_FRONTMATTER_BYTES + 1 bytes;
+    the rest of the file is only tokenized and scanned.
+    """
+    frontmatter, body_start = _split_frontmatter(_read_frontmatter_lines(io.BytesIO(raw)))
+    anchors, links = markdown_utils.extract_anchors_and_links(raw, body_start)
+    heading = next(markdown_utils.iter_headings(raw, body_start), None)
+    return (frontmatter, token_estimator.count_bytes(raw), anchors, links,
+            hashlib.sha256(raw).hexdigest(), heading[3] if heading else None,
+            markdown_utils.first_paragraph(raw, body_start))
+
+
+def read_document(file_path: Path, kind: str = 'doc', pack_dir: str = '') -> Document:
+    """
+    Read a markdown file, parse its frontmatter, estimate its tokens and
+    extract its anchors, links, content hash, first heading and summary.
+
+    The file is opened once, frontmatter first (read_document_bytes());
+    everything derived from it is cached together under its content hash,
+    so an unchanged file is not read again.
+
+    Args:
+        file_path: Path to the markdown file
+        kind: Type of document, for the build report (skill, agent, doc)
+        pack_dir: Pack the document belongs to, for the build report
+
+    Returns:
+        Document (read and YAML errors are recorded on it, not raised)
+    """
+    def load(read: Callable[[Path], bytes]) -> Tuple[Any, ...]:
+        return build_cache.cached(DOCUMENT_CACHE_NAMESPACE, file_path, read, _parse_document)
+
+    try:
+        ((has_frontmatter, frontmatter, error), tokens, anchors, links,
+         source_hash, heading, summary) = build_report.get_report().timed_read(
+            kind, file_path, pack_dir, load, read_document_bytes)
+    except OSError as e:
+        return Document(path=file_path, error=f"Error reading file: {e}")
+
+    return Document(path=file_path, has_frontmatter=has_frontmatter,
+                     frontmatter=frontmatter, error=error, tokens=tokens,
+                     anchors=anchors, links=links, source_hash=source_hash,
+                     heading=heading, summary=summary)
+
+
+def read_json_file(file_path: Path, kind: str = 'json', pack_dir: str = '') -> JsonFile:
+    """
+    Read an optional JSON file.
+
+    Args:
+        file_path: Path to the JSON file
+        kind: Type of file, for the build report (plugin, mcp)
+        pack_dir: Pack the file belongs to, for the build report
+
+    Returns:
+        JsonFile (a missing file is not an error)
+    """
+    if not file_path.exists():
+        return JsonFile(path=file_path)
+
+    try:
+        data = build_report.get_report().timed_read(
+            kind, file_path, pack_dir,
+            lambda read: build_cache.cached('json', file_path, read, json.loads),
+            build_cache.read_bytes)
+    except json.JSONDecodeError as e:
+        return JsonFile(path=file_path, exists=True, error=str(e), syntax_error=True)
+    except Exception as e:
+        return JsonFile(path=file_path, exists=True, error=str(e))
+
+    return JsonFile(path=file_path, exists=True, data=data)
+
+
+def _find_docs(docs_dir: Path) -> List[Path]:
+    """
+    Find documentation files under docs/ (excluding indexes and .ai-index).
+    """
+    return sorted(
+        doc_file for doc_file in docs_dir.rglob('*.md')
+        if doc_file.name not in DOC_EXCLUDE_FILES and '.ai-index' not in doc_file.parts
+    )
+
+
+def _scan(pack_dir: str) -> PackScan:
+    """
+    Read every file of a pack that validation or generation looks at.
+    """
+    pack_path = Path(pack_dir)
+    scan = PackScan(pack_dir=pack_dir, exists=pack_path.exists())
+
+    if not scan.exists:
+        return scan
+
+    scan.has_readme = (pack_path / 'README.md').exists()
+    scan.plugin = read_json_file(pack_path / '.claude-plugin' / 'plugin.json', 'plugin', pack_dir)
+    scan.mcp = read_json_file(pack_path / '.mcp.json', 'mcp', pack_dir)
+    scan.skills = [read_document(p, 'skill', pack_dir)
+                   for p in sorted((pack_path / 'skills').glob('*/SKILL.md'))]
+    scan.agents = [read_document(p, 'agent', pack_dir)
+                   for p in sorted((pack_path / 'agents').glob('*.md'))]
+
+    docs_dir = pack_path / 'docs'
+    if docs_dir.exists():
+        scan.docs = [read_document(p, 'doc', pack_dir) for p in _find_docs(docs_dir)]
+
+    return scan
+
+
+def _scan_pack_job(pack_dir: str, analyze: Optional[Callable[[PackScan], Any]] = None
+                   ) -> Tuple[PackScan, Any, Dict[str, Any], List[Any]]:
+    """
+    Process pool entry point: scan a pack, analyze it, and hand back the
+    scan, the analysis and the cache and report deltas.
+    """
+    scan = _scan(pack_dir)
+    analysis = analyze(scan) if analyze is not None else None
+    return scan, analysis, build_cache.get_cache().take_delta(), build_report.get_report().take_delta()
+
+
+def _analyze_scan_job(scan: PackScan, analyze: Callable[[PackScan], Any]
+                      ) -> Tuple[Any, Dict[str, Any], List[Any]]:
+    """
+    Process pool entry point: analyze a scan made in the parent, and hand
+    back the analysis and the cache and report deltas.
+    """
+    analysis = analyze(scan)
+    return analysis, build_cache.get_cache().take_delta(), build_report.get_report().take_delta()
+
+
+def _init_worker(cache_args: Tuple[Any, ...], report_enabled: bool,
+                 setup: Optional[Callable[..., None]] = None, setup_args: Tuple[Any, ...] = ()) -> None:
+    """
+    Process pool initializer: mirror the parent's build cache and report
+    settings, then run the caller's setup(*setup_args).
+    """
+    build_cache.init_worker(*cache_args)
+    build_report.init_worker(report_enabled)
+    if setup is not None:
+        setup(*setup_args)
+
+
+def scan_pack(pack_dir: str) -> PackScan:
+    """
+    Return the scan of a pack, scanning it on first use.
+
+    Args:
+        pack_dir: Name of the pack directory
+
+    Returns:
+        PackScan shared by every consumer in this process
+    """
+    if pack_dir not in _scans:
+        _scans[pack_dir] = _scan(pack_dir)
+    return _scans[pack_dir]
+
+
+def scan_packs(pack_dirs: List[str], jobs: Optional[int] = None) -> List[PackScan]:
+    """
+    Scan several packs, fanning the unscanned ones out over a process pool.
+
+    Args:
+        pack_dirs: Pack directories to scan
+        jobs: Number of worker processes (None for the CPU count, 1 for serial)
+
+    Returns:
+        List of scans, in pack_dirs order
+    """
+    return [scan for scan, _ in analyze_packs(pack_dirs, None, jobs)]
+
+
+def analyze_packs(pack_dirs: List[str], analyze: Optional[Callable[[PackScan], Any]],
+                  jobs: Optional[int] = None,
+                  stop: Optional[Callable[[Any], bool]] = None) -> List[Tuple[PackScan, Any]]:
+    """
+    Scan several packs and run analyze(scan) on each.
+
+    Unscanned packs are scanned and analyzed in the same worker process, so
+    scans are not shipped back and forth; packs scanned earlier in this
+    process are analyzed here.
+
+    Args:
+        pack_dirs: Pack directories to scan
+        analyze: Picklable top-level function of a PackScan (None to only scan)
+        jobs: Number of worker processes (None for the CPU count, 1 for serial)
+        stop: Called with each analysis; once it returns True no further
+              packs are analyzed
+
+    Returns:
+        (scan, analysis) pairs in pack_dirs order (fewer if stopped)
+    """
+    results: Dict[str, Tuple[PackScan, Any]] = {}
+    stopped = False
+
+    for pack_dir in pack_dirs:
+        if pack_dir in _scans:
+            scan = _scans[pack_dir]
+            analysis = analyze(scan) if analyze is not None else None
+            results[pack_dir] = (scan, analysis)
+            if stop is not None and stop(analysis):
+                stopped = True
+                break
+
+    pending = [pack_dir for pack_dir in pack_dirs if pack_dir not in _scans]
+
+    if pending and not stopped:
+        job_stop = (lambda result: stop(result[1])) if stop is not None else None
+        jobs_results = parallel.map_ordered(partial(_scan_pack_job, analyze=analyze), pending, jobs,
+                                            initializer=_init_worker,
+                                            initargs=(build_cache.worker_initargs(),
+                                                      build_report.get_report().enabled),
+                                            stop=job_stop)
+        cache = build_cache.get_cache()
+        report = build_report.get_report()
+        for pack_dir, (scan, analysis, cache_delta, report_delta) in zip(pending, jobs_results):
+            cache.merge_delta(cache_delta)
+            report.merge_delta(report_delta)
+            _scans[pack_dir] = scan
+            results[pack_dir] = (scan, analysis)
+
+    return [results[pack_dir] for pack_dir in pack_dirs if pack_dir in results]
+
+
+def analyze_scans(scans: List[PackScan], analyze: Callable[[PackScan], Any],
+                  jobs: Optional[int] = None, stop: Optional[Callable[[Any], bool]] = None,
+                  setup: Optional[Callable[..., None]] = None,
+                  setup_args: Tuple[Any, ...] = ()) -> List[Any]:
+    """
+    Run analyze(scan) on scans of this process over a process pool.
+
+    For analyses that need something built from every scan first (the
+    repository link index); otherwise analyze_packs() scans and analyzes in
+    one pass. That shared input goes through setup(*setup_args), which runs
+    once in each worker (and once here when running serially) instead of
+    being sent with every scan.
+
+    Args:
+        scans: Pack scans to analyze
+        analyze: Picklable top-level function of a PackScan
+        jobs: Number of worker processes (None for the CPU count, 1 for serial)
+        stop: Called with each analysis; once it returns True no further
+              scans are analyzed
+        setup: Picklable top-level function preparing a process for analyze
+        setup_args: Arguments for setup
+
+    Returns:
+        Analyses in scans order (fewer if stopped)
+    """
+    if jobs is None:
+        jobs = parallel.default_jobs()
+    if setup is not None and min(jobs, len(scans)) <= 1:
+        setup(*setup_args)
+
+    job_stop = (lambda result: stop(result[0])) if stop is not None else None
+    jobs_results = parallel.map_ordered(partial(_analyze_scan_job, analyze=analyze), scans, jobs,
+                                        initializer=_init_worker,
+                                        initargs=(build_cache.worker_initargs(),
+                                                  build_report.get_report().enabled,
+                                                  setup, setup_args),
+                                        stop=job_stop)
+    cache = build_cache.get_cache()
+    report = build_report.get_report()
+    analyses = []
+    for analysis, cache_delta, report_delta in jobs_results:
+        cache.merge_delta(cache_delta)
+        report.merge_delta(report_delta)
+        analyses.append(analysis)
+    return analyses
+
+
+def invalidate(pack_dir: Optional[str] = None) -> None:
+    """
+    Forget the scan of a pack (or of every pack) so it is re-read on next use.
+    """
+    if pack_dir is None:
+        _scans.clear()
+    else:
+        _scans.pop(pack_dir, None)
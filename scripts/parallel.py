@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Process pool helpers shared by the generators and the validator.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Iterable, List, Optional, Sequence
+
+
+def default_jobs() -> int:
+    """
+    Return the default number of worker processes (the CPU count).
+    """
+    return os.cpu_count() or 1
+
+
+def map_ordered(func: Callable[[Any], Any], items: Sequence[Any], jobs: Optional[int] = None,
+                initializer: Optional[Callable[..., None]] = None,
+                initargs: Iterable[Any] = (),
+                stop: Optional[Callable[[Any], bool]] = None) -> List[Any]:
+    """
+    Apply func to every item, fanning out over a process pool.
+
+    Results are returned in the order of items regardless of which worker
+    finishes first, so callers get the same output as a serial loop.
+
+    Args:
+        func: Picklable top-level function to apply
+        items: Items to process
+        jobs: Number of worker processes (None for the CPU count, 1 for serial)
+        initializer: Optional per-worker setup function
+        initargs: Arguments for the initializer
+        stop: Called with each result, in order; once it returns True the
+              remaining items are cancelled (those already running finish
+              but their results are dropped)
+
+    Returns:
+        List of results, one per item (a prefix of them if stopped)
+    """
+    if jobs is None:
+        jobs = default_jobs()
+    jobs = min(jobs, len(items))
+
+    results = []
+
+    if jobs <= 1:
+        for item in items:
+            results.append(func(item))
+            if stop is not None and stop(results[-1]):
+                break
+        return results
+
+    executor = ProcessPoolExecutor(max_workers=jobs, initializer=initializer,
+                                   initargs=tuple(initargs))
+    try:
+        for result in executor.map(func, items):
+            results.append(result)
+            if stop is not None and stop(result):
+                break
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+    return results
+
+
+def positive_int(value: str) -> int:
+    """
+    argparse type for --jobs style options.
+    """
+    number = int(value)
+    if number < 1:
+        raise ValueError(f"expected a positive integer, got {value}")
+    return number
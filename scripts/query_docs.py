@@ -0,0 +1,477 @@
+#!/usr/bin/env python3
+"""
+Query a pack's .ai-index files: which docs to load, in which order, for a task.
+
+DocIndex loads semantic-index.json, task-to-docs-mapping.json and
+cross-reference-graph.json once and precomputes hash indexes by path,
+use case, tag, RHEL version and system type, plus every task's ordered
+workflow with cumulative token counts. A query is then a dictionary lookup
+and a bisect for the token budget, instead of a scan over every document and
+mapping (see bench_doc_query.py).
+
+    python scripts/query_docs.py --task kernel_cve_bare_metal --rhel rhel9 --system vm
+    python scripts/query_docs.py --use-case selinux_cve --budget 8000 --json
+    python scripts/query_docs.py --read 'rhel/package-management.md#reboot-detection-patterns'
+
+--read prints single sections of docs from the chunk index
+(generate_chunk_index.py), reading only their bytes. Tasks that no pack
+knows as a curated mapping or a use case are answered from the BM25 index
+(generate_bm25_index.py), which --search also queries directly:
+
+    python scripts/query_docs.py --task 'reboot after a kernel update' --rhel rhel9
+    python scripts/query_docs.py --search 'cvss score of a vulnerability'
+"""
+
+import argparse
+import json
+import re
+import sys
+from bisect import bisect_right
+from dataclasses import asdict, dataclass, field
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from generate_bm25_index import BM25Index, load_bm25_index
+from generate_chunk_index import load_chunk_index
+from generate_cross_reference_graph import GRAPH_FILE
+from generate_semantic_index import INDEX_DIR, INDEX_FILE, load_index
+from pack_discovery import discover_packs
+
+TASK_MAPPING_FILE = 'task-to-docs-mapping.json'
+
+# Docs planned for a free-text task answered from the BM25 index
+SEARCH_LIMIT = 5
+
+# Planned BM25 matches must score at least this fraction of the best match
+MIN_RELATIVE_SCORE = 0.5
+
+_RHEL_RE = re.compile(r'rhel\d+$', re.IGNORECASE)
+
+# Facet values of a doc that declares none (it applies to every query)
+_ANY: FrozenSet[str] = frozenset()
+
+
+@dataclass
+class PlannedDoc:
+    """
+    A doc of a query result.
+    """
+    path: str
+    tokens: int
+    required: bool
+    section: Optional[str] = None
+
+
+@dataclass
+class Plan:
+    """
+    Ordered docs to load for a task, capped to a token budget.
+    """
+    task: str
+    description: str
+    docs: List[PlannedDoc] = field(default_factory=list)
+    tokens: int = 0
+    dropped: List[str] = field(default_factory=list)
+    missing: List[str] = field(default_factory=list)
+    prerequisites: List[str] = field(default_factory=list)
+    over_budget: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Return the plan as a JSON-serializable dictionary.
+        """
+        return asdict(self)
+
+
+@dataclass
+class _Workflow:
+    """
+    A task's precomputed workflow: existing docs in order, and the mapped
+    docs missing from the semantic index.
+    """
+    description: str
+    docs: Tuple[PlannedDoc, ...]
+    missing: Tuple[str, ...]
+    prerequisites: Tuple[str, ...]
+
+
+def _facets(entry: Dict[str, Any]) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    """
+    Return the (RHEL versions, system types) a semantic index entry applies to.
+    """
+    values = []
+    for key in ('applies_to', 'rhel_versions', 'applies_to_systems'):
+        if isinstance(entry.get(key), list):
+            values.extend(str(value) for value in entry[key])
+    rhel = frozenset(value.lower() for value in values if _RHEL_RE.match(value))
+    systems = frozenset(value.lower() for value in values if not _RHEL_RE.match(value))
+    return rhel, systems
+
+
+class DocIndex:
+    """
+    Hash indexes over one pack's .ai-index files.
+    """
+
+    def __init__(self, pack_dir: str, semantic: Dict[str, Any], tasks: Dict[str, Any],
+                 graph: Dict[str, Any], bm25: Optional[BM25Index] = None):
+        self.pack_dir = pack_dir
+        self.bm25 = bm25
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.by_use_case: Dict[str, List[str]] = {}
+        self.by_tag: Dict[str, List[str]] = {}
+        self.by_rhel: Dict[str, FrozenSet[str]] = {}
+        self.by_system: Dict[str, FrozenSet[str]] = {}
+        self.graph: Dict[str, Dict[str, List[Dict[str, Any]]]] = graph.get('graph', {})
+        self._rhel_of: Dict[str, FrozenSet[str]] = {}
+        self._systems_of: Dict[str, FrozenSet[str]] = {}
+
+        rhel_docs: Dict[str, set] = {}
+        system_docs: Dict[str, set] = {}
+        for entry in semantic.get('documents', []):
+            if not isinstance(entry, dict) or 'path' not in entry:
+                continue
+            path = entry['path']
+            self.entries[path] = entry
+            for use_case in entry.get('use_cases') or []:
+                self.by_use_case.setdefault(str(use_case).lower(), []).append(path)
+            for tag in entry.get('tags') or []:
+                self.by_tag.setdefault(str(tag).lower(), []).append(path)
+            rhel, systems = _facets(entry)
+            self._rhel_of[path] = rhel
+            self._systems_of[path] = systems
+            for value in rhel:
+                rhel_docs.setdefault(value, set()).add(path)
+            for value in systems:
+                system_docs.setdefault(value, set()).add(path)
+        self.by_rhel = {key: frozenset(paths) for key, paths in rhel_docs.items()}
+        self.by_system = {key: frozenset(paths) for key, paths in system_docs.items()}
+        self._any_rhel = frozenset(path for path, values in self._rhel_of.items() if not values)
+        self._any_system = frozenset(path for path, values in self._systems_of.items() if not values)
+
+        # The dedicated mapping file wins over task_mappings embedded in the semantic index
+        mappings = {**semantic.get('task_mappings', {}), **tasks.get('task_mappings', {})}
+        self.workflows: Dict[str, _Workflow] = {
+            task: self._workflow(mapping) for task, mapping in mappings.items() if isinstance(mapping, dict)
+        }
+        self._plans: Dict[Tuple[str, Optional[str], Optional[str], bool],
+                          Tuple[List[PlannedDoc], int, List[int]]] = {}
+
+    def tokens(self, path: str) -> int:
+        """
+        Return the token estimate of a doc (0 if unknown).
+        """
+        return int(self.entries.get(path, {}).get('token_estimate') or 0)
+
+    def _workflow(self, mapping: Dict[str, Any]) -> _Workflow:
+        """
+        Order a task mapping's docs: workflow_order, then the remaining
+        required docs, then the optional ones.
+        """
+        required = list(mapping.get('required_docs') or [])
+        optional = [doc for doc in mapping.get('optional_docs') or [] if doc not in required]
+        ordered = [doc for doc in mapping.get('workflow_order') or [] if doc in required or doc in optional]
+        ordered += [doc for doc in required + optional if doc not in ordered]
+        sections = mapping.get('critical_sections') or {}
+        docs = tuple(PlannedDoc(doc, self.tokens(doc), doc in required, sections.get(doc))
+                     for doc in ordered if doc in self.entries)
+        missing = tuple(doc for doc in ordered if doc not in self.entries)
+        return _Workflow(str(mapping.get('description', '')), docs, missing,
+                         tuple(mapping.get('prerequisites') or []))
+
+    def applies(self, path: str, rhel: Optional[str] = None, system: Optional[str] = None) -> bool:
+        """
+        Return True if a doc applies to a RHEL version and system type
+        (docs that declare none apply to all).
+        """
+        if rhel and self._rhel_of.get(path, _ANY) and rhel.lower() not in self._rhel_of[path]:
+            return False
+        if system and self._systems_of.get(path, _ANY) and system.lower() not in self._systems_of[path]:
+            return False
+        return True
+
+    def _ordered(self, task: str, rhel: Optional[str], system: Optional[str],
+                 optional: bool) -> Tuple[List[PlannedDoc], int, List[int]]:
+        """
+        Return a task's docs filtered for rhel/system, the tokens of its
+        required docs and the cumulative tokens of its optional docs,
+        computed once per combination.
+        """
+        key = (task, rhel, system, optional)
+        if key not in self._plans:
+            docs = [doc for doc in self.workflows[task].docs
+                    if doc.required or (optional and self.applies(doc.path, rhel, system))]
+            self._plans[key] = (docs, sum(doc.tokens for doc in docs if doc.required),
+                                list(accumulate(doc.tokens for doc in docs if not doc.required)))
+        return self._plans[key]
+
+    def plan(self, task: str, rhel: Optional[str] = None, system: Optional[str] = None,
+             budget: Optional[int] = None, optional: bool = True) -> Optional[Plan]:
+        """
+        Return the ordered docs of a task.
+
+        Required docs are always listed, even when they alone exceed the
+        budget (the plan is then marked over_budget); optional docs only when
+        they apply to rhel and system. With a budget, the optional docs are
+        the longest prefix of them, in workflow order, that fits next to the
+        required ones (workflow order matters, so nothing is skipped over).
+
+        Args:
+            task: Task name from task_mappings, or a use case
+            rhel: RHEL version (rhel8, rhel9, ...)
+            system: System type (bare_metal, vm, openshift, ...)
+            budget: Maximum total tokens
+            optional: Include optional docs
+
+        Returns:
+            Plan, or None if the task is neither a mapped task nor a use case
+            of this pack (see plan_search() for free-text tasks)
+        """
+        if task not in self.workflows:
+            return self.plan_use_case(task, rhel, system, budget)
+
+        docs, required_tokens, cumulative = self._ordered(task, rhel, system, optional)
+        count = len(cumulative) if budget is None else bisect_right(cumulative, budget - required_tokens)
+        optional_docs = [doc for doc in docs if not doc.required]
+        dropped = {doc.path for doc in optional_docs[count:]}
+        workflow = self.workflows[task]
+        return Plan(task=task, description=workflow.description,
+                    docs=[doc for doc in docs if doc.path not in dropped],
+                    tokens=required_tokens + (cumulative[count - 1] if count else 0),
+                    dropped=[doc.path for doc in optional_docs[count:]], missing=list(workflow.missing),
+                    prerequisites=list(workflow.prerequisites),
+                    over_budget=budget is not None and required_tokens > budget)
+
+    def plan_use_case(self, use_case: str, rhel: Optional[str] = None, system: Optional[str] = None,
+                      budget: Optional[int] = None) -> Optional[Plan]:
+        """
+        Return the docs tagged with a use case, cheapest first, capped to a
+        budget. None of them is required, so a budget below the cheapest one
+        leaves the plan empty.
+        """
+        paths = self.by_use_case.get(use_case.lower())
+        if not paths:
+            return None
+        docs = sorted((PlannedDoc(path, self.tokens(path), False) for path in paths
+                       if self.applies(path, rhel, system)), key=lambda doc: (doc.tokens, doc.path))
+        cumulative = list(accumulate(doc.tokens for doc in docs))
+        count = len(docs) if budget is None else bisect_right(cumulative, budget)
+        return Plan(task=use_case, description=f"Docs for use case '{use_case}'", docs=docs[:count],
+                    tokens=cumulative[count - 1] if count else 0,
+                    dropped=[doc.path for doc in docs[count:]])
+
+    def search(self, query: str, limit: Optional[int] = SEARCH_LIMIT,
+               kind: Optional[str] = None) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Rank the pack's docs and skills for a free-text query with the BM25
+        index ([] if the pack has none).
+        """
+        return self.bm25.search(query, limit, kind) if self.bm25 is not None else []
+
+    def plan_search(self, query: str, rhel: Optional[str] = None, system: Optional[str] = None,
+                    budget: Optional[int] = None, limit: int = SEARCH_LIMIT) -> Optional[Plan]:
+        """
+        Return the best BM25 matches of a free-text task, best first, capped
+        to a budget (None if nothing matches). Weak matches, below
+        MIN_RELATIVE_SCORE of the best one, are left out.
+        """
+        matches = [(document, score) for document, score in self.search(query, None, 'doc')
+                   if self.applies(document['path'], rhel, system)]
+        if not matches:
+            return None
+        ranked = [document for document, score in matches[:limit]
+                  if score >= matches[0][1] * MIN_RELATIVE_SCORE]
+        docs = [PlannedDoc(document['path'], self.tokens(document['path']) or document['tokens'], False)
+                for document in ranked]
+        cumulative = list(accumulate(doc.tokens for doc in docs))
+        count = len(docs) if budget is None else bisect_right(cumulative, budget)
+        return Plan(task=query, description='No curated mapping; docs ranked by BM25', docs=docs[:count],
+                    tokens=cumulative[count - 1] if count else 0,
+                    dropped=[doc.path for doc in docs[count:]])
+
+    def find(self, use_case: Optional[str] = None, tag: Optional[str] = None,
+             rhel: Optional[str] = None, system: Optional[str] = None) -> List[str]:
+        """
+        Return the docs matching every given facet, sorted by path.
+        """
+        candidates: Optional[set] = None
+        for index, value in ((self.by_use_case, use_case), (self.by_tag, tag)):
+            if value is not None:
+                matches = set(index.get(value.lower(), ()))
+                candidates = matches if candidates is None else candidates & matches
+        if candidates is None:
+            candidates = set(self.entries)
+        if rhel is not None:
+            candidates &= self.by_rhel.get(rhel.lower(), _ANY) | self._any_rhel
+        if system is not None:
+            candidates &= self.by_system.get(system.lower(), _ANY) | self._any_system
+        return sorted(candidates)
+
+    def related(self, path: str, min_confidence: float = 0.0) -> List[Dict[str, Any]]:
+        """
+        Return the cross-reference graph edges of a doc above a confidence,
+        strongest first.
+        """
+        edges = [dict(edge, kind=kind) for kind, kind_edges in self.graph.get(path, {}).items()
+                 for edge in kind_edges if edge.get('confidence', 0) >= min_confidence]
+        return sorted(edges, key=lambda edge: -edge['confidence'])
+
+
+def load_doc_index(pack_dir: str) -> Optional[DocIndex]:
+    """
+    Load the .ai-index files of a pack.
+
+    Args:
+        pack_dir: Pack directory
+
+    Returns:
+        DocIndex, or None if the pack has no semantic index
+    """
+    index_dir = Path(pack_dir) / INDEX_DIR
+    if not (index_dir / INDEX_FILE).exists():
+        return None
+    return DocIndex(pack_dir, load_index(index_dir / INDEX_FILE),
+                    load_index(index_dir / TASK_MAPPING_FILE), load_index(index_dir / GRAPH_FILE),
+                    load_bm25_index(pack_dir))
+
+
+def load_doc_indexes(pack_dirs: Iterable[str]) -> List[DocIndex]:
+    """
+    Load the .ai-index files of every pack that has them.
+    """
+    return [index for index in map(load_doc_index, pack_dirs) if index is not None]
+
+
+def print_plan(index: DocIndex, plan: Plan, budget: Optional[int]) -> None:
+    """
+    Print a plan in human-readable form.
+    """
+    print(f"📚 {plan.task} ({index.pack_dir}): {plan.description}")
+    for position, doc in enumerate(plan.docs, 1):
+        marker = '' if doc.required else ' (optional)'
+        section = f"  → {doc.section}" if doc.section else ''
+        print(f"   {position}. {doc.path}{marker}  {doc.tokens:,} tokens{section}")
+    budget_note = f" of {budget:,} budget" if budget is not None else ''
+    print(f"   = {plan.tokens:,} tokens{budget_note}")
+    if plan.over_budget:
+        print(f"   ⚠️  The required docs alone exceed the budget by {plan.tokens - budget:,} tokens")
+    elif plan.dropped and not plan.docs:
+        print(f"   ⚠️  No doc fits the budget; the cheapest needs {index.tokens(plan.dropped[0]):,} tokens")
+    for path in plan.dropped:
+        print(f"   ✂ {path} ({index.tokens(path):,} tokens, over budget)")
+    for path in plan.missing:
+        print(f"   ⚠️  {path} is mapped but does not exist")
+    if plan.prerequisites:
+        print(f"   Prerequisites: {', '.join(plan.prerequisites)}")
+
+
+def parse_args(argv=None):
+    """
+    Parse command line arguments.
+    """
+    parser = argparse.ArgumentParser(description="Query the docs of the packs' .ai-index files.")
+    parser.add_argument('--pack', action='append', dest='packs', metavar='DIR',
+                        help='Pack to query (repeatable; default: every pack with an .ai-index)')
+    query = parser.add_mutually_exclusive_group(required=True)
+    query.add_argument('--task', help='Task from task_mappings (or a use case)')
+    query.add_argument('--use-case', help='List the docs of a use case, cheapest first')
+    query.add_argument('--tag', help='List the docs with a tag')
+    query.add_argument('--related', metavar='DOC', help='List the docs related to a doc (docs-relative path)')
+    query.add_argument('--search', metavar='TEXT', help='Rank docs and skills for a free-text task (BM25)')
+    query.add_argument('--list-tasks', action='store_true', help='List the known tasks')
+    query.add_argument('--read', action='append', metavar='CHUNK',
+                       help='Print a doc section with its subsections, by chunk ID '
+                            '(doc.md#heading-anchor; repeatable)')
+    parser.add_argument('--rhel', help='Only docs for this RHEL version (e.g. rhel9)')
+    parser.add_argument('--system', help='Only docs for this system type (e.g. vm, bare_metal, openshift)')
+    parser.add_argument('--budget', type=int, metavar='TOKENS', help='Token budget for the docs to load')
+    parser.add_argument('--required-only', action='store_true', help='Leave out optional docs')
+    parser.add_argument('--limit', type=int, default=SEARCH_LIMIT,
+                        help=f'Maximum results for --search (default: {SEARCH_LIMIT})')
+    parser.add_argument('--min-confidence', type=float, default=0.0,
+                        help='Minimum edge confidence for --related (default: 0)')
+    parser.add_argument('--json', action='store_true', help='Print machine-readable JSON')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Main entry point.
+    """
+    args = parse_args(argv)
+    indexes = load_doc_indexes(args.packs or discover_packs())
+    results: List[Dict[str, Any]] = []
+
+    for index in indexes:
+        if args.list_tasks:
+            tasks = {task: workflow.description for task, workflow in index.workflows.items()}
+            if tasks:
+                results.append({'pack': index.pack_dir, 'tasks': tasks})
+                if not args.json:
+                    print(f"📚 {index.pack_dir}")
+                    for task, description in tasks.items():
+                        print(f"   • {task}: {description}")
+        elif args.task or args.use_case:
+            plan = (index.plan(args.task, args.rhel, args.system, args.budget, not args.required_only)
+                    if args.task else index.plan_use_case(args.use_case, args.rhel, args.system, args.budget))
+            if plan is not None:
+                results.append({'pack': index.pack_dir, **plan.to_dict()})
+                if not args.json:
+                    print_plan(index, plan, args.budget)
+        elif args.search:
+            matches = index.search(args.search, args.limit)
+            if matches:
+                results.append({'pack': index.pack_dir, 'query': args.search,
+                                'matches': [{'path': document['path'], 'kind': document['kind'],
+                                             'score': round(score, 3), 'tokens': document['tokens']}
+                                            for document, score in matches]})
+                if not args.json:
+                    print(f"📚 {index.pack_dir}")
+                    for document, score in matches:
+                        print(f"   {score:5.2f}  {document['kind']:<5} {document['path']} "
+                              f"({document['tokens']:,} tokens)")
+        elif args.read:
+            chunk_index = load_chunk_index(index.pack_dir)
+            chunk_ids = [chunk_id for chunk_id in args.read
+                         if chunk_index is not None and chunk_id in chunk_index.chunks]
+            if chunk_ids:
+                sections = [section_id for chunk_id in chunk_ids for section_id in chunk_index.section(chunk_id)]
+                chunks = [{'id': chunk['id'], 'tokens': chunk['tokens'], 'text': text}
+                          for chunk, text in chunk_index.read(sections)]
+                results.append({'pack': index.pack_dir, 'chunks': chunks})
+                if not args.json:
+                    print(''.join(chunk['text'] for chunk in chunks), end='')
+        elif args.tag:
+            docs = index.find(tag=args.tag, rhel=args.rhel, system=args.system)
+            if docs:
+                results.append({'pack': index.pack_dir, 'docs': docs})
+                if not args.json:
+                    print(f"📚 {index.pack_dir}: {', '.join(docs)}")
+        else:
+            edges = index.related(args.related, args.min_confidence)
+            if edges:
+                results.append({'pack': index.pack_dir, 'doc': args.related, 'related': edges})
+                if not args.json:
+                    print(f"📚 {args.related} ({index.pack_dir})")
+                    for edge in edges:
+                        print(f"   {edge['confidence']:.2f}  {edge['kind']:<13} {edge['doc']}")
+
+    if args.task and not results:
+        # No pack maps the task or knows it as a use case: rank every pack's docs for it
+        for index in indexes:
+            plan = index.plan_search(args.task, args.rhel, args.system, args.budget)
+            if plan is not None:
+                results.append({'pack': index.pack_dir, **plan.to_dict()})
+                if not args.json:
+                    print_plan(index, plan, args.budget)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    elif not results:
+        print("No matching docs found.")
+    return 0 if results else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
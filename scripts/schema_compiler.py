@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Compile the JSON Schemas in scripts/schemas/ into Python validator functions.
+
+Each schema is translated once into Python source (one function per schema
+node, $refs becoming calls) and compiled to bytecode. The bytecode is stored
+in the build cache, keyed by the schema file, so later runs only unmarshal it
+until the schema changes. A validator returns (location, message) pairs, the
+location being a JSON Pointer into the validated document ('' for the root).
+
+The compiler supports the subset of draft-07 the schemas use: type, enum,
+const, properties, required, additionalProperties, items, minItems,
+minProperties, minLength, pattern, anyOf, if/then/else and local $refs.
+Annotations (title, description, ...) are ignored; any other keyword is an
+error, so a schema never silently checks less than it says.
+"""
+
+import json
+import marshal
+import re
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import build_cache
+
+# Directory holding the <name>.schema.json files
+SCHEMA_DIR = Path(__file__).parent / 'schemas'
+
+# Bump whenever the generated code changes; bytecode also depends on the Python version
+COMPILER_VERSION = 2
+CACHE_NAMESPACE = f'schema{COMPILER_VERSION}-py{sys.version_info[0]}{sys.version_info[1]}'
+
+# Keywords that do not constrain the data
+ANNOTATIONS = {'$schema', '$id', '$comment', 'title', 'description', 'default', 'examples',
+               'definitions', '$defs'}
+
+JSON_TYPES = {
+    'object': ('isinstance(data, dict)', 'an object'),
+    'array': ('isinstance(data, list)', 'an array'),
+    'string': ('isinstance(data, str)', 'a string'),
+    'integer': ('isinstance(data, int) and not isinstance(data, bool)', 'an integer'),
+    'number': ('isinstance(data, (int, float)) and not isinstance(data, bool)', 'a number'),
+    'boolean': ('isinstance(data, bool)', 'a boolean'),
+    'null': ('data is None', 'null'),
+}
+
+Validator = Callable[[Any], List[Tuple[str, str]]]
+
+# Validators loaded in this process, keyed by schema name
+_validators: Dict[str, Validator] = {}
+
+
+def _escape(key: str) -> str:
+    """
+    Escape an object key as a JSON Pointer token.
+    """
+    return key.replace('~', '~0').replace('/', '~1')
+
+
+class _Compiler:
+    """
+    Generates the Python source of a validator for one schema.
+    """
+
+    def __init__(self, schema: Dict[str, Any]):
+        self.root = schema
+        self.lines: List[str] = ['import re', '', '_MISSING = object()', '']
+        self.functions = 0
+        self.patterns = 0
+        self.refs: Dict[str, str] = {}
+
+    def function(self, schema: Any) -> str:
+        """
+        Emit a function validating data against schema; return its name.
+        """
+        if schema is True or schema == {}:
+            return '_accept'
+        name = f'_s{self.functions}'
+        self.functions += 1
+
+        if schema is False:
+            self.lines += [f'def {name}(data, path, errors):',
+                           "    errors.append((path, 'is not allowed'))", '']
+            return name
+        if not isinstance(schema, dict):
+            raise ValueError(f"Schema must be an object or a boolean, got {schema!r}")
+
+        if '$ref' in schema:
+            target = self.ref(schema['$ref'])
+            self.lines += [f'def {name}(data, path, errors):',
+                           f'    {target}(data, path, errors)', '']
+            return name
+
+        unknown = set(schema) - ANNOTATIONS - {
+            'type', 'enum', 'const', 'properties', 'required', 'additionalProperties', 'items',
+            'minItems', 'minProperties', 'minLength', 'pattern', 'anyOf', 'if', 'then', 'else'}
+        if unknown:
+            raise ValueError(f"Unsupported schema keyword(s): {', '.join(sorted(unknown))}")
+
+        # Subschema functions are emitted before this one
+        properties = {key: self.function(sub) for key, sub in schema.get('properties', {}).items()}
+        additional = schema.get('additionalProperties', True)
+        additional_fn = None if isinstance(additional, bool) else self.function(additional)
+        items_fn = self.function(schema['items']) if 'items' in schema else None
+        any_of = [self.function(sub) for sub in schema.get('anyOf', [])]
+        if_fn = self.function(schema['if']) if 'if' in schema else None
+        then_fn = self.function(schema.get('then', True))
+        else_fn = self.function(schema.get('else', True))
+
+        body: List[str] = []
+
+        if 'type' in schema:
+            types = schema['type'] if isinstance(schema['type'], list) else [schema['type']]
+            for json_type in types:
+                if json_type not in JSON_TYPES:
+                    raise ValueError(f"Unknown JSON type {json_type!r}")
+            test = ' or '.join(f'({JSON_TYPES[json_type][0]})' if len(types) > 1 else JSON_TYPES[json_type][0]
+                               for json_type in types)
+            expected = ' or '.join(JSON_TYPES[json_type][1] for json_type in types)
+            body += [f'if not ({test}):',
+                     f'    errors.append((path, {"must be " + expected!r}))',
+                     '    return']
+
+        if 'const' in schema:
+            body += [f'if data != {schema["const"]!r}:',
+                     f'    errors.append((path, {"must be " + repr(schema["const"])!r}))']
+
+        if 'enum' in schema:
+            values = tuple(schema['enum'])
+            allowed = ', '.join(repr(value) for value in values)
+            body += [f'if data not in {values!r}:',
+                     f'    errors.append((path, {"must be one of " + allowed!r}))']
+
+        if 'minLength' in schema or 'pattern' in schema:
+            body.append('if isinstance(data, str):')
+            if 'minLength' in schema:
+                length = schema['minLength']
+                message = 'must not be empty' if length == 1 else f'must be at least {length} characters long'
+                body += [f'    if len(data) < {length}:',
+                         f'        errors.append((path, {message!r}))']
+            if 'pattern' in schema:
+                pattern = f'_p{self.patterns}'
+                self.patterns += 1
+                self.lines += [f'{pattern} = re.compile({schema["pattern"]!r})', '']
+                body += [f'    if not {pattern}.search(data):',
+                         f'        errors.append((path, {"must match " + repr(schema["pattern"])!r}))']
+
+        if 'minItems' in schema or items_fn:
+            body.append('if isinstance(data, list):')
+            if 'minItems' in schema:
+                count = schema['minItems']
+                body += [f'    if len(data) < {count}:',
+                         f'        errors.append((path, {f"must have at least {count} item(s)"!r}))']
+            if items_fn:
+                body += ['    for index, item in enumerate(data):',
+                         f"        {items_fn}(item, f'{{path}}/{{index}}', errors)"]
+
+        if properties or 'required' in schema or 'minProperties' in schema or additional is not True:
+            body.append('if isinstance(data, dict):')
+            for key in schema.get('required', []):
+                body += [f'    if {key!r} not in data:',
+                         f'        errors.append((path, {f"missing required property {key!r}"!r}))']
+            if 'minProperties' in schema:
+                count = schema['minProperties']
+                body += [f'    if len(data) < {count}:',
+                         f'        errors.append((path, {f"must have at least {count} propert(ies)"!r}))']
+            for key, fn in properties.items():
+                if fn == '_accept':
+                    continue
+                body += [f'    value = data.get({key!r}, _MISSING)',
+                         '    if value is not _MISSING:',
+                         f"        {fn}(value, path + {'/' + _escape(key)!r}, errors)"]
+            if additional is not True:
+                body += ['    for key, value in data.items():',
+                         f'        if key in {tuple(properties)!r}:',
+                         '            continue']
+                if additional is False:
+                    body.append("        errors.append((path, f'unexpected property {key!r}'))")
+                else:
+                    body.append("        %s(value, path + '/' + key.replace('~', '~0').replace('/', '~1'), errors)"
+                                % additional_fn)
+            if body[-1] == 'if isinstance(data, dict):':
+                body.append('    pass')
+
+        if any_of:
+            body += ['branches = []',
+                     f'for branch in ({", ".join(any_of)},):',
+                     '    branch_errors = []',
+                     '    branch(data, path, branch_errors)',
+                     '    if not branch_errors:',
+                     '        break',
+                     '    branches.append(branch_errors)',
+                     'else:',
+                     '    # Report the variant that came closest to matching',
+                     '    errors.extend(min(branches, key=len))']
+
+        if if_fn:
+            body += ['probe = []',
+                     f'{if_fn}(data, path, probe)',
+                     f'({then_fn} if not probe else {else_fn})(data, path, errors)']
+
+        self.lines.append(f'def {name}(data, path, errors):')
+        self.lines += ['    ' + line for line in body] or ['    pass']
+        self.lines.append('')
+        return name
+
+    def ref(self, pointer: str) -> str:
+        """
+        Return the function validating a local $ref ('#/definitions/x').
+        """
+        if pointer not in self.refs:
+            if not pointer.startswith('#'):
+                raise ValueError(f"Only local $refs are supported, got {pointer!r}")
+            target = self.root
+            for token in filter(None, pointer[1:].split('/')):
+                target = target[token.replace('~1', '/').replace('~0', '~')]
+            # Reserve the name first so recursive schemas terminate
+            name = f'_r{len(self.refs)}'
+            self.refs[pointer] = name
+            self.lines += [f'def {name}(data, path, errors):',
+                           f'    {self.function(target)}(data, path, errors)', '']
+        return self.refs[pointer]
+
+    def source(self) -> str:
+        """
+        Return the module source; validate(data) is the entry point.
+        """
+        self.lines += ['def _accept(data, path, errors):', '    pass', '']
+        root = self.function(self.root)
+        self.lines += ['def validate(data):',
+                       '    errors = []',
+                       f"    {root}(data, '', errors)",
+                       '    return errors', '']
+        return '\n'.join(self.lines)
+
+
+def compile_schema(schema: Dict[str, Any]) -> str:
+    """
+    Translate a JSON Schema into the Python source of a validator module.
+
+    Args:
+        schema: Parsed JSON Schema
+
+    Returns:
+        Module source defining validate(data) -> [(location, message), ...]
+    """
+    return _Compiler(schema).source()
+
+
+def _compile_file(schema_file: Path) -> Callable[[bytes], bytes]:
+    """
+    Return a build cache parse function turning schema bytes into marshalled bytecode.
+    """
+    def parse(raw: bytes) -> bytes:
+        source = compile_schema(json.loads(raw))
+        return marshal.dumps(compile(source, f'<schema {schema_file.name}>', 'exec'))
+    return parse
+
+
+def get_validator(name: str) -> Validator:
+    """
+    Return the compiled validator of scripts/schemas/<name>.schema.json.
+
+    Args:
+        name: Schema name (plugin, mcp, marketplace)
+
+    Returns:
+        Function returning the (location, message) errors of a document
+    """
+    if name not in _validators:
+        schema_file = SCHEMA_DIR / f'{name}.schema.json'
+        code = build_cache.cached(CACHE_NAMESPACE, schema_file,
+                                  build_cache.read_bytes, _compile_file(schema_file))
+        namespace: Dict[str, Any] = {}
+        exec(marshal.loads(code), namespace)
+        _validators[name] = namespace['validate']
+    return _validators[name]
+
+
+def load_validators() -> None:
+    """
+    Compile (or load from the build cache) every schema, e.g. before
+    starting worker processes so they inherit the cached bytecode.
+    """
+    for schema_file in sorted(SCHEMA_DIR.glob('*.schema.json')):
+        get_validator(schema_file.name[:-len('.schema.json')])
+
+
+def validate(name: str, data: Any) -> List[str]:
+    """
+    Validate a document against a schema.
+
+    Args:
+        name: Schema name (plugin, mcp, marketplace)
+        data: Parsed JSON document
+
+    Returns:
+        Error messages, prefixed with their JSON Pointer location when not at the root
+    """
+    return [f"{location}: {message}" if location else message
+            for location, message in get_validator(name)(data)]
+
+
+if __name__ == '__main__':
+    # Print the generated source of a schema (for debugging the compiler)
+    schema_name = sys.argv[1] if len(sys.argv) > 1 else 'mcp'
+    with open(SCHEMA_DIR / f'{schema_name}.schema.json', 'r', encoding='utf-8') as f:
+        print(compile_schema(json.load(f)))
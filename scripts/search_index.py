@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Build the inverted index behind the site search.
+
+docs/search-index.json maps every token of the searchable fields of packs
+(with their skills and agents) and MCP servers to the entities containing
+it. Terms are sorted, so app.js answers a query with a binary search per
+query token (prefix match) and an intersection of the posting lists, instead
+of rescanning every description on each keystroke.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Set
+
+from generate_mcp_data import expand_mcp_servers
+
+# Bump when the index layout changes
+SEARCH_INDEX_VERSION = 1
+
+# Runs of letters and digits; app.js tokenizes queries with the equivalent
+# /[\p{L}\p{N}]+/gu so both sides agree on term boundaries
+_TOKEN_RE = re.compile(r'[^\W_]+')
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase search terms.
+    """
+    return _TOKEN_RE.findall(text.lower())
+
+
+def pack_entity_id(pack: Dict[str, Any]) -> str:
+    """
+    Return the search entity ID of a pack.
+    """
+    return f"pack:{pack['name']}"
+
+
+def mcp_entity_id(server: Dict[str, Any]) -> str:
+    """
+    Return the search entity ID of an MCP server.
+    """
+    return f"mcp:{server['pack']}/{server['name']}"
+
+
+def pack_search_fields(pack: Dict[str, Any]) -> List[str]:
+    """
+    Return the searchable text of a pack: its name, plugin name and
+    description, and the names and descriptions of its skills and agents.
+    """
+    plugin = pack['plugin']
+    fields = [pack['name'], plugin.get('name', ''), plugin.get('description', '')]
+    for item in pack['skills'] + pack['agents']:
+        fields.append(item.get('name', ''))
+        fields.append(item.get('description', ''))
+    return fields
+
+
+def mcp_search_fields(server: Dict[str, Any]) -> List[str]:
+    """
+    Return the searchable text of an MCP server: name, title, owner, pack,
+    type, env vars, and its URL and header names or its command.
+    """
+    fields = [server['name'], server.get('title', ''), server.get('owner', ''),
+              server['pack'], server['type'], *server.get('env', [])]
+    if server['type'] == 'http':
+        fields.append(server.get('url', ''))
+        fields.extend(server.get('headers', {}))
+    else:
+        fields.append(server.get('command', ''))
+    return fields
+
+
+def _terms(fields: Iterable[Any]) -> Set[str]:
+    """
+    Return the distinct terms of a list of fields (non-strings are skipped).
+    """
+    terms = set()
+    for value in fields:
+        if isinstance(value, str):
+            terms.update(tokenize(value))
+    return terms
+
+
+def build_search_index(output: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the search index from the full data.json contents.
+
+    Args:
+        output: Full data.json contents
+
+    Returns:
+        Dictionary with the entity IDs, the sorted terms and, for each term,
+        the sorted positions in the entity list of the entities containing it
+    """
+    entities = []
+    postings: Dict[str, List[int]] = {}
+
+    documents = ([(pack_entity_id(pack), pack_search_fields(pack)) for pack in output['packs']]
+                 + [(mcp_entity_id(server), mcp_search_fields(server))
+                    for server in expand_mcp_servers(output)])
+
+    for position, (entity_id, fields) in enumerate(documents):
+        entities.append(entity_id)
+        for term in _terms(fields):
+            postings.setdefault(term, []).append(position)
+
+    terms = sorted(postings)
+    return {
+        'version': SEARCH_INDEX_VERSION,
+        'entities': entities,
+        'terms': terms,
+        'postings': [postings[term] for term in terms],
+    }
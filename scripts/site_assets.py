@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Write website files, optionally as minified, content-hashed and
+precompressed assets.
+
+In the default (development) mode files are written in place under docs/ as
+readable JSON. With optimize=True every asset is also emitted under
+docs/assets/ with a content hash in its name and .gz / .br siblings, and a
+manifest maps logical names (app.js, index.json, ...) to the hashed files.
+The manifest is written to docs/manifest.json. The site is then copied to a
+deploy directory, whose index.html has the manifest inlined (app.js picks it
+up) and points at the hashed files, so hashed assets can be served with
+immutable cache headers. The tracked docs/index.html is never rewritten.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Hashed assets directory, relative to the docs directory
+ASSETS_DIR = 'assets'
+
+# Number of hex digits of the content hash kept in file names
+HASH_LENGTH = 12
+
+# Static files referenced by index.html that get hashed copies
+STATIC_ASSETS = ['styles.css', 'app.js']
+
+# Smaller files are not worth compressing
+MIN_COMPRESS_BYTES = 256
+
+_MANIFEST_BLOCK_RE = re.compile(
+    r'[ \t]*<!-- asset-manifest -->.*?<!-- /asset-manifest -->\n?', re.DOTALL)
+
+
+def atomic_write_bytes(path: Path, content: bytes) -> None:
+    """
+    Write a file through a temporary sibling and a rename, so readers (like
+    a server running next to `build_website.py --watch`) never see it
+    half-written.
+    """
+    tmp_path = path.with_name(f'.{path.name}.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def content_hash(content: bytes) -> str:
+    """
+    Return the short content hash used in asset file names.
+    """
+    return hashlib.sha256(content).hexdigest()[:HASH_LENGTH]
+
+
+def hashed_name(name: str, content: bytes) -> str:
+    """
+    Insert the content hash before the extension (app.js -> app.<hash>.js).
+    """
+    path = Path(name)
+    return str(path.with_name(f'{path.stem}.{content_hash(content)}{path.suffix}'))
+
+
+def precompress(path: Path) -> List[Path]:
+    """
+    Write .gz (and .br when brotli is installed) siblings of a file.
+
+    Output is reproducible: gzip headers carry no timestamp.
+
+    Returns:
+        Paths of the compressed files written
+    """
+    content = path.read_bytes()
+    if len(content) < MIN_COMPRESS_BYTES:
+        return []
+
+    written = []
+
+    gz_path = path.with_name(path.name + '.gz')
+    atomic_write_bytes(gz_path, gzip.compress(content, compresslevel=9, mtime=0))
+    written.append(gz_path)
+
+    if brotli is not None:
+        br_path = path.with_name(path.name + '.br')
+        atomic_write_bytes(br_path, brotli.compress(content, quality=11))
+        written.append(br_path)
+
+    return written
+
+
+class SiteWriter:
+    """
+    Writes generated site files and tracks the asset manifest.
+    """
+
+    def __init__(self, docs_dir: Path, optimize: bool = False, deploy_dir: Optional[Path] = None):
+        self.docs_dir = Path(docs_dir)
+        self.optimize = optimize
+        self.deploy_dir = Path(deploy_dir) if deploy_dir else None
+        self.manifest: Dict[str, str] = {}
+        self.written: List[Path] = []
+
+        # Hashed assets of a previous optimized build are never reused
+        assets_dir = self.docs_dir / ASSETS_DIR
+        if assets_dir.exists():
+            shutil.rmtree(assets_dir)
+
+    def _write(self, path: Path, content: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(path, content)
+        self.written.append(path)
+
+        if not self.optimize:
+            # Drop compressed siblings an optimized build left behind, so a
+            # server negotiating encodings never serves stale content
+            for suffix in ('.gz', '.br'):
+                path.with_name(path.name + suffix).unlink(missing_ok=True)
+
+    def _emit_asset(self, name: str, content: bytes) -> str:
+        """
+        Write the hashed, precompressed copy of an asset and return its URL.
+        """
+        url = f'{ASSETS_DIR}/{hashed_name(name, content)}'
+        path = self.docs_dir / url
+        self._write(path, content)
+        self.written.extend(precompress(path))
+        return url
+
+    def write_bytes(self, name: str, content: bytes, plain_copy: bool = True,
+                    in_manifest: bool = False) -> str:
+        """
+        Write a generated file.
+
+        Args:
+            name: Path relative to the docs directory (the logical name)
+            content: File contents
+            plain_copy: Also write docs/<name> in optimize mode (for tooling
+                        that reads the file by its plain name)
+            in_manifest: Record the file in the asset manifest
+
+        Returns:
+            URL of the file relative to the docs directory
+        """
+        if not self.optimize:
+            self._write(self.docs_dir / name, content)
+            return name
+
+        if plain_copy:
+            path = self.docs_dir / name
+            self._write(path, content)
+            self.written.extend(precompress(path))
+
+        url = self._emit_asset(name, content)
+        if in_manifest:
+            self.manifest[name] = url
+        return url
+
+    def write_json(self, name: str, data: Any, plain_copy: bool = True,
+                   in_manifest: bool = False) -> str:
+        """
+        Write a generated JSON file (indented in development, minified when optimizing).
+
+        Returns:
+            URL of the file relative to the docs directory
+        """
+        if self.optimize:
+            text = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        else:
+            text = json.dumps(data, indent=2, ensure_ascii=False)
+        return self.write_bytes(name, text.encode('utf-8'), plain_copy, in_manifest)
+
+    def finish(self) -> Optional[Path]:
+        """
+        Hash the static assets and write manifest.json, then copy the site
+        to the deploy directory with its index.html pointed at the hashed
+        files. Outside optimize mode a stale manifest.json is removed.
+
+        Returns:
+            Path of the manifest, if one was written
+        """
+        manifest_file = self.docs_dir / 'manifest.json'
+        if not self.optimize:
+            manifest_file.unlink(missing_ok=True)
+            return None
+
+        for name in STATIC_ASSETS:
+            source = self.docs_dir / name
+            if source.exists():
+                self.manifest[name] = self._emit_asset(name, source.read_bytes())
+
+        self._write(manifest_file, json.dumps(self.manifest, indent=2, sort_keys=True).encode('utf-8'))
+
+        if self.deploy_dir:
+            self._assemble_deploy_dir()
+
+        return manifest_file
+
+    def _assemble_deploy_dir(self) -> None:
+        """
+        Replace the deploy directory with a copy of the docs directory whose
+        index.html loads the hashed assets.
+        """
+        if self.deploy_dir.exists():
+            shutil.rmtree(self.deploy_dir)
+        shutil.copytree(self.docs_dir, self.deploy_dir,
+                        ignore=shutil.ignore_patterns('.*.tmp'))
+
+        index_html = self.deploy_dir / 'index.html'
+        if index_html.exists():
+            html = rewrite_index_html(index_html.read_text(encoding='utf-8'), self.manifest)
+            atomic_write_bytes(index_html, html.encode('utf-8'))
+
+
+def _asset_url_re(name: str) -> 're.Pattern[str]':
+    """
+    Match a quoted URL of a static asset, plain or hashed ("app.js?v=2",
+    "assets/app.<hash>.js?v=2"); group 2 is the query string.
+    """
+    path = Path(name)
+    prefix = rf'(?:{ASSETS_DIR}/)?{re.escape(path.stem)}(?:\.[0-9a-f]{{{HASH_LENGTH}}})?'
+    return re.compile(rf'''(["']){prefix}{re.escape(path.suffix)}(\?[^"']*)?\1''')
+
+
+def rewrite_index_html(html: str, manifest: Dict[str, str]) -> str:
+    """
+    Point the stylesheet and script tags of index.html at hashed assets and
+    inline the manifest for app.js. Query strings (?v=...) are kept.
+
+    Works on both the source index.html and one rewritten by an earlier build.
+    """
+    for name in STATIC_ASSETS:
+        if name not in manifest:
+            continue
+        html = _asset_url_re(name).sub(
+            lambda m: f'{m.group(1)}{manifest[name]}{m.group(2) or ""}{m.group(1)}', html)
+
+    block = ('    <!-- asset-manifest -->'
+             f'<script>window.ASSET_MANIFEST = {json.dumps(manifest, sort_keys=True)};</script>'
+             '<!-- /asset-manifest -->\n')
+    html = _MANIFEST_BLOCK_RE.sub('', html)
+    return html.replace('</head>', f'{block}</head>', 1)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Split the website data into a small index plus per-pack and per-MCP-server
+detail shards.
+
+docs/index.json holds just what the card grids need (names, versions, counts);
+the site fetches a shard from docs/shards/ only when its details are opened.
+An MCP server shipped by several packs has a single shard; its card in each
+pack carries that pack's overlay (differing env, security, ...), which the
+site applies on top of the shard.
+"""
+
+import re
+from typing import Any, Dict, List, Optional
+
+from generate_mcp_data import pack_server_refs
+from site_assets import SiteWriter
+
+# Shard directory, relative to the docs directory
+SHARDS_DIR = 'shards'
+
+_UNSAFE_CHARS_RE = re.compile(r'[^A-Za-z0-9._-]')
+
+
+def _safe_name(name: str) -> str:
+    """
+    Turn a pack or server name into a safe file name component.
+    """
+    return _UNSAFE_CHARS_RE.sub('_', name)
+
+
+def pack_shard_path(pack: Dict[str, Any]) -> str:
+    """
+    Return the shard URL of a pack, relative to the docs directory.
+    """
+    return f"{SHARDS_DIR}/packs/{_safe_name(pack['name'])}.json"
+
+
+def mcp_shard_path(server: Dict[str, Any]) -> str:
+    """
+    Return the shard URL of a (deduplicated) MCP server, relative to the docs directory.
+    """
+    return f"{SHARDS_DIR}/mcp/{_safe_name(server['id'])}.json"
+
+
+def summarize_pack(pack: Dict[str, Any], shard: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Return the fields of a pack needed to render its card.
+
+    Args:
+        pack: Full pack record
+        shard: URL of the pack's shard (defaults to pack_shard_path())
+    """
+    plugin = pack['plugin']
+    return {
+        'name': pack['name'],
+        'path': pack['path'],
+        'icon': pack.get('icon', ''),
+        'plugin': {
+            'name': plugin.get('name', pack['name']),
+            'version': plugin.get('version', '0.0.0'),
+            'description': plugin.get('description', ''),
+        },
+        'has_readme': pack['has_readme'],
+        'skill_count': len(pack['skills']),
+        'agent_count': len(pack['agents']),
+        'source_count': sum(len(doc.get('sources', [])) for doc in pack['docs']),
+        'shard': shard or pack_shard_path(pack),
+    }
+
+
+def summarize_mcp_server(server: Dict[str, Any], shard: Optional[str] = None,
+                         overlay: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Return the fields of an MCP server needed to render and search its card.
+
+    Args:
+        server: MCP server record of one pack (shared record plus overlay)
+        shard: URL of the server's shard (defaults to mcp_shard_path())
+        overlay: Fields of this pack's record that differ from the shard
+    """
+    return {
+        'name': server['name'],
+        'pack': server['pack'],
+        'type': server['type'],
+        'title': server.get('title', server['name']),
+        'owner': server.get('owner', ''),
+        'tier': server.get('tier', ''),
+        'icon': server.get('icon', ''),
+        'command': server.get('command', ''),
+        'url': server.get('url', ''),
+        'headers': server.get('headers', {}),
+        'env': server.get('env', []),
+        'tool_count': len(server.get('tools', [])),
+        'shard': shard or mcp_shard_path(server),
+        'overlay': overlay or {},
+    }
+
+
+def build_index(output: Dict[str, Any], pack_shards: Optional[List[str]] = None,
+                mcp_shards: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """
+    Build the index.json summary from the full data.json contents.
+
+    Servers get one summary per pack that ships them.
+
+    Args:
+        output: Full data.json contents
+        pack_shards: Shard URLs, one per pack (defaults to the plain paths)
+        mcp_shards: Shard URLs by server ID (defaults to the plain paths)
+    """
+    pack_shards = pack_shards or [None] * len(output['packs'])
+    mcp_shards = mcp_shards or {}
+
+    mcp_summaries = []
+    for pack_name, ref, server in pack_server_refs(output):
+        overlay = {k: v for k, v in ref.items() if k != 'id'}
+        record = {**server, **overlay, 'pack': pack_name}
+        mcp_summaries.append(summarize_mcp_server(record, mcp_shards.get(server['id']), overlay))
+
+    return {
+        'repository': output['repository'],
+        'packs': [summarize_pack(pack, shard) for pack, shard in zip(output['packs'], pack_shards)],
+        'mcp_servers': mcp_summaries,
+        'generated_at': output['generated_at'],
+        'content_hash': output['content_hash'],
+    }
+
+
+def write_sharded(output: Dict[str, Any], writer: SiteWriter) -> int:
+    """
+    Write index.json and the detail shards for the full website data.
+
+    Shards are replaced in place and those left over from packs or servers
+    that no longer exist are removed afterwards, so every shard index.json
+    points at stays readable while a rebuild is running.
+
+    Args:
+        output: Full data.json contents
+        writer: Site writer (decides on plain or hashed file names)
+
+    Returns:
+        Number of shards written
+    """
+    # Shards are only ever fetched through index.json, so no plain copies
+    pack_shards = [writer.write_json(pack_shard_path(pack), pack, plain_copy=False)
+                   for pack in output['packs']]
+    mcp_shards = {server['id']: writer.write_json(mcp_shard_path(server), server, plain_copy=False)
+                  for server in output['mcp_servers']}
+
+    writer.write_json('index.json', build_index(output, pack_shards, mcp_shards), in_manifest=True)
+
+    _remove_stale_shards(writer)
+
+    return len(pack_shards) + len(mcp_shards)
+
+
+def _remove_stale_shards(writer: SiteWriter) -> None:
+    """
+    Delete files under docs/shards/ that the writer did not just write.
+    """
+    shards_dir = writer.docs_dir / SHARDS_DIR
+    if not shards_dir.exists():
+        return
+
+    written = set(writer.written)
+    for path in sorted(shards_dir.rglob('*'), reverse=True):
+        if path.is_dir():
+            if not any(path.iterdir()):
+                path.rmdir()
+        elif path not in written:
+            path.unlink()
+
+    if not any(shards_dir.iterdir()):
+        shards_dir.rmdir()
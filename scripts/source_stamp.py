@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Make the generated site data reproducible.
+
+content_hash() hashes a canonical serialization of the data (sorted keys,
+no whitespace), so equal data always gets the same hash regardless of how it
+is laid out on disk. source_timestamp() dates a build by its sources rather
+than the wall clock: the last commit touching them when they are committed,
+otherwise the newest file modification time. Building the same sources twice
+therefore yields byte-identical files.
+"""
+
+import hashlib
+import json
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+import file_watch
+
+# Number of hex digits of the content hash embedded in data.json
+CONTENT_HASH_LENGTH = 16
+
+
+def canonical_json(data: Any) -> bytes:
+    """
+    Serialize data canonically (sorted keys, compact separators, UTF-8).
+    """
+    return json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def content_hash(data: Any) -> str:
+    """
+    Return the hash of the canonical serialization of data.
+    """
+    return hashlib.sha256(canonical_json(data)).hexdigest()[:CONTENT_HASH_LENGTH]
+
+
+def _git(*args: str) -> Optional[str]:
+    """
+    Run a git command and return its output, or None if git is unavailable or fails.
+    """
+    try:
+        result = subprocess.run(['git', *args], capture_output=True, text=True, check=False)
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout
+
+
+def _git_timestamp(paths: Iterable[str]) -> Optional[int]:
+    """
+    Return the commit time of the last commit touching paths, or None when
+    git is unavailable or any of them has uncommitted changes.
+    """
+    paths = list(paths)
+    status = _git('status', '--porcelain', '--', *paths)
+    if status is None or status.strip():
+        return None
+    timestamp = _git('log', '-1', '--format=%ct', '--', *paths)
+    if not timestamp or not timestamp.strip():
+        return None
+    return int(timestamp.strip())
+
+
+def _mtime_timestamp(directories: Iterable[str], files: Iterable[str]) -> Optional[int]:
+    """
+    Return the newest modification time of the watched source files.
+    """
+    snapshot = file_watch.snapshot(directories, files)
+    if not snapshot:
+        return None
+    return max(mtime_ns for mtime_ns, _ in snapshot.values()) // 1_000_000_000
+
+
+def source_timestamp(pack_dirs: Iterable[str], files: Iterable[Path] = ()) -> str:
+    """
+    Return the time of the latest change to the sources of the site data.
+
+    Args:
+        pack_dirs: Pack directories
+        files: Other source files (docs/mcp.json, docs/icons.json)
+
+    Returns:
+        ISO 8601 UTC timestamp (the current time if no source exists)
+    """
+    pack_dirs = list(pack_dirs)
+    files = [str(path) for path in files]
+
+    timestamp = _git_timestamp(pack_dirs + files)
+    if timestamp is None:
+        timestamp = _mtime_timestamp(pack_dirs, files)
+    if timestamp is None:
+        return datetime.now(timezone.utc).replace(microsecond=0).isoformat()
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+def stored_content_hash(data_file: Path) -> Optional[str]:
+    """
+    Return the content hash embedded in an existing data.json, if any.
+    """
+    try:
+        with open(data_file, 'r', encoding='utf-8') as f:
+            return json.load(f).get('content_hash')
+    except (OSError, ValueError, AttributeError):
+        return None
@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+Render and check the templates packs ship under templates/ (OpenShift
+manifests, the Helm chart, systemd units).
+
+Agents fill the ${VARIABLE} placeholders of these files at deploy time;
+everything else, Helm's {{ ... }} actions included, is copied as is. Each
+template is compiled once into a Python function that joins its literal
+parts and values, and the bytecode is stored in the build cache, keyed by
+the template file, so later runs only unmarshal it until the template
+changes.
+
+check_templates() renders every template of a pack with each sample value
+set and checks the output according to what it is:
+
+    YAML (no {{ actions)   every document loads with the C YAML loader and
+                           is a mapping; manifests have apiVersion, kind
+                           and metadata.name
+    Go templates ({{ }})   actions are balanced (if/with/range/define/block
+                           closed by end, else inside a block) and every
+                           include/template names a define of the chart
+    systemd units          [Section] headers and Key=Value lines, with an
+                           ExecStart= in [Service]
+
+The 'templates' validation rule (validation_rules.py) runs it for every
+pack, so a broken template fails make validate rather than a deployment.
+
+Usage:
+    python scripts/template_renderer.py [packs...] [--values FILE] [--output DIR]
+"""
+
+import argparse
+import json
+import marshal
+import posixpath
+import re
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import yaml
+
+import build_cache
+from frontmatter_yaml import SafeLoader
+from pack_discovery import discover_packs
+from site_assets import atomic_write_bytes
+
+TEMPLATE_DIR = 'templates'
+TEMPLATE_SUFFIX = '.template'
+
+# Bump whenever the generated code changes; bytecode also depends on the Python version
+COMPILER_VERSION = 1
+CACHE_NAMESPACE = f'template{COMPILER_VERSION}-py{sys.version_info[0]}{sys.version_info[1]}'
+
+# Values every template is rendered with; together they cover each variable
+# of the shipped templates with the kinds of values agents fill in
+SAMPLE_VALUES: Dict[str, Dict[str, str]] = {
+    'nodejs': {
+        'APP_NAME': 'orders-api',
+        'APP_DESCRIPTION': 'Order management REST API',
+        'APP_VERSION': '1.4.2',
+        'APP_PATH': '/opt/orders-api',
+        'BUILDER_IMAGE': 'registry.access.redhat.com/ubi9/nodejs-20:latest',
+        'CONTAINER_PORT': '8080',
+        'FRAMEWORK': 'express',
+        'GIT_BRANCH': 'main',
+        'GIT_URL': 'https://github.com/example/orders-api.git',
+        'IMAGE': 'quay.io/example/orders-api:1.4.2',
+        'IMAGE_REPOSITORY': 'quay.io/example/orders-api',
+        'IMAGE_TAG': '1.4.2',
+        'LANGUAGE': 'nodejs',
+        'MAINTAINER_EMAIL': 'platform@example.com',
+        'MAINTAINER_NAME': 'Platform Team',
+        'NAMESPACE': 'shop-dev',
+        'PORT': '8080',
+        'REPLICAS': '2',
+        'SERVICE_USER': 'orders',
+        'START_COMMAND': '/usr/bin/node /opt/orders-api/server.js',
+    },
+    'python': {
+        'APP_NAME': 'inventory',
+        'APP_DESCRIPTION': 'Inventory service',
+        'APP_VERSION': '2024.10',
+        'APP_PATH': '/opt/inventory',
+        'BUILDER_IMAGE': 'registry.access.redhat.com/ubi9/python-311',
+        'CONTAINER_PORT': '5000',
+        'FRAMEWORK': 'flask',
+        'GIT_BRANCH': 'release/2024.10',
+        'GIT_URL': 'git@github.com:example/inventory.git',
+        'IMAGE': 'image-registry.openshift-image-registry.svc:5000/warehouse/inventory:latest',
+        'IMAGE_REPOSITORY': 'image-registry.openshift-image-registry.svc:5000/warehouse/inventory',
+        'IMAGE_TAG': 'latest',
+        'LANGUAGE': 'python',
+        'MAINTAINER_EMAIL': 'warehouse-team@example.com',
+        'MAINTAINER_NAME': 'Warehouse',
+        'NAMESPACE': 'warehouse',
+        'PORT': '5000',
+        'REPLICAS': '1',
+        'SERVICE_USER': 'inventory',
+        'START_COMMAND': '/usr/bin/python3 /opt/inventory/app.py',
+    },
+    'java': {
+        'APP_NAME': 'billing-service-v2',
+        'APP_DESCRIPTION': 'Billing and invoicing',
+        'APP_VERSION': '3.0.0-SNAPSHOT',
+        'APP_PATH': '/opt/billing-service-v2',
+        'BUILDER_IMAGE': 'registry.access.redhat.com/ubi9/openjdk-21:1.20',
+        'CONTAINER_PORT': '8443',
+        'FRAMEWORK': 'quarkus',
+        'GIT_BRANCH': 'v3',
+        'GIT_URL': 'https://gitlab.example.com/finance/billing-service.git',
+        'IMAGE': 'quay.io/example/billing-service-v2@sha256:' + '0' * 64,
+        'IMAGE_REPOSITORY': 'quay.io/example/billing-service-v2',
+        'IMAGE_TAG': '3.0.0',
+        'LANGUAGE': 'java',
+        'MAINTAINER_EMAIL': 'billing@example.com',
+        'MAINTAINER_NAME': 'Billing Team',
+        'NAMESPACE': 'finance-prod',
+        'PORT': '8443',
+        'REPLICAS': '3',
+        'SERVICE_USER': 'billing',
+        'START_COMMAND': '/usr/bin/java -jar /opt/billing-service-v2/app.jar',
+    },
+}
+
+_VARIABLE_RE = re.compile(r'\$\{([A-Za-z_][A-Za-z0-9_]*)\}')
+_ACTION_RE = re.compile(r'\{\{-?\s*(.*?)\s*-?\}\}', re.DOTALL)
+_NAMED_RE = re.compile(r'(define|include|template|block)\s+"([^"]+)"')
+_SECTION_RE = re.compile(r'\[[A-Za-z][A-Za-z0-9 -]*\]')
+_ASSIGNMENT_RE = re.compile(r'[A-Za-z][A-Za-z0-9]*=')
+
+# Go template actions opening a block closed by {{ end }}
+_BLOCK_ACTIONS = ('if', 'with', 'range', 'define', 'block')
+
+
+@dataclass(frozen=True)
+class Template:
+    """
+    A compiled template.
+    """
+    path: str
+    variables: Tuple[str, ...]
+    render: Callable[[Dict[str, str]], str]
+
+
+def compile_template(text: str) -> str:
+    """
+    Translate a template into the Python source of a render module.
+
+    Args:
+        text: Template text
+
+    Returns:
+        Module source defining VARIABLES (the variable names, in order of
+        first use) and render(values) -> str
+    """
+    parts: List[str] = []
+    variables: List[str] = []
+    position = 0
+    for match in _VARIABLE_RE.finditer(text):
+        name = match.group(1)
+        if name not in variables:
+            variables.append(name)
+        parts += [repr(text[position:match.start()]), f'v{variables.index(name)}']
+        position = match.end()
+    parts.append(repr(text[position:]))
+
+    lines = [f'VARIABLES = {tuple(variables)!r}', '', 'def render(values):']
+    lines += [f'    v{number} = values[{name!r}]' for number, name in enumerate(variables)]
+    joined = ', '.join(part for part in parts if part != repr(''))
+    lines += [f"    return ''.join(({joined},))" if joined else "    return ''", '']
+    return '\n'.join(lines)
+
+
+def _compile_file(template_file: Path) -> Callable[[bytes], bytes]:
+    """
+    Return a build cache parse function turning template bytes into marshalled bytecode.
+    """
+    def parse(raw: bytes) -> bytes:
+        source = compile_template(raw.decode('utf-8'))
+        return marshal.dumps(compile(source, f'<template {template_file.name}>', 'exec'))
+    return parse
+
+
+# Templates loaded in this process, keyed by path
+_templates: Dict[str, Template] = {}
+
+
+def get_template(template_file: Path) -> Template:
+    """
+    Return a compiled template, compiling it on first use.
+
+    Args:
+        template_file: Template file
+
+    Returns:
+        Template whose render(values) needs a value for each of its variables
+        (OSError and UnicodeDecodeError propagate)
+    """
+    key = Path(template_file).as_posix()
+    template = _templates.get(key)
+    if template is None:
+        code = build_cache.cached(CACHE_NAMESPACE, Path(template_file),
+                                  build_cache.read_bytes, _compile_file(Path(template_file)))
+        namespace: Dict[str, Any] = {}
+        exec(marshal.loads(code), namespace)
+        template = Template(key, namespace['VARIABLES'], namespace['render'])
+        _templates[key] = template
+    return template
+
+
+def render_template(template: Template, values: Dict[str, str]) -> str:
+    """
+    Render a compiled template.
+
+    Raises:
+        KeyError: If values has no value for one of the template's variables
+                  (the exception names every missing variable)
+    """
+    missing = [name for name in template.variables if name not in values]
+    if missing:
+        raise KeyError(', '.join(f'${{{name}}}' for name in missing))
+    return template.render(values)
+
+
+def find_templates(pack_dir: str) -> List[Path]:
+    """
+    Return the files under the pack's templates/ directory, sorted.
+    """
+    template_dir = Path(pack_dir) / TEMPLATE_DIR
+    if not template_dir.is_dir():
+        return []
+    return sorted(path for path in template_dir.rglob('*') if path.is_file())
+
+
+def output_name(template_file: Path) -> str:
+    """
+    Return the name a rendered template is written as ('route.yaml.template'
+    -> 'route.yaml').
+    """
+    name = Path(template_file).name
+    return name[:-len(TEMPLATE_SUFFIX)] if name.endswith(TEMPLATE_SUFFIX) else name
+
+
+def check_yaml(text: str) -> Iterator[str]:
+    """
+    Yield the problems of rendered multi-document YAML.
+    """
+    try:
+        documents = [document for document in yaml.load_all(text, Loader=SafeLoader)
+                     if document is not None]
+    except yaml.YAMLError as e:
+        yield f"Invalid YAML: {' '.join(str(e).split())}"
+        return
+
+    for number, document in enumerate(documents, 1):
+        where = f"document {number}" if len(documents) > 1 else "document"
+        if not isinstance(document, dict):
+            yield f"YAML {where} is a {type(document).__name__}, not a mapping"
+        elif 'kind' in document:
+            metadata = document.get('metadata')
+            if not document.get('apiVersion'):
+                yield f"{document['kind']} {where} has no apiVersion"
+            if not isinstance(metadata, dict) or not metadata.get('name'):
+                yield f"{document['kind']} {where} has no metadata.name"
+
+
+def go_template_names(text: str) -> Tuple[List[str], List[str]]:
+    """
+    Return the names a Go template defines and the names it includes.
+    """
+    defines, includes = [], []
+    for match in _ACTION_RE.finditer(text):
+        for named in _NAMED_RE.finditer(match.group(1)):
+            (defines if named.group(1) in ('define', 'block') else includes).append(named.group(2))
+    return defines, includes
+
+
+def check_go_template(text: str) -> Iterator[str]:
+    """
+    Yield the problems of the action structure of a rendered Go template.
+    """
+    if text.count('{{') != len(_ACTION_RE.findall(text)):
+        yield "Unterminated {{ action"
+
+    stack: List[Tuple[str, int]] = []
+    for match in _ACTION_RE.finditer(text):
+        action = match.group(1)
+        if action.startswith('/*'):
+            continue
+        keyword = action.split(None, 1)[0] if action.split() else ''
+        line = text.count('\n', 0, match.start()) + 1
+        if keyword in _BLOCK_ACTIONS:
+            stack.append((keyword, line))
+        elif keyword == 'else':
+            if not stack or stack[-1][0] not in ('if', 'with', 'range'):
+                yield f"Line {line}: {{{{ else }}}} outside an if, with or range block"
+        elif keyword == 'end':
+            if not stack:
+                yield f"Line {line}: {{{{ end }}}} without an open block"
+            else:
+                stack.pop()
+    for keyword, line in stack:
+        yield f"Line {line}: {{{{ {keyword} }}}} is never closed by {{{{ end }}}}"
+
+
+def check_systemd_unit(text: str) -> Iterator[str]:
+    """
+    Yield the problems of a rendered systemd unit file.
+    """
+    section = None
+    sections = set()
+    continued = False
+    exec_start = False
+    for number, line in enumerate(text.splitlines(), 1):
+        stripped = line.strip()
+        if continued:
+            continued = stripped.endswith('\\')
+            continue
+        if not stripped or stripped.startswith(('#', ';')):
+            continue
+        if _SECTION_RE.fullmatch(stripped):
+            section = stripped[1:-1]
+            sections.add(section)
+        elif _ASSIGNMENT_RE.match(stripped):
+            if section is None:
+                yield f"Line {number}: {stripped.split('=', 1)[0]}= before any [Section]"
+            exec_start = exec_start or (section == 'Service' and stripped.startswith('ExecStart='))
+            continued = stripped.endswith('\\')
+        else:
+            yield f"Line {number}: expected [Section] or Key=Value, got {stripped!r}"
+    if 'Service' in sections and not exec_start:
+        yield "[Service] has no ExecStart="
+    for required in ('Unit', 'Service'):
+        if required not in sections:
+            yield f"Missing [{required}] section"
+
+
+def check_rendered(name: str, text: str) -> Iterator[str]:
+    """
+    Yield the problems of a rendered template, by file type.
+
+    Args:
+        name: Output file name ('route.yaml', 'app.service', 'NOTES.txt')
+        text: Rendered text
+    """
+    if '{{' in text:
+        yield from check_go_template(text)
+    elif name.endswith(('.yaml', '.yml')):
+        yield from check_yaml(text)
+    elif name.endswith('.service'):
+        yield from check_systemd_unit(text)
+
+
+def check_templates(pack_dir: str, samples: Optional[Dict[str, Dict[str, str]]] = None,
+                    output_dir: Optional[Path] = None) -> Iterator[Tuple[str, str]]:
+    """
+    Render every template of a pack with each sample value set and check
+    the output.
+
+    Args:
+        pack_dir: Pack directory
+        samples: Value sets by name (default: SAMPLE_VALUES)
+        output_dir: Also write the output to <output_dir>/<sample>/<pack-relative path>
+
+    Yields:
+        (template path, problem) pairs; the problem names the sample set
+        when it depends on the values
+    """
+    if samples is None:
+        samples = SAMPLE_VALUES
+
+    # include/define names are checked per directory (a Helm chart's templates/)
+    defines: Dict[str, Dict[str, set]] = {}
+    includes: Dict[str, List[Tuple[str, str, str]]] = {}
+
+    for template_file in find_templates(pack_dir):
+        path = template_file.as_posix()
+        try:
+            template = get_template(template_file)
+        except (OSError, UnicodeDecodeError) as e:
+            yield path, f"Cannot read template: {e}"
+            continue
+
+        directory = posixpath.dirname(path)
+        name = output_name(template_file)
+        for sample, values in samples.items():
+            try:
+                text = render_template(template, values)
+            except KeyError as e:
+                yield path, f"[{sample}] No value for {e.args[0]}"
+                continue
+
+            for problem in check_rendered(name, text):
+                yield path, f"[{sample}] {problem}"
+            if '{{' in text:
+                defined, included = go_template_names(text)
+                defines.setdefault(directory, {}).setdefault(sample, set()).update(defined)
+                includes.setdefault(directory, []).extend((path, sample, target) for target in included)
+
+            if output_dir is not None:
+                relative = template_file.relative_to(pack_dir).parent / name
+                destination = output_dir / sample / Path(pack_dir).name / relative
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                atomic_write_bytes(destination, text.encode('utf-8'))
+
+    for directory, entries in includes.items():
+        for path, sample, target in entries:
+            if target not in defines[directory].get(sample, ()):
+                yield path, f"[{sample}] include \"{target}\" has no define in {directory}/"
+
+
+def load_samples(values_file: Path) -> Dict[str, Dict[str, str]]:
+    """
+    Load value sets from a JSON file: one object of values, or an object of
+    named value sets.
+    """
+    with open(values_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or not data:
+        raise ValueError(f"{values_file}: expected a JSON object")
+    if all(isinstance(value, dict) for value in data.values()):
+        return {name: {key: str(value) for key, value in values.items()} for name, values in data.items()}
+    return {Path(values_file).stem: {key: str(value) for key, value in data.items()}}
+
+
+def parse_args(argv=None):
+    """
+    Parse command line arguments.
+    """
+    parser = argparse.ArgumentParser(description="Render the packs' templates with sample values and check the output.")
+    parser.add_argument('packs', nargs='*',
+                        help='Pack directories (default: every discovered pack)')
+    parser.add_argument('--values', type=Path, metavar='FILE',
+                        help='JSON value set(s) to render with instead of the built-in samples')
+    parser.add_argument('--output', type=Path, metavar='DIR',
+                        help='Write the rendered files to DIR/<sample>/<pack>/...')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Do not read or write the build cache')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Main entry point.
+    """
+    args = parse_args(argv)
+    cache = build_cache.configure(enabled=not args.no_cache)
+    samples = load_samples(args.values) if args.values else SAMPLE_VALUES
+
+    failed = False
+    for pack_dir in args.packs or discover_packs():
+        templates = find_templates(pack_dir)
+        if not templates:
+            continue
+        problems = list(check_templates(pack_dir, samples, args.output))
+        if problems:
+            failed = True
+            for path, problem in problems:
+                print(f"❌ {path}: {problem}")
+        else:
+            print(f"✓ {pack_dir}: {len(templates)} templates rendered with "
+                  f"{len(samples)} value set{'s' if len(samples) != 1 else ''}")
+
+    cache.save(prune=False)
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
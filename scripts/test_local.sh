@@ -58,7 +58,7 @@ with open('docs/data.json') as f:
     data = json.load(f)
 
 # Check required top-level keys
-required_keys = ['repository', 'packs', 'mcp_servers', 'generated_at']
+required_keys = ['repository', 'packs', 'mcp_servers', 'generated_at', 'content_hash']
 missing = [k for k in required_keys if k not in data]
 if missing:
     print(f"Missing keys: {missing}")
@@ -89,8 +89,50 @@ print("OK", end='')
 EOF
 echo -e " ${GREEN}✓${NC}"
 
-# Test 5: Count discovered packs and MCP servers
-echo -n "5. Counting discovered items... "
+# Test 5: Verify index.json and its detail shards
+echo -n "5. Verifying index.json, detail shards and search index... "
+python - <<EOF
+import json
+import sys
+from pathlib import Path
+
+with open('docs/index.json') as f:
+    index = json.load(f)
+
+with open('docs/data.json') as f:
+    data = json.load(f)
+
+# MCP servers are stored once in data.json; index.json lists them per pack
+server_refs = sum(len(pack.get('mcp_servers', [])) for pack in data['packs'])
+if len(index['packs']) != len(data['packs']) or len(index['mcp_servers']) != server_refs:
+    print("index.json and data.json disagree on pack/server counts")
+    sys.exit(1)
+
+# Every summary must point at an existing shard
+for entry in index['packs'] + index['mcp_servers']:
+    shard = Path('docs') / entry['shard']
+    if not shard.exists():
+        print(f"Missing shard: {shard}")
+        sys.exit(1)
+
+# The search index must cover every pack and server
+with open('docs/search-index.json') as f:
+    search = json.load(f)
+
+if len(search['entities']) != len(data['packs']) + server_refs:
+    print("search-index.json does not cover every pack and MCP server")
+    sys.exit(1)
+
+if search['terms'] != sorted(search['terms']) or len(search['terms']) != len(search['postings']):
+    print("search-index.json terms are not sorted or postings are missing")
+    sys.exit(1)
+
+print("OK", end='')
+EOF
+echo -e " ${GREEN}✓${NC}"
+
+# Test 6: Count discovered packs and MCP servers
+echo -n "6. Counting discovered items... "
 PACK_COUNT=$(python -c "import json; print(len(json.load(open('docs/data.json'))['packs']))")
 MCP_COUNT=$(python -c "import json; print(len(json.load(open('docs/data.json'))['mcp_servers']))")
 SKILL_COUNT=$(python -c "import json; packs = json.load(open('docs/data.json'))['packs']; print(sum(len(p['skills']) for p in packs))")
@@ -104,8 +146,8 @@ echo "   - ${SKILL_COUNT} skills"
 echo "   - ${AGENT_COUNT} agents"
 echo "   - ${MCP_COUNT} MCP servers"
 
-# Test 6: Check for XSS vulnerabilities in JavaScript
-echo -n "6. Checking for XSS vulnerabilities... "
+# Test 7: Check for XSS vulnerabilities in JavaScript
+echo -n "7. Checking for XSS vulnerabilities... "
 if grep -q "innerHTML.*\${" docs/app.js 2>/dev/null; then
     echo -e "${RED}✗${NC}"
     echo "Warning: Potential XSS vulnerability detected (innerHTML with template literal)"
@@ -122,8 +164,8 @@ else
     echo -e "${GREEN}✓${NC}"
 fi
 
-# Test 7: Verify no hardcoded credentials in MCP configs
-echo -n "7. Checking for hardcoded credentials... "
+# Test 8: Verify no hardcoded credentials in MCP configs
+echo -n "8. Checking for hardcoded credentials... "
 if python - <<EOF
 import json
 import sys
@@ -131,11 +173,13 @@ import sys
 with open('docs/data.json') as f:
     data = json.load(f)
 
-# Check for non-variable env values (should all be uppercase with underscores)
-for server in data['mcp_servers']:
+# Check for non-variable env values (should all be uppercase with underscores),
+# including the per-pack overlays of shared servers
+overlays = [ref for pack in data['packs'] for ref in pack.get('mcp_servers', [])]
+for server in data['mcp_servers'] + overlays:
     for env_var in server.get('env', []):
         if not env_var.isupper() or '_' not in env_var:
-            print(f"Suspicious env var: {env_var} in {server['name']}")
+            print(f"Suspicious env var: {env_var} in {server.get('name', server['id'])}")
             sys.exit(1)
 
 print("OK", end='')
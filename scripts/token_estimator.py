@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Offline token estimates for skills, agents and docs.
+
+A BPE tokenizer first splits text into pieces (a word with its leading
+space, a run of up to three digits, a run of punctuation, a run of
+whitespace) and then merges the characters of each piece into vocabulary
+tokens. estimate_tokens() does the first step exactly, with the same kind of
+pre-tokenizer regex, and approximates the second from the piece's length:
+common words are one token, longer words and punctuation runs a token per
+few characters, and non-ASCII text roughly a token per character. Unlike
+characters / 4, this follows the token density of code blocks, tables and
+indentation, and it needs no model files.
+
+Counts are cached in the build cache, so a file is only counted again when
+its content hash changes.
+"""
+
+import re
+import sys
+from pathlib import Path
+
+import build_cache
+
+# Bump whenever estimate_tokens() changes, so cached counts are recomputed
+ESTIMATOR_VERSION = 1
+CACHE_NAMESPACE = f'tokens{ESTIMATOR_VERSION}'
+
+# Characters per token of pieces longer than one vocabulary entry
+WORD_CHARS_PER_TOKEN = 6
+PUNCTUATION_CHARS_PER_TOKEN = 2
+WHITESPACE_CHARS_PER_TOKEN = 8
+
+_PIECE_RE = re.compile(r"""'(?:[sdmt]|ll|ve|re)| ?[A-Za-z]+| ?[0-9]{1,3}| ?[^\sA-Za-z0-9\x80-\U0010ffff]+|"""
+                       r"""[\x80-\U0010ffff]|\s+(?!\S)|\s+""")
+
+
+def _piece_tokens(piece: str) -> int:
+    """
+    Estimate the tokens of one pre-tokenized piece.
+    """
+    last = piece[-1]
+    length = len(piece.lstrip(' ')) or len(piece)
+    if last.isascii() and last.isalpha():
+        return 1 + (length - 1) // WORD_CHARS_PER_TOKEN
+    if last.isspace():
+        return 1 + (length - 1) // WHITESPACE_CHARS_PER_TOKEN
+    if not last.isascii():
+        # Letters of other scripts cost about a token each, emoji and symbols more
+        return 1 if last.isalpha() else 2
+    if last.isdigit():
+        return 1
+    return 1 + (length - 1) // PUNCTUATION_CHARS_PER_TOKEN
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate how many tokens a text costs in a model's context.
+
+    Args:
+        text: Text to count
+
+    Returns:
+        Estimated token count
+    """
+    return sum(map(_piece_tokens, _PIECE_RE.findall(text)))
+
+
+def count_bytes(raw: bytes) -> int:
+    """
+    Estimate the tokens of a file's contents (decoded as UTF-8).
+    """
+    return estimate_tokens(raw.decode('utf-8', errors='replace'))
+
+
+def file_tokens(file_path: Path) -> int:
+    """
+    Return the estimated token count of a whole file, through the build cache.
+
+    Args:
+        file_path: File to count
+
+    Returns:
+        Estimated token count (OSError propagates)
+    """
+    return build_cache.cached(CACHE_NAMESPACE, Path(file_path), build_cache.read_bytes, count_bytes)
+
+
+if __name__ == '__main__':
+    # Print the estimate of each file given on the command line
+    for name in sys.argv[1:]:
+        print(f"{file_tokens(Path(name)):>8,}  {name}")
@@ -3,238 +3,260 @@
 Validate agentic collection structure before documentation generation.
 """
 
+import argparse
 import json
 import sys
-from pathlib import Path
-from typing import List, Tuple
-import yaml
-import re
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
 
-# List of agentic collections to validate
-PACK_DIRS = ['rh-sre', 'rh-developer', 'ocp-admin', 'rh-support-engineer', 'rh-virt']
+import build_cache
+import build_report
+import link_checker
+import pack_scanner
+import parallel
+import schema_compiler
+import validation_rules
+from pack_discovery import discover_packs
+from validation_rules import Issue, PackResult
 
+OUTPUT_FORMATS = ('text', 'json', 'sarif')
 
-def validate_plugin_json(pack_dir: str) -> List[str]:
-    """
-    Validate plugin.json structure.
+SARIF_SCHEMA = 'https://json.schemastore.org/sarif-2.1.0.json'
 
-    Args:
-        pack_dir: Collection directory name
 
-    Returns:
-        List of error messages (empty if valid)
+def prepare_packs(pack_dirs: List[str], jobs: Optional[int] = None
+                  ) -> Tuple[List[pack_scanner.PackScan], link_checker.LinkIndex]:
     """
-    errors = []
-    plugin_path = Path(pack_dir) / '.claude-plugin' / 'plugin.json'
-
-    if not plugin_path.exists():
-        # plugin.json is optional
-        return errors
-
-    try:
-        with open(plugin_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        # Check required fields
-        if 'name' not in data:
-            errors.append(f"{pack_dir}: plugin.json missing required field 'name'")
-        if 'version' not in data:
-            errors.append(f"{pack_dir}: plugin.json missing required field 'version'")
-        if 'description' not in data:
-            errors.append(f"{pack_dir}: plugin.json missing required field 'description'")
-
-    except json.JSONDecodeError as e:
-        errors.append(f"{pack_dir}: Invalid JSON in plugin.json: {e}")
-    except Exception as e:
-        errors.append(f"{pack_dir}: Error reading plugin.json: {e}")
-
-    return errors
-
-
-def validate_mcp_json(pack_dir: str) -> List[str]:
-    """
-    Validate .mcp.json structure.
+    Load the schema validators, scan the packs and build the repository link
+    index from the scans. Repeated calls reuse the scans and the index.
 
     Args:
-        pack_dir: Pack directory name
+        pack_dirs: Pack directories to validate
+        jobs: Number of worker processes for scanning (None for the CPU count, 1 for serial)
 
     Returns:
-        List of error messages (empty if valid)
+        (scans in pack_dirs order, link index)
     """
-    errors = []
-    mcp_path = Path(pack_dir) / '.mcp.json'
-
-    if not mcp_path.exists():
-        # .mcp.json is optional
-        return errors
+    with build_report.stage('schemas'):
+        schema_compiler.load_validators()
 
-    try:
-        with open(mcp_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+    with build_report.stage('scan'):
+        scans = pack_scanner.scan_packs(pack_dirs, jobs)
 
-        # Check for mcpServers key
-        if 'mcpServers' not in data:
-            errors.append(f"{pack_dir}: .mcp.json missing 'mcpServers' key")
-        elif not isinstance(data['mcpServers'], dict):
-            errors.append(f"{pack_dir}: .mcp.json 'mcpServers' must be an object")
+    with build_report.stage('link_index'):
+        link_index = link_checker.get_link_index(scans=scans)
 
-    except json.JSONDecodeError as e:
-        errors.append(f"{pack_dir}: Invalid JSON in .mcp.json: {e}")
-    except Exception as e:
-        errors.append(f"{pack_dir}: Error reading .mcp.json: {e}")
+    return scans, link_index
 
-    return errors
 
-
-def validate_yaml_frontmatter(file_path: Path) -> Tuple[bool, str]:
+def run_rules(pack_dirs: List[str], jobs: Optional[int] = None,
+              max_errors: Optional[int] = None) -> List[PackResult]:
     """
-    Validate YAML frontmatter in a markdown file.
+    Scan the packs and run every registered rule on them.
+
+    The packs are scanned over a process pool first (prepare_packs()), so
+    the link index is built from the scans without reading the skills,
+    agents and docs again. The scans are then checked over a process pool;
+    each worker receives the rule settings, link index included, once when
+    it starts.
 
     Args:
-        file_path: Path to the markdown file
+        pack_dirs: Pack directories to validate
+        jobs: Number of worker processes (None for the CPU count, 1 for serial)
+        max_errors: Stop once this many errors were found (None for no limit;
+                    warnings are not counted)
 
     Returns:
-        Tuple of (is_valid, error_message)
+        PackResults in pack_dirs order (only the packs checked before stopping)
     """
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+    found = 0
 
-        # Match YAML frontmatter
-        match = re.match(r'^---\s*\n(.*?)\n---\s*\n', content, re.DOTALL)
-        if not match:
-            return False, "Missing YAML frontmatter (should start with --- and end with ---)"
+    def stop(result: PackResult) -> bool:
+        nonlocal found
+        found += sum(issue.level == 'error' for issue in result.issues)
+        return max_errors is not None and found >= max_errors
 
-        frontmatter_text = match.group(1)
-        data = yaml.safe_load(frontmatter_text)
+    scans, link_index = prepare_packs(pack_dirs, jobs)
 
-        if data is None:
-            return False, "Empty YAML frontmatter"
+    check = partial(validation_rules.check_pack, max_issues=max_errors)
+    settings = dict(validation_rules.SETTINGS, link_index=link_index)
+    with build_report.stage('rules'):
+        results = pack_scanner.analyze_scans(scans, check, jobs, stop,
+                                             setup=validation_rules.configure, setup_args=(settings,))
 
-        # Check required fields
-        if 'name' not in data:
-            return False, "Missing required field 'name' in frontmatter"
-        if 'description' not in data:
-            return False, "Missing required field 'description' in frontmatter"
+    report = build_report.get_report()
+    for result in results:
+        for rule_id, seconds in result.seconds.items():
+            report.add_time(f'rules/{rule_id}', seconds)
 
-        return True, ""
+    return results
 
-    except yaml.YAMLError as e:
-        return False, f"Invalid YAML: {e}"
-    except Exception as e:
-        return False, f"Error reading file: {e}"
 
+def _collect_issues(repo_issues: List[Issue], results: List[PackResult],
+                    max_errors: Optional[int]) -> List[Issue]:
+    issues = repo_issues + [issue for result in results for issue in result.issues]
+    if max_errors is None:
+        return issues
 
-def validate_skills(pack_dir: str) -> List[str]:
-    """
-    Validate skills in a pack.
+    # Keep every warning but only the first max_errors errors
+    kept = []
+    errors = 0
+    for issue in issues:
+        if issue.level == 'error':
+            if errors >= max_errors:
+                continue
+            errors += 1
+        kept.append(issue)
+    return kept
 
-    Args:
-        pack_dir: Pack directory name
 
-    Returns:
-        List of error messages (empty if valid)
+def _split_issues(issues: List[Issue]) -> Tuple[List[Issue], List[Issue]]:
     """
-    errors = []
-    skills_dir = Path(pack_dir) / 'skills'
-
-    if not skills_dir.exists():
-        # Skills directory is optional
-        return errors
-
-    # Find all SKILL.md files
-    for skill_file in skills_dir.glob('*/SKILL.md'):
-        is_valid, error_msg = validate_yaml_frontmatter(skill_file)
-        if not is_valid:
-            errors.append(f"{skill_file}: {error_msg}")
-
-    return errors
-
-
-def validate_agents(pack_dir: str) -> List[str]:
+    Split issues into (errors, warnings).
     """
-    Validate agents in a pack.
+    return ([issue for issue in issues if issue.level == 'error'],
+            [issue for issue in issues if issue.level != 'error'])
 
-    Args:
-        pack_dir: Pack directory name
 
-    Returns:
-        List of error messages (empty if valid)
+def _issue_json(issue: Issue) -> Dict[str, Any]:
     """
-    errors = []
-    agents_dir = Path(pack_dir) / 'agents'
-
-    if not agents_dir.exists():
-        # Agents directory is optional
-        return errors
+    Return an issue as a JSON-serializable dictionary.
+    """
+    entry = {'rule': issue.rule, 'path': issue.path, 'message': issue.message, 'level': issue.level}
+    if issue.line is not None:
+        entry['line'] = issue.line
+    return entry
 
-    # Find all .md files
-    for agent_file in agents_dir.glob('*.md'):
-        is_valid, error_msg = validate_yaml_frontmatter(agent_file)
-        if not is_valid:
-            errors.append(f"{agent_file}: {error_msg}")
 
-    return errors
+def _sarif_location(issue: Issue) -> Dict[str, Any]:
+    """
+    Return the SARIF physical location of an issue.
+    """
+    location: Dict[str, Any] = {'artifactLocation': {'uri': issue.path}}
+    if issue.line is not None:
+        location['region'] = {'startLine': issue.line}
+    return {'physicalLocation': location}
 
 
-def validate_pack(pack_dir: str) -> List[str]:
+def to_json(results: List[PackResult], issues: List[Issue], pack_dirs: List[str],
+            stopped: bool) -> Dict[str, Any]:
+    """
+    Return the validation results as a JSON-serializable dictionary.
     """
-    Validate a single pack.
+    errors, warnings = _split_issues(issues)
+    return {
+        'valid': not errors,
+        'packs': len(pack_dirs),
+        'packs_checked': len(results),
+        'stopped': stopped,
+        'rules': [{'id': r.id, 'description': r.description, 'patterns': list(r.patterns),
+                   'level': r.level} for r in validation_rules.RULES.values()],
+        'errors': [_issue_json(issue) for issue in errors],
+        'warnings': [_issue_json(issue) for issue in warnings],
+    }
+
+
+def to_sarif(issues: List[Issue]) -> Dict[str, Any]:
+    """
+    Return the validation results as a SARIF 2.1.0 log (for code scanning UIs).
+    """
+    rules = list(validation_rules.RULES.values())
+    rule_index = {r.id: position for position, r in enumerate(rules)}
+    return {
+        '$schema': SARIF_SCHEMA,
+        'version': '2.1.0',
+        'runs': [{
+            'tool': {
+                'driver': {
+                    'name': 'validate_structure',
+                    'informationUri': 'https://github.com/RHEcosystemAppEng/agentic-collections',
+                    'rules': [{'id': r.id, 'shortDescription': {'text': r.description},
+                               'defaultConfiguration': {'level': r.level}} for r in rules],
+                },
+            },
+            'results': [{
+                'ruleId': issue.rule,
+                'ruleIndex': rule_index[issue.rule],
+                'level': issue.level,
+                'message': {'text': issue.message},
+                'locations': [_sarif_location(issue)],
+            } for issue in issues],
+        }],
+    }
+
+
+def validate_packs(pack_dirs: List[str], jobs: Optional[int] = None, fail_fast: bool = False,
+                   max_errors: Optional[int] = None, output_format: str = 'text') -> int:
+    """
+    Validate packs and print a report.
 
     Args:
-        pack_dir: Pack directory name
+        pack_dirs: Pack directories to validate
+        jobs: Number of worker processes (None for the CPU count, 1 for serial)
+        fail_fast: Stop at the first error (same as max_errors=1)
+        max_errors: Stop once this many errors were found
+        output_format: 'text' (human-readable), 'json' or 'sarif'
 
     Returns:
-        List of error messages (empty if valid)
+        0 if every pack is valid (warnings allowed), 1 otherwise
     """
-    errors = []
-
-    # Check if pack directory exists
-    if not Path(pack_dir).exists():
-        errors.append(f"{pack_dir}: Pack directory does not exist")
-        return errors
+    if fail_fast:
+        max_errors = 1
 
-    # Validate plugin.json
-    errors.extend(validate_plugin_json(pack_dir))
-
-    # Validate .mcp.json
-    errors.extend(validate_mcp_json(pack_dir))
-
-    # Validate skills
-    errors.extend(validate_skills(pack_dir))
-
-    # Validate agents
-    errors.extend(validate_agents(pack_dir))
+    text = output_format == 'text'
+    if text:
+        print("🔍 Validating agentic collection structure...")
+        print()
 
-    return errors
+    # The repo-links rule uses the link index built from the scans
+    prepare_packs(pack_dirs, jobs)
+    with build_report.stage('repo_rules'):
+        repo_issues = validation_rules.check_repo()
+    repo_errors, _ = _split_issues(repo_issues)
 
+    if max_errors is None:
+        results = run_rules(pack_dirs, jobs)
+    elif len(repo_errors) < max_errors:
+        results = run_rules(pack_dirs, jobs, max_errors - len(repo_errors))
+    else:
+        results = []
+    issues = _collect_issues(repo_issues, results, max_errors)
+    errors, warnings = _split_issues(issues)
+    stopped = max_errors is not None and len(errors) >= max_errors
+
+    if output_format == 'json':
+        print(json.dumps(to_json(results, issues, pack_dirs, stopped), indent=2))
+        return 1 if errors else 0
+    if output_format == 'sarif':
+        print(json.dumps(to_sarif(issues), indent=2))
+        return 1 if errors else 0
+
+    def status(found: List[Issue]) -> str:
+        levels = {issue.level for issue in found}
+        return '❌' if 'error' in levels else '⚠️' if levels else '✓'
+
+    print(f"Validating repository manifests... {status(repo_issues)}")
+    for result in results:
+        print(f"Validating {result.pack_dir}... {status(result.issues)}")
 
-def main():
-    """
-    Main validation function.
-    """
-    print("🔍 Validating agentic collection structure...")
     print()
 
-    all_errors = []
-
-    for pack_dir in PACK_DIRS:
-        print(f"Validating {pack_dir}...", end=' ')
-        errors = validate_pack(pack_dir)
-
-        if errors:
-            print("❌")
-            all_errors.extend(errors)
-        else:
-            print("✓")
-
-    print()
+    if warnings:
+        print("⚠️  Warnings:")
+        print()
+        for issue in warnings:
+            print(f"  • {issue}")
+        print()
 
-    if all_errors:
+    if errors:
         print("❌ Validation failed:")
         print()
-        for error in all_errors:
-            print(f"  • {error}")
+        for issue in errors:
+            print(f"  • {issue}")
+        if stopped:
+            print()
+            print(f"  (stopped after {len(errors)} error{'s' if len(errors) != 1 else ''}; "
+                  f"{len(pack_dirs) - len(results)} of {len(pack_dirs)} packs not checked)")
         print()
         return 1
     else:
@@ -243,5 +265,50 @@ def main():
         return 0
 
 
+def parse_args(argv=None):
+    """
+    Parse command line arguments.
+    """
+    parser = argparse.ArgumentParser(description='Validate agentic collection structure.')
+    parser.add_argument('--jobs', '-j', type=parallel.positive_int, default=None,
+                        help='Number of worker processes (default: CPU count)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Do not read or write the build cache')
+    parser.add_argument('--fail-fast', action='store_true',
+                        help='Stop at the first error')
+    parser.add_argument('--max-errors', type=parallel.positive_int, default=None, metavar='N',
+                        help='Stop once N errors were found (default: report every error)')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='text',
+                        help='Output format (default: text)')
+    parser.add_argument('--skill-token-budget', type=int, metavar='TOKENS',
+                        default=validation_rules.DEFAULT_SETTINGS['skill_token_budget'],
+                        help='Warn about skills estimated above this many tokens (default: %(default)s; 0 disables)')
+    build_report.add_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    Main validation function.
+    """
+    args = parse_args(argv)
+    cache = build_cache.configure(enabled=not args.no_cache)
+    report = build_report.configure(enabled=args.report is not None)
+    validation_rules.SETTINGS['skill_token_budget'] = args.skill_token_budget
+
+    with build_report.profiled(args.profile):
+        exit_code = validate_packs(discover_packs(), args.jobs, fail_fast=args.fail_fast,
+                                   max_errors=args.max_errors, output_format=args.format)
+
+    # Keep the entries of files only the site build reads
+    cache.save(prune=False)
+
+    if args.report is not None:
+        summary = report.write(args.report, 'validate_structure', args.slowest, args.profile)
+        build_report.print_summary(summary, args.report)
+
+    return exit_code
+
+
 if __name__ == '__main__':
     sys.exit(main())
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Registry of the pack validation rules.
+
+A rule is a function registered with @rule(). It declares the files it
+applies to as fnmatch patterns relative to the pack directory ('*' also
+matches '/'), and is called with every matching file of the shared pack scan
+(a pack_scanner Document or JsonFile). Rules without patterns are called once
+per pack with the PackScan itself. Rules registered with scope='repo' check
+repository-level files instead and are called once with the repository root.
+A rule yields one message per problem, so a file with several problems
+reports all of them; rules called with the PackScan or the repository root
+may instead yield (path, message) or (path, line, message) tuples to point
+at a file. Rules registered with level='warning' report problems
+that do not fail validation. JSON configs are checked against the JSON Schemas in
+scripts/schemas/ (see schema_compiler.py).
+
+New checks are added by registering a function here; validate_structure.py
+runs every registered rule over the scans, one pack per worker process.
+"""
+
+import time
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import link_checker
+import schema_compiler
+import template_renderer
+from pack_discovery import MARKETPLACE_FILE, discover_packs
+from pack_scanner import Document, JsonFile, PackScan, read_json_file
+
+ScannedFile = Union[Document, JsonFile]
+RuleCheck = Callable[[Any], Iterable[Union[str, Tuple[Any, ...]]]]
+
+
+@dataclass(frozen=True)
+class Rule:
+    """
+    A registered validation rule.
+    """
+    id: str
+    description: str
+    check: RuleCheck
+    patterns: Tuple[str, ...] = ()
+    scope: str = 'pack'
+    level: str = 'error'
+
+    def applies_to(self, relative_path: str) -> bool:
+        """
+        Return True if the rule checks the file at this pack-relative path.
+        """
+        return any(fnmatchcase(relative_path, pattern) for pattern in self.patterns)
+
+
+@dataclass
+class Issue:
+    """
+    A problem found by a rule.
+    """
+    rule: str
+    path: str
+    message: str
+    level: str = 'error'
+    line: Optional[int] = None
+
+    def __str__(self) -> str:
+        if self.line is not None:
+            return f"{self.path}:{self.line}: {self.message}"
+        return f"{self.path}: {self.message}"
+
+
+@dataclass
+class PackResult:
+    """
+    Issues of one pack and the time spent in each rule.
+    """
+    pack_dir: str
+    issues: List[Issue] = field(default_factory=list)
+    seconds: Dict[str, float] = field(default_factory=dict)
+    truncated: bool = False
+
+
+# Registered rules, in registration order
+RULES: Dict[str, Rule] = {}
+
+# Thresholds and shared inputs of the rules; configure() applies overrides,
+# also in worker processes
+DEFAULT_SETTINGS: Dict[str, Any] = {
+    # Estimated tokens above which a SKILL.md is reported
+    'skill_token_budget': 8000,
+    # Repository link index for the 'links' rule (None builds it on first use)
+    'link_index': None,
+}
+SETTINGS: Dict[str, Any] = dict(DEFAULT_SETTINGS)
+
+
+def configure(settings: Dict[str, Any]) -> None:
+    """
+    Apply rule settings in this process (validate_structure.py also runs it
+    once in each worker process, so the link index is sent once per worker).
+
+    Args:
+        settings: Settings to override (see DEFAULT_SETTINGS)
+    """
+    SETTINGS.update(settings)
+
+
+def rule(rule_id: str, description: str, patterns: Iterable[str] = (),
+         scope: str = 'pack', level: str = 'error') -> Callable[[RuleCheck], RuleCheck]:
+    """
+    Register a validation rule.
+
+    Args:
+        rule_id: Unique rule ID (used in reports and SARIF output)
+        description: One-line description of what the rule checks
+        patterns: fnmatch patterns of the pack-relative files the rule checks;
+                  empty for a rule called once with the PackScan
+        scope: 'pack' for rules run on every pack, 'repo' for rules called
+               once with the repository root
+        level: 'error' for problems that fail validation, 'warning' for
+               problems that are only reported
+    """
+    if scope not in ('pack', 'repo'):
+        raise ValueError(f"Unknown validation rule scope {scope!r}")
+    if level not in ('error', 'warning'):
+        raise ValueError(f"Unknown validation rule level {level!r}")
+
+    def register(check: RuleCheck) -> RuleCheck:
+        if rule_id in RULES:
+            raise ValueError(f"Validation rule {rule_id!r} is already registered")
+        RULES[rule_id] = Rule(rule_id, description, check, tuple(patterns), scope, level)
+        return check
+    return register
+
+
+def _issue(current: Rule, path: str, found: Union[str, Tuple[Any, ...]]) -> Issue:
+    """
+    Build an Issue from what a rule yielded: a message about path, or a
+    (path, message) or (path, line, message) tuple.
+    """
+    if isinstance(found, str):
+        return Issue(current.id, path, found, current.level)
+    if len(found) == 3:
+        return Issue(current.id, str(found[0]), found[2], current.level, found[1])
+    return Issue(current.id, str(found[0]), found[1], current.level)
+
+
+def scanned_files(scan: PackScan) -> Iterator[Tuple[str, ScannedFile]]:
+    """
+    Yield (pack-relative path, file) for every existing file of a scan.
+    """
+    for json_file in (scan.plugin, scan.mcp):
+        if json_file is not None and json_file.exists:
+            yield json_file.path.relative_to(scan.pack_dir).as_posix(), json_file
+    for doc in scan.skills + scan.agents + scan.docs:
+        yield doc.path.relative_to(scan.pack_dir).as_posix(), doc
+
+
+def check_pack(scan: PackScan, rules: Optional[List[Rule]] = None,
+               max_issues: Optional[int] = None,
+               settings: Optional[Dict[str, Any]] = None) -> PackResult:
+    """
+    Run the rules over one pack scan.
+
+    Args:
+        scan: Shared scan of the pack
+        rules: Rules to run (defaults to every registered rule); repository
+               rules are skipped
+        max_issues: Stop after this many errors (warnings are not counted)
+        settings: Rule thresholds to apply first (see DEFAULT_SETTINGS)
+
+    Returns:
+        PackResult with the issues in rule order, then file order
+    """
+    if settings is not None:
+        configure(settings)
+    if rules is None:
+        rules = list(RULES.values())
+    rules = [current for current in rules if current.scope == 'pack']
+
+    result = PackResult(pack_dir=scan.pack_dir)
+    files = list(scanned_files(scan)) if scan.exists else []
+    errors = 0
+
+    for current in rules:
+        if not scan.exists and current.patterns:
+            continue
+
+        if current.patterns:
+            targets = [(str(item.path), item) for relative, item in files if current.applies_to(relative)]
+        else:
+            targets = [(scan.pack_dir, scan)]
+
+        start = time.perf_counter()
+        for path, target in targets:
+            for found in current.check(target):
+                result.issues.append(_issue(current, path, found))
+                errors += current.level == 'error'
+                if max_issues is not None and errors >= max_issues:
+                    result.truncated = True
+                    break
+            if result.truncated:
+                break
+        result.seconds[current.id] = time.perf_counter() - start
+
+        if result.truncated:
+            break
+
+    return result
+
+
+def check_repo(root: Path = Path('.'), rules: Optional[List[Rule]] = None) -> List[Issue]:
+    """
+    Run the repository rules once.
+
+    Args:
+        root: Repository root
+        rules: Rules to run (defaults to every registered rule); pack rules
+               are skipped
+
+    Returns:
+        Issues in rule order
+    """
+    if rules is None:
+        rules = list(RULES.values())
+
+    issues = []
+    for current in rules:
+        if current.scope == 'repo':
+            issues.extend(_issue(current, str(root), found) for found in current.check(root))
+    return issues
+
+
+def _json_file_errors(json_file: JsonFile) -> Iterator[str]:
+    """
+    Yield read and syntax errors of a JSON file.
+    """
+    if json_file.syntax_error:
+        yield f"Invalid JSON: {json_file.error}"
+    elif json_file.error:
+        yield f"Error reading file: {json_file.error}"
+
+
+@rule('pack-exists', 'The pack directory exists')
+def check_pack_exists(scan: PackScan) -> Iterator[str]:
+    """
+    Report a pack directory that does not exist.
+    """
+    if not scan.exists:
+        yield "Pack directory does not exist"
+
+
+def _schema_errors(json_file: JsonFile, schema: str) -> Iterator[str]:
+    """
+    Yield the read, syntax and schema errors of a JSON file.
+    """
+    errors = list(_json_file_errors(json_file))
+    if errors:
+        yield from errors
+        return
+
+    yield from schema_compiler.validate(schema, json_file.data)
+
+
+@rule('plugin-json', 'plugin.json matches schemas/plugin.schema.json',
+      patterns=['.claude-plugin/plugin.json'])
+def check_plugin_json(plugin_file: JsonFile) -> Iterator[str]:
+    """
+    Validate plugin.json against its schema (plugin.json itself is optional).
+    """
+    yield from _schema_errors(plugin_file, 'plugin')
+
+
+@rule('mcp-json', '.mcp.json matches schemas/mcp.schema.json (command and http servers)',
+      patterns=['.mcp.json'])
+def check_mcp_json(mcp_file: JsonFile) -> Iterator[str]:
+    """
+    Validate .mcp.json against its schema (.mcp.json itself is optional).
+    """
+    yield from _schema_errors(mcp_file, 'mcp')
+
+
+@rule('marketplace-json', '.claude-plugin/marketplace.json matches schemas/marketplace.schema.json',
+      scope='repo')
+def check_marketplace_json(root: Path) -> Iterator[Tuple[str, str]]:
+    """
+    Validate the marketplace manifest against its schema (the manifest
+    itself is optional). Yields (path, message) pairs.
+    """
+    marketplace_file = read_json_file(Path(root) / MARKETPLACE_FILE, kind='marketplace')
+    if marketplace_file.exists:
+        path = str(marketplace_file.path)
+        for message in _schema_errors(marketplace_file, 'marketplace'):
+            yield path, message
+
+
+@rule('frontmatter', 'Skills and agents have YAML frontmatter with name and description',
+      patterns=['skills/*/SKILL.md', 'agents/*.md'])
+def check_frontmatter(doc: Document) -> Iterator[str]:
+    """
+    Validate the YAML frontmatter of a skill or agent; every missing
+    required field is reported.
+    """
+    if doc.error:
+        yield doc.error
+        return
+
+    if not doc.has_frontmatter:
+        yield "Missing YAML frontmatter (should start with --- and end with ---)"
+        return
+
+    data = doc.frontmatter
+    if data is None:
+        yield "Empty YAML frontmatter"
+        return
+    if not isinstance(data, dict):
+        yield "YAML frontmatter must be a mapping"
+        return
+
+    for required in ('name', 'description'):
+        if required not in data:
+            yield f"Missing required field '{required}' in frontmatter"
+
+
+@rule('skill-token-budget', 'SKILL.md files fit the skill token budget',
+      patterns=['skills/*/SKILL.md'], level='warning')
+def check_skill_token_budget(doc: Document) -> Iterator[str]:
+    """
+    Report a skill whose estimated token count exceeds the budget
+    (validate_structure.py --skill-token-budget).
+    """
+    budget = SETTINGS['skill_token_budget']
+    if budget and doc.tokens > budget:
+        yield (f"Estimated {doc.tokens:,} tokens, over the skill budget of {budget:,} "
+               f"(consider moving reference material to docs/)")
+
+
+@rule('links', 'Relative links and .ai-index paths of the pack point to existing files and headings',
+      level='warning')
+def check_links(scan: PackScan) -> Iterator[Tuple[str, int, str]]:
+    """
+    Resolve the markdown links and .ai-index paths of the pack's files
+    against the repository link index (see link_checker.py). Yields (path,
+    line, message) tuples.
+    """
+    index = SETTINGS['link_index'] or link_checker.get_link_index()
+    yield from index.check_sources(index.sources_under(scan.pack_dir))
+
+
+@rule('repo-links', 'Relative links outside the packs point to existing files and headings',
+      scope='repo', level='warning')
+def check_repo_links(root: Path) -> Iterator[Tuple[str, int, str]]:
+    """
+    Resolve the markdown links of the files outside every pack (README.md,
+    SECURITY.md, docs/). Yields (path, line, message) tuples.
+    """
+    index = link_checker.get_link_index(root)
+    packs = [pack_dir + '/' for pack_dir in discover_packs()]
+    yield from index.check_sources(sorted(source for source in index.links
+                                          if not source.startswith(tuple(packs))))
+
+
+@rule('templates', 'Files under templates/ render with the sample values into valid YAML, '
+      'Helm templates and systemd units')
+def check_templates(scan: PackScan) -> Iterator[Tuple[str, str]]:
+    """
+    Render the pack's templates with every sample value set and check the
+    output (see template_renderer.py). Yields (path, message) pairs.
+    """
+    yield from template_renderer.check_templates(scan.pack_dir)